@@ -1,3 +1,13 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+
+from core.profiling import QueryRecorder, append_record
+
+
 class BusinessMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -9,3 +19,40 @@ class BusinessMiddleware:
             else None
         )
         return self.get_response(request)
+
+
+class QueryProfilerMiddleware:
+    """
+    Records the SQL query count, repeated statements and SQL time of every
+    request into a rolling JSONL store (see `manage.py query_report`).
+    Only active when QUERY_PROFILER_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.budget = getattr(settings, "QUERY_PROFILER_BUDGET", 20)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return response
+
+        append_record(recorder.as_record(
+            at=timezone.now().isoformat(),
+            method=request.method,
+            route="/" + match.route,
+            view=match.view_name or match._func_path,
+            status=response.status_code,
+            total_ms=round(elapsed_ms, 2),
+            over_budget=recorder.count > self.budget,
+        ))
+        response["X-Query-Count"] = str(recorder.count)
+        return response
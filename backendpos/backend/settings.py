@@ -9,7 +9,10 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
+import hashlib
+import os
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -65,6 +68,7 @@ MIDDLEWARE = [
     #"backend.middlewares.BusinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "backend.middlewares.QueryProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -144,12 +148,68 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.OptionalCursorPagination',
     'PAGE_SIZE': 10
 }
 
+# Number of queued orders committed per transaction by the batch upload endpoint.
+POS_BATCH_CHUNK_SIZE = 50
+
+# How long (seconds) a placed checkout's response is kept for replaying retries.
+CHECKOUT_IDEMPOTENCY_TTL = 60 * 60 * 24
+
+# Tax applied to order sub totals when line items are edited.
+ORDER_TAX_RATE = Decimal("0.08")
+
+# Seconds a catalog delta reaches back before `since`, to pick up rows stamped
+# before that version but committed after it. Must exceed the longest write transaction.
+CATALOG_DELTA_OVERLAP = 300
+
+# Outbox topics the default `run_outbox` worker leaves to a worker of their own
+# (`run_outbox --topics mpesa.stk_push`), so slow Daraja calls never hold up
+# loyalty, ledger or rollup events behind them.
+OUTBOX_DEDICATED_TOPICS = ("mpesa.stk_push",)
+# Dashboard metrics are read from rollups that only the outbox worker
+# (`python manage.py run_outbox`) refreshes; it must run next to the web app.
+# Lifetime (seconds) of the tickets dashboards exchange their JWT for to open the metrics stream.
+METRICS_STREAM_TICKET_TTL = 30
+# Seconds between checks, per ASGI process, for rollups refreshed by the outbox worker.
+METRICS_STREAM_POLL_INTERVAL = 2
+
+# Per-request SQL profiling; report with `python manage.py query_report`.
+QUERY_PROFILER_ENABLED = os.environ.get("QUERY_PROFILER_ENABLED") == "1"
+QUERY_PROFILER_PATH = BASE_DIR / "query_profile.jsonl"
+QUERY_PROFILER_MAX_BYTES = 5 * 1024 * 1024
+QUERY_PROFILER_BUDGET = 20
+
+# Authenticated users (with business and branch) cached per process, and for how long (seconds).
+AUTH_USER_CACHE_SIZE = 5_000
+AUTH_USER_CACHE_TTL = 60
+
+# M-Pesa Daraja API; point MPESA_BASE_URL at a local stand-in to test without Safaricom.
+MPESA_BASE_URL = os.environ.get("MPESA_BASE_URL", "https://sandbox.safaricom.co.ke")
+MPESA_CALLBACK_BASE_URL = os.environ.get("MPESA_CALLBACK_BASE_URL", "https://7d04-105-163-2-112.ngrok-free.app")
+MPESA_CONSUMER_KEY = os.environ.get("MPESA_CONSUMER_KEY", "XvtPN184rgabldJKME5UCgSKmU4qncwtkSS8Z75X1LnxAXU0")
+MPESA_CONSUMER_SECRET = os.environ.get("MPESA_CONSUMER_SECRET", "q9cHHWM10p3SLcI4iNL6dnlyvxfGZlkJsJkyo3Q6NCA2Gr9Ef1RPhD9LZGrq2xRi")
+MPESA_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+MPESA_MAX_RETRIES = 3
+MPESA_POOL_SIZE = 10
+# Secret path segment of the STK CallBackURL; callbacks without it are rejected.
+MPESA_CALLBACK_SECRET = os.environ.get("MPESA_CALLBACK_SECRET") or hashlib.sha256(f"mpesa-callback:{SECRET_KEY}".encode()).hexdigest()[:32]
+# Callbacks for not-yet-known checkout ids queued for retry at a time; the rest are dropped.
+MPESA_EARLY_CALLBACK_LIMIT = 100
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=5),
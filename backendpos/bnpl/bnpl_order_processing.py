@@ -14,6 +14,7 @@ from orders.models import Order, OrderItem
 from payments.models import Payment
 from customers.models import LoyaltyCard
 from users.models import User
+from inventory.stock import collect_quantities, decrement_stock
 
 
 class BNPLPurchaseProcessor:
@@ -39,7 +40,7 @@ class BNPLPurchaseProcessor:
         order = self._create_order()
         self._create_payment(order)
         self._create_order_items(order)
-        self._update_inventory(order)
+        self._update_inventory()
 
         purchase = self._create_bnpl_purchase(order, provider, customer)
         self._create_installments(purchase)
@@ -114,11 +115,11 @@ class BNPLPurchaseProcessor:
 
         OrderItem.objects.bulk_create(items)
 
-    def _update_inventory(self, order: Order) -> None:
-        for item in order.items.select_related("inventory_item"):
-            inventory = item.inventory_item
-            inventory.quantity -= item.quantity
-            inventory.save(update_fields=["quantity"])
+    def _update_inventory(self) -> None:
+        decrement_stock(
+            collect_quantities(self.order_data["items"]),
+            allow_negative=self.user.business.allow_negative_stock,
+        )
 
     def _create_bnpl_purchase(
         self,
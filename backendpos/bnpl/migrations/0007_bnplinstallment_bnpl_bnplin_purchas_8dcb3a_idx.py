@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bnpl', '0006_alter_bnplinstallment_options_and_more'),
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bnplinstallment',
+            index=models.Index(fields=['purchase', 'status', 'due_date'], name='bnpl_bnplin_purchas_8dcb3a_idx'),
+        ),
+    ]
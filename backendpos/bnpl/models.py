@@ -58,4 +58,7 @@ class BNPLInstallment(AbstractBaseModel):
         super().save(*args, **kwargs)
     
     class Meta:
+        indexes = [
+            models.Index(fields=["purchase", "status", "due_date"]),
+        ]
         ordering = ["paid_installment", "due_date"]
@@ -1,22 +1,23 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from .models import BNPLServiceProvider, BNPLPurchase, BNPLInstallment
 
 
 
 
 
-class BNPLPurchaseSerializer(serializers.ModelSerializer):
+class BNPLPurchaseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     customer_name=serializers.CharField(source="customer.customer_name", read_only=True)
     class Meta:
         model = BNPLPurchase
         fields = '__all__'
 
-class BNPLInstallmentSerializer(serializers.ModelSerializer):
+class BNPLInstallmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = BNPLInstallment
         fields = '__all__'
 
-class BNPLPurchaseDetailSerializer(serializers.ModelSerializer):
+class BNPLPurchaseDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     customer_name=serializers.CharField(source="customer.customer_name", read_only=True)
     installments = BNPLInstallmentSerializer(many=True)
     class Meta:
@@ -24,13 +25,13 @@ class BNPLPurchaseDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class BNPLServiceProviderSerializer(serializers.ModelSerializer):
+class BNPLServiceProviderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = BNPLServiceProvider
         fields = '__all__'
 
 
-class BNPLServiceProviderDetailSerializer(serializers.ModelSerializer):
+class BNPLServiceProviderDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     business_name=serializers.CharField(source="business.name", read_only=True)
     branch_name=serializers.CharField(source="branch.name", read_only=True)
     bnpl_purchases = BNPLPurchaseSerializer(many=True)
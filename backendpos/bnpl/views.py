@@ -3,34 +3,39 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 
+from core.mixins import ConditionalGetMixin, SparseQuerysetMixin
+
 from bnpl.models import BNPLServiceProvider, BNPLPurchase, BNPLInstallment
 from bnpl.serializers import (
     BNPLServiceProviderSerializer, BNPLServiceProviderDetailSerializer,
     BNPLPurchaseSerializer, BNPLInstallmentSerializer, BNPLPurchaseDetailSerializer)
 
 # Create your views here.
-class BNPLServiceProviderListCreateView(generics.ListCreateAPIView):
+class BNPLServiceProviderListCreateView(SparseQuerysetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = BNPLServiceProvider.objects.all()
     serializer_class = BNPLServiceProviderSerializer
     permission_classes = [IsAuthenticated]
 
 
-class BNPLServiceProviderDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = BNPLServiceProvider.objects.all()
+class BNPLServiceProviderDetailView(SparseQuerysetMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = BNPLServiceProvider.objects.select_related("business", "branch").prefetch_related("bnpl_purchases__customer")
     serializer_class = BNPLServiceProviderDetailSerializer
     permission_classes = [IsAuthenticated]
 
     lookup_field = 'pk'
 
+    def get_etag_querysets(self):
+        return super().get_etag_querysets() + [BNPLPurchase.objects.filter(service_provider_id=self.kwargs["pk"])]
+
 
-class BNPLPurchaseListView(generics.ListAPIView):
-    queryset = BNPLPurchase.objects.all()
+class BNPLPurchaseListView(SparseQuerysetMixin, generics.ListAPIView):
+    queryset = BNPLPurchase.objects.select_related("customer")
     serializer_class = BNPLPurchaseSerializer
     permission_classes = [IsAuthenticated]
 
 
-class BNPLPurchaseDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = BNPLPurchase.objects.all()
+class BNPLPurchaseDetailView(SparseQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = BNPLPurchase.objects.select_related("customer").prefetch_related("installments")
     serializer_class = BNPLPurchaseDetailSerializer
     permission_classes = [IsAuthenticated]
 
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from core.models import Business, Branch
+from core.models import Business, Branch, DeletedRecord, OutboxEvent
 
 # Register your models here.
 @admin.register(Business)
@@ -10,4 +10,15 @@ class BusinessAdmin(admin.ModelAdmin):
 
 @admin.register(Branch)
 class BranchAdmin(admin.ModelAdmin):
-    list_display = ["id", "name", "business", "address", "phone_number", "branch_manager", "status"]
\ No newline at end of file
+    list_display = ["id", "name", "business", "address", "phone_number", "branch_manager", "status"]
+
+
+@admin.register(DeletedRecord)
+class DeletedRecordAdmin(admin.ModelAdmin):
+    list_display = ["id", "business", "resource", "object_id", "created_at"]
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ["id", "topic", "ordering_key", "status", "attempts", "available_at", "created_at"]
+    list_filter = ["status", "topic"]
\ No newline at end of file
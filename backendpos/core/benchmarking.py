@@ -0,0 +1,92 @@
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Business, Branch
+from inventory.models import Category, InventoryItem
+from orders.models import Order
+from payments.models import Payment
+from users.models import User
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the enclosed block inside a transaction that is always rolled back,
+    so benchmarks can run against a real database without leaving data behind.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def seed_business(sku_count: int, quantity: int = 1_000_000) -> Dict[str, object]:
+    """
+    Creates a throwaway business with a branch, a cashier and `sku_count`
+    inventory items.
+    """
+    suffix = uuid.uuid4().hex[:8]
+
+    business = Business.objects.create(name=f"Bench {suffix}", address="Bench", phone_number="0700000000")
+    branch = Branch.objects.create(business=business, name="Main", address="Bench", phone_number="0700000000")
+    user = User.objects.create(username=f"bench-{suffix}", business=business, branch=branch)
+    category = Category.objects.create(business=business, name="Bench")
+
+    items = InventoryItem.objects.bulk_create(
+        InventoryItem(
+            business=business,
+            branch=branch,
+            category=category,
+            barcode=f"{suffix}{index:06d}",
+            name=f"Bench Item {index}",
+            quantity=quantity,
+            buying_price=Decimal("50"),
+            selling_price=Decimal("100"),
+        )
+        for index in range(sku_count)
+    )
+
+    return {"business": business, "branch": branch, "user": user, "category": category, "items": items}
+
+
+def delete_business(business: Business) -> None:
+    """
+    Removes a business seeded with `seed_business` together with everything
+    benchmarks wrote for it. Rows that only SET_NULL their business are
+    deleted explicitly first.
+    """
+    with transaction.atomic():
+        Payment.objects.filter(business=business).delete()
+        Order.objects.filter(business=business).delete()
+        InventoryItem.objects.filter(business=business).delete()
+        Category.objects.filter(business=business).delete()
+        business.delete()
+
+
+def measure(fn: Callable[[], object], runs: int) -> Dict[str, float]:
+    """
+    Calls `fn` `runs` times and reports latency percentiles in milliseconds
+    together with the number of queries issued by the last call.
+    """
+    timings: List[float] = []
+    queries = 0
+
+    for _ in range(runs):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(captured)
+
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "queries": queries,
+    }
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import json
+import secrets
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.rollups import rollup_versions, today_metrics
+
+
+class MetricsBroadcaster:
+    """
+    Fan-out of dashboard metrics to the SSE streams open in this process,
+    per business.
+
+    Rollups are refreshed by the outbox worker, usually another process, so
+    nothing is pushed here directly. Instead one watcher task per event loop
+    polls the rollup version (`versions`) of the businesses with open streams
+    every METRICS_STREAM_POLL_INTERVAL seconds, and reads and publishes a
+    snapshot only for those whose version moved: one cheap query per interval
+    however many screens are open. Each subscriber queue only keeps the latest
+    snapshot: a slow screen skips intermediate ones.
+    """
+
+    def __init__(
+        self,
+        snapshot: Callable[[int], Dict[str, Any]],
+        versions: Callable[[Iterable[int]], Dict[int, Any]],
+    ):
+        self.snapshot = snapshot
+        self.versions = versions
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._watchers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    def subscribe(self, business_id: int) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers[business_id].add((loop, queue))
+            if loop not in self._watchers:
+                self._watchers[loop] = loop.create_task(self._watch(loop))
+        return queue
+
+    def unsubscribe(self, business_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(business_id, set())
+            for subscriber in [s for s in subscribers if s[1] is queue]:
+                subscribers.discard(subscriber)
+            if not subscribers:
+                self._subscribers.pop(business_id, None)
+
+    def has_subscribers(self, business_id: int) -> bool:
+        with self._lock:
+            return bool(self._subscribers.get(business_id))
+
+    def publish(self, business_id: int, message: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(business_id, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_replace_latest, queue, message)
+            except RuntimeError:
+                # The subscriber's loop has shut down; its stream is gone.
+                self.unsubscribe(business_id, queue)
+
+    async def _watch(self, loop: asyncio.AbstractEventLoop) -> None:
+        interval = getattr(settings, "METRICS_STREAM_POLL_INTERVAL", 2)
+        seen: Dict[int, Any] = {}
+
+        while True:
+            await asyncio.sleep(interval)
+            with self._lock:
+                business_ids = [
+                    business_id for business_id, subscribers in self._subscribers.items()
+                    if any(subscriber_loop is loop for subscriber_loop, _ in subscribers)
+                ]
+                if not business_ids:
+                    # The next subscriber on this loop starts a new watcher.
+                    self._watchers.pop(loop, None)
+                    return
+
+            versions = await sync_to_async(self.versions)(business_ids)
+            for business_id in business_ids:
+                # Businesses seen for the first time are published too, so a
+                # refresh landing between a stream's first read and this
+                # poll is not lost.
+                version = versions.get(business_id)
+                if business_id in seen and seen[business_id] == version:
+                    continue
+                seen[business_id] = version
+                self.publish(business_id, await sync_to_async(self.snapshot)(business_id))
+
+
+def _replace_latest(queue: asyncio.Queue, message: Dict[str, Any]) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+metrics_broadcaster = MetricsBroadcaster(snapshot=today_metrics, versions=rollup_versions)
+
+
+# Signing salt of stream tickets, so no other signed value passes as one.
+STREAM_TICKET_SALT = "core.live.metrics-stream"
+
+
+def issue_stream_ticket(user) -> str:
+    """
+    Short-lived, single-use token that only opens the metrics stream.
+    EventSource cannot send headers, and a ticket in the URL leaks far less
+    than the JWT would.
+    """
+    return signing.dumps({"user": user.pk, "nonce": secrets.token_urlsafe(8)}, salt=STREAM_TICKET_SALT)
+
+
+def stream_ticket_user_id(ticket: str) -> Optional[int]:
+    """
+    The user id a ticket was issued to, or None if it is forged, expired or
+    already used. Used tickets are remembered in the cache until they expire.
+    """
+    ttl = getattr(settings, "METRICS_STREAM_TICKET_TTL", 30)
+    try:
+        user_id = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=ttl)["user"]
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+    used_key = f"metrics-stream-ticket:{hashlib.sha256(ticket.encode()).hexdigest()}"
+    if not cache.add(used_key, True, ttl + 1):
+        return None
+    return user_id
+
+
+async def metrics_events(business_id: int) -> AsyncIterator[str]:
+    """
+    SSE body for one dashboard. The first event carries every figure and
+    later ones only the figures that changed, as the broadcaster's watcher
+    sees the rollups move. The heartbeat only keeps the connection open.
+    """
+    heartbeat = getattr(settings, "METRICS_STREAM_HEARTBEAT", 15)
+    queue = metrics_broadcaster.subscribe(business_id)
+    sent: Dict[str, Any] = {}
+
+    try:
+        yield "retry: 5000\n\n"
+        current = await sync_to_async(metrics_broadcaster.snapshot)(business_id)
+
+        while True:
+            changed = {field: value for field, value in current.items() if sent.get(field) != value}
+            if changed:
+                sent.update(changed)
+                yield f"event: metrics\ndata: {json.dumps(changed, cls=JSONEncoder)}\n\n"
+
+            try:
+                current = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        metrics_broadcaster.unsubscribe(business_id, queue)
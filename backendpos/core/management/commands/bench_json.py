@@ -0,0 +1,92 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarking import rolled_back, seed_business
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer, orjson
+from core.rollups import today_metrics
+from inventory.models import InventoryItem
+from inventory.serializers import InventoryItemSerializer
+from orders.models import Order
+from orders.serializers import OrderSerializer
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Compares DRF's JSON renderer and parser against the orjson ones on order, inventory and metrics payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--runs", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed; the renderer falls back to DRF's.")
+
+        rows, runs = options["rows"], options["runs"]
+
+        with rolled_back():
+            fixture = seed_business(rows)
+            self._seed_orders(fixture)
+            business = fixture["business"]
+
+            orders = Order.objects.filter(business=business).select_related("business", "sold_by").annotate(
+                items_count=Count("items")
+            )
+            payloads = {
+                "orders": OrderSerializer(orders, many=True).data,
+                "inventory": InventoryItemSerializer(
+                    InventoryItem.objects.filter(business=business).select_related("category"), many=True
+                ).data,
+                "metrics": today_metrics(business.id),
+            }
+
+        self.stdout.write(f"{'payload':<10} {'bytes':>9} {'render ms':>10} {'orjson ms':>10} {'parse ms':>9} {'orjson ms':>10}")
+
+        for name, data in payloads.items():
+            expected = JSONRenderer().render(data)
+            rendered = ORJSONRenderer().render(data)
+            if rendered != expected:
+                raise CommandError(f"{name}: orjson output differs from JSONRenderer")
+            if ORJSONParser().parse(io.BytesIO(rendered)) != JSONParser().parse(io.BytesIO(expected)):
+                raise CommandError(f"{name}: orjson parse differs from JSONParser")
+
+            self.stdout.write(
+                f"{name:<10} {len(expected):>9} "
+                f"{self._time(lambda: JSONRenderer().render(data), runs):>10.3f} "
+                f"{self._time(lambda: ORJSONRenderer().render(data), runs):>10.3f} "
+                f"{self._time(lambda: JSONParser().parse(io.BytesIO(expected)), runs):>9.3f} "
+                f"{self._time(lambda: ORJSONParser().parse(io.BytesIO(expected)), runs):>10.3f}"
+            )
+
+    def _time(self, fn, runs):
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        return (time.perf_counter() - started) * 1000 / runs
+
+    def _seed_orders(self, fixture):
+        user = User.objects.get(id=fixture["user"].id)
+        user.first_name, user.last_name = "Bench", "Cashier"
+        user.save(update_fields=["first_name", "last_name"])
+
+        Order.objects.bulk_create(
+            Order(
+                business=fixture["business"],
+                branch=fixture["branch"],
+                order_number=f"JSON-{fixture['business'].id}-{index}",
+                customer_name=f"Customer {index} ☕",
+                sub_total=item.selling_price,
+                tax=item.selling_price * 8 / 100,
+                total_amount=item.selling_price * 108 / 100,
+                amount_received=item.selling_price,
+                status="Pending",
+                sold_by=user,
+            )
+            for index, item in enumerate(fixture["items"])
+        )
@@ -0,0 +1,143 @@
+import itertools
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.benchmarking import measure, rolled_back, seed_business
+from customers.models import LoyaltyCard
+from customers.views import LoyaltyCardAPIView
+from inventory.views import InventoryItemAPIView
+from orders.models import Order, OrderItem
+from orders.views import OrderAPIView
+from payments.models import BusinessLedger, Payment
+from payments.views import BusinessLedgerAPIView, PaymentAPIView
+
+
+ENDPOINTS = (
+    ("orders", OrderAPIView),
+    ("payments", PaymentAPIView),
+    ("items", InventoryItemAPIView),
+    ("loyalty-cards", LoyaltyCardAPIView),
+    ("business-ledger", BusinessLedgerAPIView),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the values() list path against the model serializer path on the "
+        "high-volume list endpoints: checks both return the same JSON and reports rows per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Rows seeded per endpoint.")
+        parser.add_argument("--limit", type=int, default=500, help="Page size requested.")
+        parser.add_argument("--runs", type=int, default=10)
+
+    def handle(self, *args, **options):
+        rows, limit, runs = options["rows"], options["limit"], options["runs"]
+
+        with rolled_back():
+            fixture = seed_business(rows)
+            self._seed(fixture, rows)
+            client = APIClient()
+            client.force_authenticate(user=fixture["user"])
+
+            self.stdout.write(
+                f"{'endpoint':<16} {'rows':>5} {'serializer ms':>14} {'values ms':>10} {'rows/s before':>14} {'rows/s after':>13} {'queries':>8}"
+            )
+
+            for name, view_class in ENDPOINTS:
+                url = f"{reverse(name)}?limit={limit}"
+                results = {}
+                bodies = {}
+
+                for enabled in (False, True):
+                    view_class.values_list_enabled = enabled
+                    try:
+                        def fetch():
+                            response = client.get(url)
+                            assert response.status_code == 200, response.content
+                            bodies[enabled] = response.json()
+
+                        results[enabled] = measure(fetch, runs)
+                    finally:
+                        view_class.values_list_enabled = True
+
+                if bodies[False] != bodies[True]:
+                    raise CommandError(f"{name}: values() path output differs from the serializer output")
+
+                count = len(bodies[True]["results"])
+                before, after = results[False], results[True]
+                self.stdout.write(
+                    f"{name:<16} {count:>5} {before['median_ms']:>14.2f} {after['median_ms']:>10.2f} "
+                    f"{count / before['median_ms'] * 1000:>14.0f} {count / after['median_ms'] * 1000:>13.0f} "
+                    f"{before['queries']:>3} -> {after['queries']:<3}"
+                )
+
+    def _seed(self, fixture, rows):
+        business, branch, user = fixture["business"], fixture["branch"], fixture["user"]
+        numbers = itertools.count(1)
+
+        orders = Order.objects.bulk_create(
+            Order(
+                business=business,
+                branch=branch,
+                order_number=f"BENCH-{business.id}-{next(numbers)}",
+                sub_total=Decimal("100"),
+                tax=Decimal("8"),
+                total_amount=Decimal("108"),
+                amount_received=Decimal("100"),
+                status="Pending",
+                sold_by=user,
+            )
+            for _ in range(rows)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(
+                business=business,
+                branch=branch,
+                order=order,
+                inventory_item=item,
+                quantity=1,
+                item_total=item.selling_price,
+            )
+            for order, item in zip(orders, fixture["items"])
+        )
+        Payment.objects.bulk_create(
+            Payment(
+                business=business,
+                branch=branch,
+                order=order,
+                amount_received=order.total_amount,
+                status="Paid",
+                payment_date=date.today(),
+                receipt_number=order.order_number,
+                payment_method="Cash",
+            )
+            for order in orders
+        )
+        LoyaltyCard.objects.bulk_create(
+            LoyaltyCard(
+                business=business,
+                branch=branch,
+                card_number=f"BENCH-{index}",
+                customer_name=f"Customer {index}",
+                phone_number="0700000000",
+            )
+            for index in range(rows)
+        )
+        BusinessLedger.objects.bulk_create(
+            BusinessLedger(
+                business=business,
+                branch=branch,
+                source="Bench",
+                record_type="Credit",
+                date=date.today(),
+                credit=Decimal("108"),
+                reference=order.order_number,
+            )
+            for order in orders
+        )
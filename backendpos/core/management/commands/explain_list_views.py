@@ -0,0 +1,83 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.models import User
+
+
+# Plan lines that mean a table is read end to end instead of through an index.
+FULL_SCAN_PATTERNS = (
+    re.compile(r"\bSCAN (?!.*\bUSING (?:COVERING )?INDEX\b)(\w+)"),  # SQLite
+    re.compile(r"Seq Scan on (\w+)"),  # PostgreSQL
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN on the first page query of every list endpoint, as seen by "
+        "the given user (default: the first user with a business), and flags full table scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Id of the user to run the list views as.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan of every query.")
+
+    def handle(self, *args, **options):
+        user = self._get_user(options["user"])
+        factory = APIRequestFactory()
+        flagged = 0
+
+        for route, view_class in self._list_views():
+            request = factory.get(f"/{route}")
+            force_authenticate(request, user=user)
+
+            view = view_class()
+            view.setup(request)
+            view.request = view.initialize_request(request)
+            view.format_kwarg = None
+
+            try:
+                queryset = view.filter_queryset(view.get_queryset())
+                page_size = getattr(view.paginator, "default_limit", None) or 10
+                plan = queryset[:page_size].explain()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"SKIP  /{route} ({view_class.__name__}): {e}"))
+                continue
+
+            scans = sorted({match.group(1) for pattern in FULL_SCAN_PATTERNS for match in pattern.finditer(plan)})
+            if scans:
+                flagged += 1
+                self.stdout.write(self.style.ERROR(f"SCAN  /{route} ({view_class.__name__}): {', '.join(scans)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK    /{route} ({view_class.__name__})"))
+
+            if options["verbose_plans"] or scans:
+                for line in plan.splitlines():
+                    self.stdout.write(f"        {line}")
+
+        self.stdout.write(f"\n{flagged} list view(s) with full scans on {connection.vendor}")
+
+    def _get_user(self, user_id):
+        users = User.objects.filter(business__isnull=False)
+        user = users.filter(id=user_id).first() if user_id else users.order_by("id").first()
+        if user is None:
+            raise CommandError("No user with a business found; pass --user.")
+        return user
+
+    def _list_views(self, patterns=None, prefix=""):
+        """
+        Yields (route, view class) for every DRF list endpoint without URL
+        parameters, in URLconf order.
+        """
+        for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from self._list_views(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern):
+                view_class = getattr(pattern.callback, "cls", None)
+                if view_class and issubclass(view_class, ListModelMixin) and "<" not in route:
+                    yield route, view_class
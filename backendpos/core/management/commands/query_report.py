@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from core.profiling import profile_path, read_records, summarize
+
+
+SORT_KEYS = {
+    "queries": "avg_queries",
+    "duplicates": "avg_duplicates",
+    "time": "avg_sql_ms",
+    "budget": "over_budget",
+}
+
+
+class Command(BaseCommand):
+    help = "Prints the endpoints with the most SQL queries, repeated statements or SQL time recorded by the query profiler."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sort", choices=SORT_KEYS, default="queries")
+        parser.add_argument("--limit", type=int, default=15)
+        parser.add_argument("--show-sql", action="store_true", help="Print the most repeated statement of each endpoint.")
+
+    def handle(self, *args, **options):
+        endpoints = summarize(read_records())
+        if not endpoints:
+            self.stdout.write(f"No profiled requests in {profile_path()}; set QUERY_PROFILER_ENABLED=1 and exercise the API.")
+            return
+
+        endpoints.sort(key=lambda endpoint: endpoint[SORT_KEYS[options["sort"]]], reverse=True)
+
+        self.stdout.write(
+            f"{'endpoint':<55} {'reqs':>6} {'avg q':>7} {'max q':>6} {'avg dup':>8} {'avg sql ms':>11} {'over':>5}"
+        )
+        for endpoint in endpoints[:options["limit"]]:
+            line = (
+                f"{endpoint['endpoint'][:55]:<55} {endpoint['requests']:>6} {endpoint['avg_queries']:>7.1f} "
+                f"{endpoint['max_queries']:>6} {endpoint['avg_duplicates']:>8.1f} {endpoint['avg_sql_ms']:>11.2f} "
+                f"{endpoint['over_budget']:>5}"
+            )
+            self.stdout.write(self.style.ERROR(line) if endpoint["over_budget"] else line)
+
+            if options["show_sql"] and endpoint["worst_repeat"]:
+                repeat = endpoint["worst_repeat"]
+                self.stdout.write(f"    x{repeat['count']}: {repeat['sql'][:200]}")
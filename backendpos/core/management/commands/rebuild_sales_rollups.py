@@ -0,0 +1,17 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from core.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes the hourly sales rollups behind the dashboard metrics from orders, invoices and payments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business", type=int, help="Only rebuild this business id.")
+        parser.add_argument("--since", type=date.fromisoformat, help="Only rebuild days from this date (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(business_id=options["business"], since=options["since"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} sales rollup row(s)"))
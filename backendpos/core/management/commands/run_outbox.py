@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.outbox import process_batch, retry_failed
+
+
+class Command(BaseCommand):
+    help = "Runs outbox side effects (loyalty, store credit, ledger...) recorded by committed transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep when the outbox is idle.")
+        parser.add_argument("--once", action="store_true", help="Process a single batch and exit.")
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue events that used up their attempts first.")
+        parser.add_argument(
+            "--topics", nargs="+",
+            help="Only run these topics. Without it, every topic except OUTBOX_DEDICATED_TOPICS.",
+        )
+
+    def handle(self, *args, **options):
+        topics = options["topics"]
+        exclude_topics = () if topics else getattr(settings, "OUTBOX_DEDICATED_TOPICS", ())
+
+        if options["retry_failed"]:
+            self.stdout.write(f"Requeued {retry_failed()} failed outbox event(s)")
+
+        while True:
+            close_old_connections()
+            attempted = process_batch(limit=options["batch_size"], topics=topics, exclude_topics=exclude_topics)
+
+            if attempted:
+                self.stdout.write(f"Processed {attempted} outbox event(s)")
+
+            if options["once"]:
+                return
+
+            if not attempted:
+                time.sleep(options["interval"])
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_alter_branch_branch_manager'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('resource', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('business', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deletedrecords', to='core.business')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['business', 'created_at'], name='core_delete_busines_ddc33c_idx')],
+            },
+        ),
+    ]
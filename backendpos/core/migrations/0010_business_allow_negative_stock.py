@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_deletedrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='allow_negative_stock',
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_business_allow_negative_stock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('topic', models.CharField(max_length=100)),
+                ('ordering_key', models.CharField(blank=True, max_length=255, null=True)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Done', 'Done'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(auto_now_add=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('business', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='outboxevents', to='core.business')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='core_outbox_status_780de0_idx'), models.Index(fields=['ordering_key', 'status'], name='core_outbox_orderin_f64170_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:44
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_outboxevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField()),
+                ('orders_count', models.PositiveIntegerField(default=0)),
+                ('paid_orders', models.PositiveIntegerField(default=0)),
+                ('pending_orders', models.PositiveIntegerField(default=0)),
+                ('orders_total_paid', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('orders_total_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('invoices_count', models.PositiveIntegerField(default=0)),
+                ('pending_invoices', models.PositiveIntegerField(default=0)),
+                ('paid_invoices', models.PositiveIntegerField(default=0)),
+                ('invoices_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('invoices_paid_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='salesrollups', to='core.branch')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='salesrollups', to='core.business')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['business', 'day'], name='core_salesr_busines_a04615_idx')],
+                'constraints': [models.UniqueConstraint(fields=('business', 'branch', 'day', 'hour'), name='unique_sales_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_salesrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='branch',
+            index=models.Index(fields=['business', 'created_at'], name='core_branch_busines_4e924e_idx'),
+        ),
+    ]
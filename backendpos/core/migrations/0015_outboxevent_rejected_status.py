@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_outboxevent_running_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxevent',
+            name='status',
+            field=models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Done', 'Done'), ('Failed', 'Failed'), ('Rejected', 'Rejected')], default='Pending', max_length=20),
+        ),
+    ]
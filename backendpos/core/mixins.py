@@ -1,3 +1,33 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import Count, Max, Prefetch
+from django.utils.http import parse_etags
+from rest_framework import serializers, status
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from core.serializers import sparse_params
+
+
+def cursor_ordering_fields(view):
+    """
+    Columns the view's cursor paginator orders on (and reads from each row
+    to build the next cursor), whether or not the client asked for them.
+    """
+    paginator = getattr(view, "paginator", None)
+    cursor_class = getattr(paginator, "cursor_class", None)
+    if cursor_class is None and isinstance(paginator, CursorPagination):
+        cursor_class = type(paginator)
+    if cursor_class is None:
+        return []
+
+    ordering = cursor_class.ordering
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    return [field.lstrip("-") for field in ordering]
+
+
 class BusinessScopedQuerysetMixin:
     business_field = "business"
 
@@ -15,3 +45,217 @@ class BusinessScopedQuerysetMixin:
             return qs.none()
 
         return qs.filter(**{self.business_field: business})
+
+
+class ConditionalGetMixin:
+    """
+    ETag / If-None-Match for GET. The tag is a hash of the URL, the user's
+    business and the max(updated_at) and row count of `get_etag_querysets()`,
+    so a matching request gets a 304 after one aggregate query, without
+    loading or serializing anything. `Cache-Control: private, no-cache` lets
+    the browser keep the body and revalidate it on every fetch.
+
+    Views whose output also depends on other tables (counts, nested rows)
+    add those querysets in `get_etag_querysets`.
+    """
+
+    def get_etag_querysets(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return [queryset]
+
+    def get_etag(self, request):
+        parts = [request.get_full_path(), request.accepted_renderer.format, getattr(request.user, "business_id", None)]
+        for queryset in self.get_etag_querysets():
+            version = queryset.order_by().aggregate(last_updated=Max("updated_at"), rows=Count("pk"))
+            parts += [queryset.model._meta.label, version["last_updated"], version["rows"]]
+        return '"%s"' % hashlib.md5(repr(parts).encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+
+        # If-None-Match compares weakly (RFC 9110 13.1.2).
+        tags = [tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))]
+        if etag in tags or "*" in tags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class ValuesListMixin:
+    """
+    Read-only fast path for list views. Rows are fetched with `.values()` and
+    rendered through the serializer's field objects, built once per page,
+    instead of one model instance and one serializer pass per row. The JSON
+    is the same as the serializer's.
+
+    Method fields need a `values_<name>(row)` static method on the serializer;
+    any extra columns they read are listed in its `values_lookups`. Turn the
+    path off for a view with `values_list_enabled = False`.
+    """
+    values_list_enabled = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_list_enabled:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.get_serializer()
+        columns, lookups = values_plan(serializer)
+        queryset = self.filter_queryset(self.get_queryset())
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        lookups += [field for field in cursor_ordering_fields(self) if field in model_fields and field not in lookups]
+        queryset = queryset.values(*lookups)
+
+        page = self.paginate_queryset(queryset)
+        data = [render_values_row(row, columns) for row in (page if page is not None else queryset)]
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+def values_plan(serializer):
+    """
+    Maps each readable serializer field to how it is produced from a
+    `.values()` row: (name, lookup or callable, to_representation or None).
+    """
+    columns = []
+    lookups = list(getattr(serializer, "values_lookups", ()))
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if isinstance(field, serializers.SerializerMethodField):
+            method = getattr(serializer, f"values_{name}", None)
+            if method is None:
+                raise ImproperlyConfigured(f"{type(serializer).__name__} needs values_{name}() for the values list path")
+            columns.append((name, method, None))
+        elif isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)) or "." in field.source:
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name} is not supported by the values list path")
+        elif isinstance(field, serializers.RelatedField):
+            # values() already yields the primary key a PrimaryKeyRelatedField renders.
+            columns.append((name, field.source, None))
+            lookups.append(field.source)
+        else:
+            columns.append((name, field.source, field.to_representation))
+            lookups.append(field.source)
+
+    return columns, list(dict.fromkeys(lookups))
+
+
+def render_values_row(row, columns):
+    data = {}
+    for name, source, to_representation in columns:
+        if callable(source):
+            data[name] = source(row)
+        else:
+            value = row[source]
+            data[name] = to_representation(value) if to_representation and value is not None else value
+    return data
+
+
+class SparseQuerysetMixin:
+    """
+    Narrows the queryset of GET requests using `?fields=` / `?expand=` to
+    what the trimmed serializer reads: `only()` the backing columns, and
+    select_related / prefetch_related just the relations still rendered.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if sparse_params(self.request) is None:
+            return queryset
+
+        return sparse_queryset(queryset, self.get_serializer(), cursor_ordering_fields(self))
+
+
+def sparse_queryset(queryset, serializer, keep=()):
+    """
+    Restricts `queryset` to the columns and relations `serializer.fields`
+    read. Fields backed by model properties or serializer methods are
+    declared in the serializer's `sparse_sources` ({name: lookups}); if any
+    field cannot be resolved the queryset is returned untouched.
+    """
+    model = queryset.model
+    declared = getattr(serializer, "sparse_sources", {})
+    columns = {model._meta.pk.name}
+    relations, prefetches = set(), set()
+
+    columns.update(name for name in keep if _resolve(model, name.split("__"))[0] == "column")
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if name in declared:
+            lookups = [lookup.split("__") for lookup in declared[name]]
+        elif field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+            return queryset
+        elif field.source in queryset.query.annotations:
+            continue
+        else:
+            lookups = [field.source_attrs]
+
+        for attrs in lookups:
+            if attrs[0] in queryset.query.annotations:
+                continue
+            kind, path = _resolve(model, attrs)
+            if kind is None:
+                return queryset
+            if kind == "column" and isinstance(field, serializers.BaseSerializer):
+                kind = "relation"
+
+            if kind == "prefetch":
+                prefetches.add(path.split("__")[0])
+            elif kind == "relation":
+                relations.add(path)
+                columns.add(path)
+            else:
+                columns.add(path)
+                if "__" in path:
+                    relations.add(path.rsplit("__", 1)[0])
+
+    kept_prefetches = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split("__")[0] in prefetches
+    ]
+    return (
+        queryset.select_related(None).select_related(*relations)
+        .prefetch_related(None).prefetch_related(*kept_prefetches)
+        .only(*columns)
+    )
+
+
+def _resolve(model, attrs):
+    """
+    How `attrs` (a field's source path) is read from `model` instances:
+    ("column", lookup), ("relation", lookup) for a whole related row,
+    ("prefetch", lookup) for a to-many relation, or (None, None) if unknown.
+    """
+    path = []
+    opts = model._meta
+
+    for attr in attrs:
+        try:
+            field = opts.get_field(attr)
+        except FieldDoesNotExist:
+            # A method or property of a related object needs its whole row.
+            return ("relation", "__".join(path)) if path else (None, None)
+
+        path.append(attr)
+        if field.one_to_many or field.many_to_many:
+            return "prefetch", "__".join(path)
+        if not field.concrete:
+            return None, None
+        if field.is_relation:
+            opts = field.related_model._meta
+
+    return "column", "__".join(path)
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.db import models
 
 # Create your models here.
@@ -22,6 +24,7 @@ class Business(AbstractBaseModel):
     business_type = models.CharField(max_length=255, null=True)
     tax_number = models.CharField(max_length=255, null=True)
     status = models.CharField(max_length=255, default="Active")
+    allow_negative_stock = models.BooleanField(default=True)
 
     def __str__(self):
         return self.name
@@ -37,5 +40,98 @@ class Branch(AbstractBaseModel):
     status = models.CharField(max_length=255, default="Active")
     branch_manager = models.ForeignKey('users.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='managed_branch')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.business.name}"
+
+class DeletedRecord(AbstractBaseModel):
+    """
+    Tombstone left behind when a synced row is deleted, so terminals polling
+    for catalog changes can drop it from their local copy.
+    """
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, null=True, related_name="deletedrecords")
+    resource = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.resource} #{self.object_id}"
+
+
+OUTBOX_STATUSES = (
+    ("Pending", "Pending"),
+    ("Running", "Running"),
+    ("Done", "Done"),
+    ("Failed", "Failed"),
+    ("Rejected", "Rejected"),
+)
+
+
+class OutboxEvent(AbstractBaseModel):
+    """
+    Side effect recorded in the same transaction as the write that caused it
+    and executed after commit by the `run_outbox` worker. Events sharing an
+    `ordering_key` are applied strictly in insertion order.
+    """
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, null=True, related_name="outboxevents")
+    topic = models.CharField(max_length=100)
+    ordering_key = models.CharField(max_length=255, null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, default="Pending", choices=OUTBOX_STATUSES)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"]),
+            models.Index(fields=["ordering_key", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id} ({self.status})"
+
+
+class SalesRollup(AbstractBaseModel):
+    """
+    Order, invoice and payment totals for one branch and one local hour.
+    Rows are recomputed from the source tables whenever a write touches
+    their hour, so the dashboard reads a handful of rows per day.
+    """
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name="salesrollups")
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, null=True, blank=True, related_name="salesrollups")
+    day = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+
+    orders_count = models.PositiveIntegerField(default=0)
+    paid_orders = models.PositiveIntegerField(default=0)
+    pending_orders = models.PositiveIntegerField(default=0)
+    orders_total_paid = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    orders_total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+
+    invoices_count = models.PositiveIntegerField(default=0)
+    pending_invoices = models.PositiveIntegerField(default=0)
+    paid_invoices = models.PositiveIntegerField(default=0)
+    invoices_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    invoices_paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["business", "branch", "day", "hour"], name="unique_sales_rollup_bucket"),
+        ]
+        indexes = [
+            models.Index(fields=["business", "day"]),
+        ]
+
     def __str__(self):
-        return f"{self.name} - {self.business.name}"
\ No newline at end of file
+        return f"{self.business} {self.day} {self.hour:02d}:00"
@@ -0,0 +1,169 @@
+import logging
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from core.models import Business, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# topic -> handler(payload). Apps register their handlers from AppConfig.ready().
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+# Topics whose handlers manage their own transactions, e.g. because they wait
+# on external HTTP calls that must not hold a transaction open.
+NON_ATOMIC_TOPICS: Set[str] = set()
+
+# topic -> on_failure(payload, error), called once an event of the topic is
+# Failed or Rejected, so the rows it was going to update can say so.
+FAILURE_HANDLERS: Dict[str, Callable[[Dict[str, Any], Exception], None]] = {}
+
+# Errors no retry can fix (a business rule refused the event, or a row it
+# needs is gone). Such events are Rejected at once and stop blocking their key.
+NON_RETRYABLE_ERRORS = (ValueError, ObjectDoesNotExist)
+
+
+def register(topic: str, atomic: bool = True, on_failure: Optional[Callable[[Dict[str, Any], Exception], None]] = None):
+    def decorator(handler):
+        HANDLERS[topic] = handler
+        if not atomic:
+            NON_ATOMIC_TOPICS.add(topic)
+        if on_failure is not None:
+            FAILURE_HANDLERS[topic] = on_failure
+        return handler
+    return decorator
+
+
+def enqueue(topic: str, payload: Dict[str, Any], business: Optional[Business] = None, ordering_key: Optional[str] = None) -> OutboxEvent:
+    """
+    Records a side effect in the caller's transaction. It only becomes
+    visible to the worker if that transaction commits.
+    """
+    return OutboxEvent.objects.create(
+        business=business,
+        topic=topic,
+        ordering_key=ordering_key,
+        payload=payload,
+    )
+
+
+def due_events(now, topics: Optional[Iterable[str]] = None, exclude_topics: Iterable[str] = ()):
+    """
+    Pending events that are due and have no unfinished (pending, running or
+    failed) event before them under the same ordering key. Rejected events
+    count as finished. A Running claim
+    older than OUTBOX_CLAIM_TIMEOUT belongs to a worker that died and is due
+    again. `topics` / `exclude_topics` narrow it to what one worker runs.
+    """
+    stale = now - timedelta(seconds=getattr(settings, "OUTBOX_CLAIM_TIMEOUT", 300))
+    earlier_unfinished = OutboxEvent.objects.filter(
+        ordering_key=OuterRef("ordering_key"),
+        id__lt=OuterRef("id"),
+    ).exclude(status__in=("Done", "Rejected"))
+
+    events = OutboxEvent.objects.filter(Q(status="Pending", available_at__lte=now) | Q(status="Running", updated_at__lt=stale))
+    if topics is not None:
+        events = events.filter(topic__in=list(topics))
+    exclude_topics = list(exclude_topics)
+    if exclude_topics:
+        events = events.exclude(topic__in=exclude_topics)
+    return events.exclude(Exists(earlier_unfinished)).order_by("id")
+
+
+def process_batch(limit: int = 100, topics: Optional[Iterable[str]] = None, exclude_topics: Iterable[str] = ()) -> int:
+    """
+    Runs up to `limit` due events in id order and returns how many were
+    attempted. Each event is claimed (-> Running) with a conditional UPDATE
+    first, so concurrent or overlapping workers never run it twice. Once an
+    event fails, later events for its ordering key wait until it succeeds;
+    a Failed one blocks them until it is requeued (`run_outbox --retry-failed`).
+    A Rejected one (see NON_RETRYABLE_ERRORS) does not block them.
+    """
+    now = timezone.now()
+    blocked_keys = set()
+    attempted = 0
+
+    for event in list(due_events(now, topics, exclude_topics)[:limit]):
+        if event.ordering_key in blocked_keys:
+            continue
+
+        claimed = OutboxEvent.objects.filter(id=event.id, status=event.status, updated_at=event.updated_at).update(
+            status="Running",
+            updated_at=timezone.now(),
+        )
+        if not claimed:
+            if event.ordering_key:
+                blocked_keys.add(event.ordering_key)
+            continue
+
+        attempted += 1
+        if _run(event) in ("Pending", "Failed") and event.ordering_key:
+            blocked_keys.add(event.ordering_key)
+
+    return attempted
+
+
+def retry_failed() -> int:
+    """
+    Puts Failed events back in the queue, which also unblocks their ordering keys.
+    """
+    return OutboxEvent.objects.filter(status="Failed").update(
+        status="Pending",
+        attempts=0,
+        available_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+def _run(event: OutboxEvent) -> str:
+    """
+    Runs one claimed event and returns the status it was left in.
+    """
+    handler = HANDLERS.get(event.topic)
+
+    try:
+        if handler is None:
+            raise LookupError(f"No outbox handler registered for topic '{event.topic}'")
+
+        with nullcontext() if event.topic in NON_ATOMIC_TOPICS else transaction.atomic():
+            handler(event.payload)
+            OutboxEvent.objects.filter(id=event.id).update(
+                status="Done",
+                attempts=event.attempts + 1,
+                updated_at=timezone.now(),
+            )
+        return "Done"
+
+    except Exception as e:
+        attempts = event.attempts + 1
+        max_attempts = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 5)
+
+        if isinstance(e, NON_RETRYABLE_ERRORS):
+            status = "Rejected"
+        elif attempts >= max_attempts:
+            status = "Failed"
+        else:
+            status = "Pending"
+
+        OutboxEvent.objects.filter(id=event.id).update(
+            status=status,
+            attempts=attempts,
+            available_at=timezone.now() + timedelta(seconds=2 ** attempts),
+            last_error=traceback.format_exc(),
+            updated_at=timezone.now(),
+        )
+
+        on_failure = FAILURE_HANDLERS.get(event.topic)
+        if on_failure is not None and status in ("Failed", "Rejected"):
+            try:
+                on_failure(event.payload, e)
+            except Exception:
+                logger.exception("Failure handler of outbox event %s raised", event.id)
+        return status
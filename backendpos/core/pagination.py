@@ -0,0 +1,38 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (created_at, id), newest first. Every page is a range
+    scan on the `(business, created_at, id)` indexes and no COUNT(*) is run,
+    so page N costs the same as page 1.
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "limit"
+    max_page_size = 500
+
+
+class OptionalCursorPagination(LimitOffsetPagination):
+    """
+    The default limit/offset pagination, switching to cursor pagination when
+    the client opts in with `?pagination=cursor` or follows a `next` cursor
+    link. Cursor pages return `next`, `previous` and `results` but no `count`.
+    """
+    cursor_class = CreatedAtCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if request.query_params.get("pagination") == "cursor" or "cursor" in request.query_params:
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
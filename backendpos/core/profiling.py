@@ -0,0 +1,125 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from django.conf import settings
+
+
+_write_lock = threading.Lock()
+
+# Collapses "IN (%s, %s, %s)" so the same statement with a different number of
+# ids still counts as a repeat.
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+
+
+class QueryRecorder:
+    """
+    `connection.execute_wrapper` hook counting the statements of one request,
+    their total time and how often the same statement shape was repeated.
+    Works with DEBUG off, unlike `connection.queries`.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[_IN_LIST.sub("(...)", sql)] += 1
+
+    def as_record(self, **extra) -> Dict[str, Any]:
+        repeated = [(sql, count) for sql, count in self.statements.most_common() if count > 1]
+        return {
+            **extra,
+            "queries": self.count,
+            "duplicates": sum(count - 1 for _, count in repeated),
+            "sql_ms": round(self.duration * 1000, 2),
+            "worst_repeat": {"sql": repeated[0][0][:500], "count": repeated[0][1]} if repeated else None,
+        }
+
+
+def profile_path() -> Path:
+    return Path(getattr(settings, "QUERY_PROFILER_PATH", settings.BASE_DIR / "query_profile.jsonl"))
+
+
+def append_record(record: Dict[str, Any]) -> None:
+    """
+    Appends one request to the JSONL store. Once the file passes
+    QUERY_PROFILER_MAX_BYTES it is rotated to `<name>.1`, so the store holds
+    between one and two files' worth of recent requests.
+    """
+    path = profile_path()
+    max_bytes = getattr(settings, "QUERY_PROFILER_MAX_BYTES", 5 * 1024 * 1024)
+    line = json.dumps(record) + "\n"
+
+    with _write_lock:
+        try:
+            if path.stat().st_size > max_bytes:
+                os.replace(path, path.with_name(path.name + ".1"))
+        except FileNotFoundError:
+            pass
+
+        with open(path, "a", encoding="utf-8") as store:
+            store.write(line)
+
+
+def read_records() -> Iterator[Dict[str, Any]]:
+    path = profile_path()
+    for candidate in (path.with_name(path.name + ".1"), path):
+        if not candidate.exists():
+            continue
+        with open(candidate, encoding="utf-8") as store:
+            for line in store:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash mid-write.
+                    continue
+
+
+def summarize(records: Iterator[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Groups recorded requests by endpoint (method and URL route).
+    """
+    endpoints: Dict[str, Dict[str, Any]] = {}
+
+    for record in records:
+        key = f'{record["method"]} {record["route"]}'
+        endpoint = endpoints.setdefault(key, {
+            "endpoint": key,
+            "requests": 0,
+            "queries": 0,
+            "max_queries": 0,
+            "duplicates": 0,
+            "max_duplicates": 0,
+            "sql_ms": 0.0,
+            "over_budget": 0,
+            "worst_repeat": None,
+        })
+        endpoint["requests"] += 1
+        endpoint["queries"] += record["queries"]
+        endpoint["max_queries"] = max(endpoint["max_queries"], record["queries"])
+        endpoint["duplicates"] += record["duplicates"]
+        endpoint["sql_ms"] += record["sql_ms"]
+        endpoint["over_budget"] += 1 if record.get("over_budget") else 0
+        if record["duplicates"] > endpoint["max_duplicates"]:
+            endpoint["max_duplicates"] = record["duplicates"]
+            endpoint["worst_repeat"] = record.get("worst_repeat")
+
+    for endpoint in endpoints.values():
+        endpoint["avg_queries"] = endpoint["queries"] / endpoint["requests"]
+        endpoint["avg_duplicates"] = endpoint["duplicates"] / endpoint["requests"]
+        endpoint["avg_sql_ms"] = endpoint["sql_ms"] / endpoint["requests"]
+
+    return list(endpoints.values())
@@ -0,0 +1,231 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from core.models import OutboxEvent, SalesRollup
+from core.outbox import enqueue, register
+from invoices.models import Invoice
+from orders.models import Order
+from payments.models import Payment
+
+
+# (business_id, branch_id, local day, local hour)
+Bucket = Tuple[int, Optional[int], date, int]
+
+COUNT_FIELDS = ("orders_count", "paid_orders", "pending_orders", "invoices_count", "pending_invoices", "paid_invoices")
+AMOUNT_FIELDS = ("orders_total_paid", "orders_total_amount", "invoices_total", "invoices_paid_amount", "revenue")
+ROLLUP_FIELDS = COUNT_FIELDS + AMOUNT_FIELDS
+
+# Outbox topic of bucket refreshes. Each bucket is its own ordering key, so
+# one worker at a time refreshes it, in commit order.
+REFRESH_TOPIC = "rollups.refresh"
+
+
+def bucket_for(business_id: int, branch_id: Optional[int], created_at: datetime) -> Bucket:
+    local = timezone.localtime(created_at)
+    return (business_id, branch_id, local.date(), local.hour)
+
+
+def mark_dirty(business_id: Optional[int], branch_id: Optional[int], created_at: Optional[datetime]) -> None:
+    """
+    Queues a refresh of the hour bucket of a written order, invoice or
+    payment. The refresh is an outbox event in the writer's transaction, so
+    it runs on the outbox worker after the write commits.
+    """
+    if business_id is None or created_at is None:
+        return
+    enqueue_refresh({bucket_for(business_id, branch_id, created_at)})
+
+
+def mark_records_dirty(records: Iterable) -> None:
+    """
+    Same as `mark_dirty` for rows written with bulk_create, which skips
+    post_save. Each bucket is queued once.
+    """
+    enqueue_refresh({
+        bucket_for(record.business_id, record.branch_id, record.created_at)
+        for record in records
+        if record.business_id is not None and record.created_at is not None
+    })
+
+
+def mark_orders_dirty(order_ids: Iterable[int]) -> None:
+    """
+    Same as `mark_dirty` for orders changed through set-based updates, where
+    only the ids are at hand.
+    """
+    enqueue_refresh({
+        bucket_for(order["business_id"], order["branch_id"], order["created_at"])
+        for order in Order.objects.filter(id__in=order_ids, business__isnull=False).values("business_id", "branch_id", "created_at")
+    })
+
+
+def enqueue_refresh(buckets: Set[Bucket]) -> None:
+    for bucket in sorted(buckets, key=str):
+        business_id, branch_id, day, hour = bucket
+        enqueue(
+            REFRESH_TOPIC,
+            {"business_id": business_id, "branch_id": branch_id, "day": day.isoformat(), "hour": hour},
+            ordering_key=_ordering_key(bucket),
+        )
+
+
+@register(REFRESH_TOPIC)
+def refresh_rollup(payload: Dict[str, object]) -> None:
+    bucket = (payload["business_id"], payload["branch_id"], date.fromisoformat(payload["day"]), payload["hour"])
+
+    # Refreshes of this bucket queued behind this one only wait for writes that
+    # have committed by now, which the aggregate below already sees.
+    OutboxEvent.objects.filter(topic=REFRESH_TOPIC, ordering_key=_ordering_key(bucket), status="Pending").update(
+        status="Done",
+        updated_at=timezone.now(),
+    )
+    refresh_bucket(*bucket)
+
+
+def today_metrics(business_id: int) -> Dict[str, object]:
+    """
+    Today's dashboard figures for a business, summed from its rollup rows.
+    """
+    totals = SalesRollup.objects.filter(business_id=business_id, day=timezone.localdate()).aggregate(
+        **{field: Sum(field) for field in ROLLUP_FIELDS}
+    )
+    totals = {field: value or 0 for field, value in totals.items()}
+
+    return {
+        "orders_count": totals["orders_count"],
+        "paid_orders": totals["paid_orders"],
+        "pending_orders": totals["pending_orders"],
+        "orders_total_paid": totals["orders_total_paid"],
+        "orders_total_amount": totals["orders_total_amount"],
+        "orders_total_pending": totals["orders_total_amount"] - totals["orders_total_paid"],
+
+        "invoices_count": totals["invoices_count"],
+        "pending_invoices": totals["pending_invoices"],
+        "paid_invoices": totals["paid_invoices"],
+        "invoices_total": totals["invoices_total"],
+        "invoices_paid_amount": totals["invoices_paid_amount"],
+        "invoices_pending_amount": totals["invoices_total"] - totals["invoices_paid_amount"],
+
+        "revenue_today": totals["revenue"],
+    }
+
+
+def rollup_versions(business_ids: Iterable[int]) -> Dict[int, Tuple[object, int]]:
+    """
+    Change marker of today's rollups per business: the latest refresh and the
+    row count, one grouped query for all of them. Open metrics streams poll
+    it (see core.live) to notice refreshes made by the outbox worker.
+    """
+    rows = (
+        SalesRollup.objects
+        .filter(business_id__in=business_ids, day=timezone.localdate())
+        .values("business_id")
+        .annotate(last_refresh=Max("updated_at"), rows=Count("id"))
+        .order_by()
+    )
+    return {row["business_id"]: (row["last_refresh"], row["rows"]) for row in rows}
+
+
+def refresh_bucket(business_id: int, branch_id: Optional[int], day: date, hour: int) -> None:
+    start = timezone.make_aware(datetime.combine(day, time(hour)))
+    rows = collect_rollups(
+        business_id=business_id,
+        branch_id=branch_id,
+        created_at__gte=start,
+        created_at__lt=start + timedelta(hours=1),
+    )
+    values = rows.get((business_id, branch_id, day, hour))
+
+    if values is None:
+        SalesRollup.objects.filter(business_id=business_id, branch_id=branch_id, day=day, hour=hour).delete()
+    else:
+        SalesRollup.objects.update_or_create(
+            business_id=business_id, branch_id=branch_id, day=day, hour=hour, defaults=values,
+        )
+
+
+@transaction.atomic
+def rebuild_rollups(business_id: Optional[int] = None, since: Optional[date] = None) -> int:
+    """
+    Recomputes every bucket for a business (or all businesses) from `since`
+    onwards with three grouped aggregates and replaces the stored rows.
+    Returns the number of rollup rows written.
+    """
+    source_filters: Dict[str, object] = {"business__isnull": False}
+    rollup_filters: Dict[str, object] = {}
+    if business_id is not None:
+        source_filters["business_id"] = rollup_filters["business_id"] = business_id
+    if since is not None:
+        source_filters["created_at__gte"] = timezone.make_aware(datetime.combine(since, time.min))
+        rollup_filters["day__gte"] = since
+
+    rows = collect_rollups(**source_filters)
+
+    SalesRollup.objects.filter(**rollup_filters).delete()
+    SalesRollup.objects.bulk_create(
+        [
+            SalesRollup(business_id=business, branch_id=branch, day=day, hour=hour, **values)
+            for (business, branch, day, hour), values in rows.items()
+        ],
+        batch_size=500,
+    )
+    return len(rows)
+
+
+def collect_rollups(**filters) -> Dict[Bucket, Dict[str, object]]:
+    """
+    Aggregates orders, invoices and incoming payments matching `filters` into
+    hour buckets. The filters must only use fields the three models share.
+    """
+    rows: Dict[Bucket, Dict[str, object]] = {}
+
+    def merge(queryset, **aggregates):
+        grouped = (
+            queryset.filter(**filters)
+            .annotate(bucket_hour=TruncHour("created_at"))
+            .values("business_id", "branch_id", "bucket_hour")
+            .annotate(**aggregates)
+            .order_by()
+        )
+        for row in grouped:
+            bucket = bucket_for(row["business_id"], row["branch_id"], row["bucket_hour"])
+            values = rows.setdefault(bucket, _empty_values())
+            for field in aggregates:
+                values[field] = row[field] or values[field]
+
+    merge(
+        Order.objects.all(),
+        orders_count=Count("id"),
+        paid_orders=Count("id", filter=Q(status="Paid")),
+        pending_orders=Count("id", filter=Q(status__in=["Pending", "Pending Payment"])),
+        orders_total_paid=Sum("amount_paid"),
+        orders_total_amount=Sum("total_amount"),
+    )
+    merge(
+        Invoice.objects.all(),
+        invoices_count=Count("id"),
+        pending_invoices=Count("id", filter=Q(status__in=["Pending", "Pending Payment"])),
+        paid_invoices=Count("id", filter=Q(status__in=["Paid", "Completed", "Complete"])),
+        invoices_total=Sum("total_amount"),
+        invoices_paid_amount=Sum("amount_paid"),
+    )
+    merge(
+        Payment.objects.filter(direction="Incoming"),
+        revenue=Sum("amount_received"),
+    )
+    return rows
+
+
+def _empty_values() -> Dict[str, object]:
+    return {**{field: 0 for field in COUNT_FIELDS}, **{field: Decimal("0") for field in AMOUNT_FIELDS}}
+
+
+def _ordering_key(bucket: Bucket) -> str:
+    business_id, branch_id, day, hour = bucket
+    return f"rollup:{business_id}:{branch_id}:{day.isoformat()}:{hour}"
@@ -1,8 +1,70 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
 from core.models import Business, Branch
 
-class BusinessSerializer(serializers.ModelSerializer):
+
+def sparse_params(request):
+    """
+    The `?fields=` and `?expand=` names of a read request, as (fields, expand)
+    with None for an absent parameter, or None when neither applies.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+
+    params = [request.query_params.get(name) for name in ("fields", "expand")]
+    if not any(params):
+        return None
+    return tuple({name.strip() for name in value.split(",") if name.strip()} if value else None for value in params)
+
+
+def sparse_fields(fields, wanted, expand=None):
+    """
+    Trims a serializer's fields in place. With `wanted` only the listed
+    fields are kept and "nested.field" names trim nested serializers the same
+    way. Nested serializers are only kept when listed in `wanted` or `expand`;
+    without `wanted` every other field is kept.
+    """
+    expand = expand or set()
+    children = {}
+    for name in wanted or ():
+        head, _, rest = name.partition(".")
+        if rest:
+            children.setdefault(head, set()).add(rest)
+
+    for name, field in list(fields.items()):
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if wanted is not None:
+            keep = name in wanted or name in children or name in expand
+        else:
+            keep = name in expand or not isinstance(nested, serializers.BaseSerializer)
+
+        if not keep:
+            fields.pop(name)
+        elif name in children and isinstance(nested, serializers.Serializer):
+            sparse_fields(nested.fields, children[name])
+
+    return fields
+
+
+class SparseFieldsetMixin:
+    """
+    Lets GET requests ask for part of a representation:
+    `?fields=id,name,purchases.amount` and `?expand=purchases`
+    (see `sparse_fields`). Writes always use every field.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        # Only the serializer the view created; nested ones are trimmed by it.
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        params = sparse_params(self.context.get("request")) if parent is None else None
+        if params is None:
+            return fields
+        return sparse_fields(fields, *params)
+
+class BusinessSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     owner_name = serializers.CharField(source='owner.get_full_name', read_only=True)
     class Meta:
         model = Business
@@ -10,7 +72,7 @@ class BusinessSerializer(serializers.ModelSerializer):
 
 
 
-class BranchSerializer(serializers.ModelSerializer):
+class BranchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     manager_name = serializers.CharField(source='branch_manager.get_full_name', read_only=True)
     class Meta:
         model = Branch
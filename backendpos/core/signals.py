@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.rollups import mark_dirty
+from invoices.models import Invoice
+from orders.models import Order
+from payments.models import Payment
+
+
+# Models whose writes feed the sales rollups.
+ROLLUP_SOURCES = (Order, Invoice, Payment)
+
+
+def refresh_sales_rollup(sender, instance, **kwargs):
+    mark_dirty(instance.business_id, instance.branch_id, instance.created_at)
+
+
+def connect_signals():
+    for model in ROLLUP_SOURCES:
+        post_save.connect(refresh_sales_rollup, sender=model, dispatch_uid=f"refresh_sales_rollup_save_{model.__name__}")
+        post_delete.connect(refresh_sales_rollup, sender=model, dispatch_uid=f"refresh_sales_rollup_delete_{model.__name__}")
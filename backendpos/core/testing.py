@@ -0,0 +1,79 @@
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from rest_framework.test import APITestCase
+
+from core.models import Branch, Business
+from users.models import User
+
+
+class BusinessAPITestCase(APITestCase):
+    """
+    A business with one branch and a user of it, authenticated for every
+    test. Override `user_fields` to change the user.
+    """
+
+    user_fields: Dict[str, Any] = {"username": "cashier"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Shop", address="Nairobi", phone_number="0700000000")
+        cls.branch = Branch.objects.create(business=cls.business, name="Main", address="Nairobi", phone_number="0700000000")
+        cls.user = User.objects.create(business=cls.business, branch=cls.branch, **cls.user_fields)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def assert_constant_queries(self, url: str, seed: Callable[[int], None], queries: int = 2, page_size: int = 10):
+        """
+        GETs `url` with 2 and then `page_size` rows seeded by `seed(count)`
+        and checks both cost `queries` queries. Returns the second response.
+        """
+        seed(2)
+        with self.assertNumQueries(queries):
+            self.client.get(url)
+
+        seed(page_size - 2)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        return response
+
+    def assert_cursor_pages(self, url: str, total: int, page_size: int = 2, queries: int = 1):
+        """
+        Walks `url` with `?pagination=cursor`, following `next` links, and
+        checks every page costs `queries` queries (no COUNT) and every row
+        shows up once, newest first. Returns the ids in page order.
+        """
+        ids = []
+        next_url, params = url, {"pagination": "cursor", "limit": page_size}
+        while next_url:
+            with self.assertNumQueries(queries):
+                response = self.client.get(next_url, params)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertNotIn("count", response.data)
+            ids += [row["id"] for row in response.data["results"]]
+            next_url, params = response.data["next"], None
+
+        self.assertEqual(len(ids), total)
+        self.assertEqual(ids, sorted(set(ids), reverse=True))
+        return ids
+
+
+def checkout_payload(receipt_no: str, lines: Iterable[Tuple[Any, int]], **fields) -> Dict[str, Any]:
+    """
+    A cash sale in the till's shape (see orders/order.py); `lines` are
+    (inventory item, quantity) pairs and `fields` override any key.
+    """
+    items = [
+        {"id": item.id, "item_name": item.name, "quantity": quantity,
+         "unit_price": float(item.selling_price), "total_price": float(item.selling_price * quantity)}
+        for item, quantity in lines
+    ]
+    subtotal = sum(line["total_price"] for line in items)
+    payload = {
+        "items": items, "subtotal": subtotal, "tax": 0, "total": subtotal, "paymentMethod": "cash",
+        "amountReceived": subtotal, "change": 0, "mobileNumber": "", "mobileNetwork": "", "splitCashAmount": 0,
+        "splitMobileAmount": 0, "cardNumber": "", "storeCreditUsed": 0,
+        "loyaltyPointsUsed": 0, "status": "Paid", "date": "2026-10-17", "receiptNo": receipt_no,
+    }
+    payload.update(fields)
+    return payload
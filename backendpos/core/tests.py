@@ -1,3 +1,252 @@
-from django.test import TestCase
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import outbox
+from core.live import metrics_broadcaster
+from core.models import OutboxEvent, SalesRollup
+from core.rollups import REFRESH_TOPIC, ROLLUP_FIELDS, rebuild_rollups, today_metrics
+from core.testing import BusinessAPITestCase
+from core.views import MetricsStreamView
+from invoices.models import Invoice
+from orders.models import Order
+from payments.models import Payment
+
+
+calls = []
+
+
+@outbox.register("test.record")
+def record(payload):
+    calls.append(payload["n"])
+
+
+@outbox.register("test.fail")
+def fail(payload):
+    raise RuntimeError("handler failed")
+
+
+@outbox.register("test.reject")
+def reject(payload):
+    raise ValueError("handler refused")
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def make_due(self):
+        OutboxEvent.objects.filter(status="Pending").update(available_at=timezone.now() - timedelta(seconds=1))
+
+    def test_event_commits_with_its_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                outbox.enqueue("test.record", {"n": 1})
+                raise RuntimeError("sale failed")
+        outbox.enqueue("test.record", {"n": 2})
+
+        self.assertEqual(outbox.process_batch(), 1)
+        self.assertEqual(calls, [2])
+        self.assertEqual(OutboxEvent.objects.get().status, "Done")
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_fail(self):
+        event = outbox.enqueue("test.fail", {})
+
+        self.assertEqual(outbox.process_batch(), 1)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ("Pending", 1))
+        self.assertGreater(event.available_at, timezone.now())
+        self.assertIn("handler failed", event.last_error)
+
+        # Not due yet.
+        self.assertEqual(outbox.process_batch(), 0)
+
+        self.make_due()
+        self.assertEqual(outbox.process_batch(), 1)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ("Failed", 2))
+
+    def test_backing_off_events_do_not_starve_due_ones(self):
+        for _ in range(3):
+            outbox.enqueue("test.fail", {})
+        outbox.process_batch()
+        outbox.enqueue("test.record", {"n": 1})
+
+        self.assertEqual(outbox.process_batch(limit=2), 1)
+        self.assertEqual(calls, [1])
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_failed_event_blocks_its_ordering_key(self):
+        failing = outbox.enqueue("test.fail", {}, ordering_key="card:1")
+        outbox.enqueue("test.record", {"n": 1}, ordering_key="card:1")
+        outbox.enqueue("test.record", {"n": 2}, ordering_key="card:2")
+
+        outbox.process_batch()
+        self.make_due()
+        outbox.process_batch()
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, "Failed")
+        self.assertEqual(calls, [2])
+
+        OutboxEvent.objects.filter(id=failing.id).update(topic="test.record", payload={"n": 0})
+        self.assertEqual(outbox.retry_failed(), 1)
+        outbox.process_batch()
+        self.assertEqual(calls, [2, 0])
+        # The successor becomes due once its predecessor is Done.
+        outbox.process_batch()
+        self.assertEqual(calls, [2, 0, 1])
+
+    def test_rejected_event_does_not_block_its_ordering_key(self):
+        rejected = outbox.enqueue("test.reject", {}, ordering_key="card:1")
+        outbox.enqueue("test.record", {"n": 1}, ordering_key="card:1")
+
+        outbox.process_batch()
+        rejected.refresh_from_db()
+        self.assertEqual((rejected.status, rejected.attempts), ("Rejected", 1))
+        self.assertIn("handler refused", rejected.last_error)
+
+        outbox.process_batch()
+        self.assertEqual(calls, [1])
+        self.assertEqual(outbox.retry_failed(), 0)
+
+    def test_workers_run_only_their_topics(self):
+        outbox.enqueue("test.record", {"n": 1})
+        rejected = outbox.enqueue("test.reject", {})
+
+        self.assertEqual(outbox.process_batch(exclude_topics=["test.reject"]), 1)
+        self.assertEqual(outbox.process_batch(topics=["test.record"]), 0)
+        rejected.refresh_from_db()
+        self.assertEqual(rejected.status, "Pending")
+
+        self.assertEqual(outbox.process_batch(topics=["test.reject"]), 1)
+        self.assertEqual(calls, [1])
+
+    def test_overlapping_workers_run_an_event_once(self):
+        outbox.enqueue("test.record", {"n": 1})
+        snapshot = list(outbox.due_events(timezone.now()))
+
+        # Both workers read the event before either claimed it.
+        with mock.patch.object(outbox, "due_events", return_value=snapshot):
+            self.assertEqual(outbox.process_batch(), 1)
+            self.assertEqual(outbox.process_batch(), 0)
+        self.assertEqual(calls, [1])
+
+    @override_settings(OUTBOX_CLAIM_TIMEOUT=60)
+    def test_abandoned_claims_are_picked_up_again(self):
+        event = outbox.enqueue("test.record", {"n": 1})
+        OutboxEvent.objects.filter(id=event.id).update(status="Running", updated_at=timezone.now())
+        self.assertEqual(outbox.process_batch(), 0)
+
+        OutboxEvent.objects.filter(id=event.id).update(updated_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(outbox.process_batch(), 1)
+        self.assertEqual(calls, [1])
+
+
+class RollupTests(BusinessAPITestCase):
+    def create_order(self, number, **fields):
+        return Order.objects.create(
+            business=self.business, branch=self.branch, order_number=number, status="Pending", sold_by=self.user, **fields
+        )
+
+    def stored_rollups(self):
+        return {
+            (row.pop("branch_id"), row.pop("day"), row.pop("hour")): row
+            for row in SalesRollup.objects.filter(business=self.business).values("branch_id", "day", "hour", *ROLLUP_FIELDS)
+        }
+
+    def assert_matches_rebuild(self):
+        while outbox.process_batch():
+            pass
+        refreshed = self.stored_rollups()
+        rebuild_rollups(self.business.id)
+        self.assertEqual(refreshed, self.stored_rollups())
+
+    def test_refreshed_rollups_match_a_rebuild(self):
+        order = self.create_order("R-1", total_amount=Decimal("100"))
+        invoice = Invoice.objects.create(
+            business=self.business, branch=self.branch, customer_name="Jane", phone_number="0700000001",
+            due_date=date.today(), invoice_number="INV-1", total_amount=Decimal("200"), amount_paid=Decimal("0"),
+        )
+        Payment.objects.create(
+            business=self.business, branch=self.branch, order=order, status="Paid",
+            payment_date=date.today(), amount_received=Decimal("100"),
+        )
+        # Writes only queue the refresh; the outbox worker runs it.
+        self.assertFalse(SalesRollup.objects.exists())
+        self.assert_matches_rebuild()
+        self.assertEqual(today_metrics(self.business.id)["revenue_today"], Decimal("100"))
+
+        order.status, order.amount_paid = "Paid", Decimal("100")
+        order.save()
+        Order.apply_item_delta(order.id, Decimal("50"))
+        self.assert_matches_rebuild()
+        self.assertEqual(today_metrics(self.business.id)["paid_orders"], 1)
+
+        invoice.delete()
+        self.assert_matches_rebuild()
+        self.assertEqual(today_metrics(self.business.id)["invoices_count"], 0)
+
+    def test_queued_refreshes_of_a_bucket_run_once(self):
+        for number in range(3):
+            self.create_order(f"R-{number}")
+        self.assertEqual(OutboxEvent.objects.filter(topic=REFRESH_TOPIC, status="Pending").count(), 3)
+
+        self.assertEqual(outbox.process_batch(), 1)
+        self.assertFalse(OutboxEvent.objects.exclude(status="Done").exists())
+        self.assertEqual(SalesRollup.objects.get().orders_count, 3)
+
+
+class MetricsStreamTicketTests(BusinessAPITestCase):
+    def stream_user(self, **params):
+        return MetricsStreamView()._authenticate(RequestFactory().get("/", params))
+
+    def test_ticket_opens_the_stream_once(self):
+        response = self.client.post(reverse("metrics-stream-ticket"))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.stream_user(ticket=response.data["ticket"]), self.user)
+        self.assertIsNone(self.stream_user(ticket=response.data["ticket"]))
+
+        ticket = self.client.post(reverse("metrics-stream-ticket")).data["ticket"]
+        self.assertNotEqual(ticket, response.data["ticket"])
+        self.assertEqual(self.stream_user(ticket=ticket), self.user)
+
+    def test_tokens_and_stale_tickets_are_refused(self):
+        self.assertIsNone(self.stream_user(token=str(AccessToken.for_user(self.user))))
+        self.assertIsNone(self.stream_user(ticket=str(AccessToken.for_user(self.user))))
+
+        ticket = self.client.post(reverse("metrics-stream-ticket")).data["ticket"]
+        with override_settings(METRICS_STREAM_TICKET_TTL=-1):
+            self.assertIsNone(self.stream_user(ticket=ticket))
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.post(reverse("metrics-stream-ticket")).status_code, 401)
+
+
+@override_settings(METRICS_STREAM_POLL_INTERVAL=0.01)
+class MetricsBroadcasterTests(BusinessAPITestCase):
+    async def next_message(self, queue):
+        return await asyncio.wait_for(queue.get(), timeout=2)
+
+    async def test_refreshes_by_the_worker_reach_open_streams(self):
+        queue = metrics_broadcaster.subscribe(self.business.id)
+        try:
+            self.assertEqual((await self.next_message(queue))["orders_count"], 0)
+
+            def sell():
+                Order.objects.create(business=self.business, branch=self.branch, order_number="R-1", status="Paid")
+                # Run by `run_outbox`, which shares nothing with this process but the database.
+                outbox.process_batch()
+
+            await sync_to_async(sell)()
+            self.assertEqual((await self.next_message(queue))["orders_count"], 1)
+        finally:
+            metrics_broadcaster.unsubscribe(self.business.id, queue)
@@ -2,11 +2,13 @@ from django.urls import path
 from core.views import (
     BranchDetailAPIView, BranchListCreateAPIView, 
     BusinessListCreateAPIView, BusinessDetailAPIView,
-    BusinessOnboardingAPIView, MetricsAPIView
+    BusinessOnboardingAPIView, MetricsAPIView, MetricsStreamView, MetricsStreamTicketAPIView
 )
 
 urlpatterns = [
     path("metrics/", MetricsAPIView.as_view(), name="metrics"),
+    path("metrics/stream/", MetricsStreamView.as_view(), name="metrics-stream"),
+    path("metrics/stream/ticket/", MetricsStreamTicketAPIView.as_view(), name="metrics-stream-ticket"),
     path("businesses/", BusinessListCreateAPIView.as_view(), name="businesses"),
     path("businesses/<int:pk>/details/", BusinessDetailAPIView.as_view(), name="business-details"),
     path("branches/", BranchListCreateAPIView.as_view(), name="branches"),
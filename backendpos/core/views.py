@@ -1,26 +1,29 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views import View
 from django.db import transaction
 from datetime import datetime
-from django.db.models import Sum, Count, Q
-from django.utils import timezone
 
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
+from users.authentication import CachedJWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
 
 from datetime import timedelta
 
 from core.mixins import BusinessScopedQuerysetMixin
 
 from core.models import Business, Branch
+from core.rollups import today_metrics
+from core.live import issue_stream_ticket, metrics_events, stream_ticket_user_id
 from finances.models import PricingPlan, BusinessSubscription
 from users.models import User
 from core.serializers import BusinessSerializer, BranchSerializer, BusinessOnboardingSerializer
 
-from orders.models import Order
-from payments.models import Payment
-from invoices.models import Invoice
 
 date_today = datetime.now().date()
 
@@ -36,75 +39,65 @@ class MetricsAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        date_today = timezone.localdate()
+        # Answered from the hourly rollups, so the cost does not grow with
+        # sales volume. The rollups are refreshed by the `run_outbox` worker;
+        # without it running these figures stop moving.
+        return Response(today_metrics(business.id), status=status.HTTP_200_OK)
 
-        orders_qs = Order.objects.filter(
-            business=business,
-            created_at__date=date_today
-        )
 
-        invoices_qs = Invoice.objects.filter(
-            business=business,
-            created_at__date=date_today
-        )
+class MetricsStreamView(View):
+    """
+    Server-Sent Events stream of today's dashboard metrics, pushed whenever the
+    rollups behind them are refreshed. Served by the ASGI app. EventSource
+    cannot send headers, so browsers pass a ticket from
+    `MetricsStreamTicketAPIView` as `?ticket=` instead of the access token.
+    """
 
-        payments_qs = Payment.objects.filter(
-            business=business,
-            direction="Incoming",
-            created_at__date=date_today
-        )
+    async def get(self, request, *args, **kwargs):
+        user = await sync_to_async(self._authenticate)(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided or are invalid."}, status=401)
 
-        order_metrics = orders_qs.aggregate(
-            orders_count=Count("id"),
-            paid_orders=Count("id", filter=Q(status="Paid")),
-            pending_orders=Count(
-                "id",
-                filter=Q(status__in=["Pending", "Pending Payment"])
-            ),
-            orders_total_paid=Sum("amount_paid"),
-            orders_total_amount=Sum("total_amount"),
-        )
+        if not user.business_id:
+            return JsonResponse({"detail": "User has no associated business"}, status=400)
 
-        invoice_metrics = invoices_qs.aggregate(
-            invoices_count=Count("id"),
-            pending_invoices=Count(
-                "id",
-                filter=Q(status__in=["Pending", "Pending Payment"])
-            ),
-            paid_invoices=Count(
-                "id",
-                filter=Q(status__in=["Paid", "Completed", "Complete"])
-            ),
-            invoices_total=Sum("total_amount"),
-            invoices_paid_amount=Sum("amount_paid"),
+        response = StreamingHttpResponse(
+            metrics_events(user.business_id),
+            content_type="text/event-stream",
         )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def _authenticate(self, request):
+        authentication = CachedJWTAuthentication()
+        try:
+            result = authentication.authenticate(request)
+            if result is not None:
+                return result[0]
+
+            user_id = stream_ticket_user_id(request.GET.get("ticket", ""))
+            if user_id is not None:
+                return User.objects.select_related("business").filter(id=user_id, is_active=True).first()
+        except (AuthenticationFailed, InvalidToken, TokenError):
+            return None
+        return None
+
+
+class MetricsStreamTicketAPIView(APIView):
+    """
+    Exchanges the caller's credentials for a ticket that opens the metrics
+    stream within METRICS_STREAM_TICKET_TTL seconds, and does nothing else.
+    """
+    permission_classes = [IsAuthenticated]
 
-        revenue_today = payments_qs.aggregate(
-            revenue=Sum("amount_received")
-        )["revenue"] or 0
-
-        orders_total_amount = order_metrics["orders_total_amount"] or 0
-        orders_total_paid = order_metrics["orders_total_paid"] or 0
-
-        invoices_total = invoice_metrics["invoices_total"] or 0
-        invoices_paid = invoice_metrics["invoices_paid_amount"] or 0
-
+    def post(self, request, *args, **kwargs):
         return Response(
-            {
-                **order_metrics,
-                "orders_total_pending": orders_total_amount - orders_total_paid,
-
-                **invoice_metrics,
-                "invoices_pending_amount": invoices_total - invoices_paid,
-
-                "revenue_today": revenue_today,
-            },
-            status=status.HTTP_200_OK
+            {"ticket": issue_stream_ticket(request.user), "expires_in": getattr(settings, "METRICS_STREAM_TICKET_TTL", 30)},
+            status=status.HTTP_201_CREATED,
         )
 
 
-
-
 class BusinessListCreateAPIView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
     queryset = Business.objects.all().order_by("-created_at")
     serializer_class = BusinessSerializer
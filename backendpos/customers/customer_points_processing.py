@@ -1,9 +1,16 @@
+import logging
+
 from customers.models import LoyaltyCard, LoyaltyCardRedeem, LoyaltyCardRecharge
 from decimal import Decimal
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from users.models import User
 
 
+logger = logging.getLogger(__name__)
+
+
 class CustomerPointsProcessor:
     def __init__(self, card_number: str, amount: Decimal, user: User):
         self.card_number = card_number
@@ -33,7 +40,7 @@ class CustomerPointsProcessor:
             amount=points_earned
         )
 
-        print(f"{points_earned} points added to card {self.card_number}")
+        logger.debug("%s points added to card %s", points_earned, self.card_number)
 
 
 
@@ -69,4 +76,61 @@ class CustomerPointsRedeemer:
             amount=self.points_to_redeem
         )
 
-        print(f"{self.points_to_redeem} points redeemed from card {self.card_number}")
\ No newline at end of file
+        logger.debug("%s points redeemed from card %s", self.points_to_redeem, self.card_number)
+
+
+class CustomerCheckoutLoyaltyProcessor:
+    """
+    Applies points accrual and redemption for one checkout in a fixed number
+    of statements: one lookup, one UPDATE and at most two INSERTs. The
+    redeemed points already left the card at checkout (see
+    orders.checkout.POSCheckoutProcessor); this credits the earned points,
+    turns the redeemed ones into store credit and records both.
+    """
+    def __init__(self, card_number: str, amount: Decimal, points_to_redeem: int, user: User):
+        self.card_number = card_number
+        self.amount = Decimal(str(amount or 0))
+        self.points_to_redeem = points_to_redeem or 0
+        self.user = user
+
+
+    def run(self):
+        if not self.card_number:
+            return {"message": "Loyalty card number not found!!"}
+        else:
+            self.__apply_loyalty()
+
+
+    @transaction.atomic
+    def __apply_loyalty(self):
+        loyalty_card = (
+            LoyaltyCard.objects
+            .filter(card_number=self.card_number, business=self.user.business)
+            .values("id")
+            .get()
+        )
+        points_earned = int(self.amount // Decimal(100))
+
+        LoyaltyCard.objects.filter(id=loyalty_card["id"]).update(
+            points=F("points") + points_earned,
+            amount_spend=F("amount_spend") + self.amount,
+            available_credit=F("available_credit") + Decimal(self.points_to_redeem),
+            updated_at=timezone.now(),
+        )
+
+        LoyaltyCardRecharge.objects.create(
+            business=self.user.business,
+            branch=self.user.branch,
+            card_id=loyalty_card["id"],
+            amount=points_earned
+        )
+
+        if self.points_to_redeem:
+            LoyaltyCardRedeem.objects.create(
+                business=self.user.business,
+                branch=self.user.branch,
+                card_id=loyalty_card["id"],
+                amount=self.points_to_redeem
+            )
+
+        logger.debug("%s points added and %s redeemed on card %s", points_earned, self.points_to_redeem, self.card_number)
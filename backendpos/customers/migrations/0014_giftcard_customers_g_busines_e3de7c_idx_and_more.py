@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('customers', '0013_giftcard_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='giftcard',
+            index=models.Index(fields=['business', 'created_at'], name='customers_g_busines_e3de7c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loyaltycard',
+            index=models.Index(fields=['business', 'created_at'], name='customers_l_busines_0352e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loyaltycard',
+            index=models.Index(fields=['business', 'updated_at'], name='customers_l_busines_8f9cfb_idx'),
+        ),
+    ]
@@ -17,6 +17,12 @@ class LoyaltyCard(AbstractBaseModel):
     available_credit = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('100000'))
     credit_issued = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'))
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+            models.Index(fields=["business", "updated_at"]),
+        ]
+
 
     def __str__(self):
         return self.customer_name
@@ -52,6 +58,11 @@ class GiftCard(AbstractBaseModel):
     expiry_date = models.DateField()
     status = models.CharField(max_length=50, default="Active")  # e.g., active, redeemed, expired
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return self.card_number
     
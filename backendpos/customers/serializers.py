@@ -1,30 +1,31 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from decimal import Decimal
 
 from django.db import models
 from customers.models import LoyaltyCard, LoyaltyCardRecharge, LoyaltyCardRedeem, GiftCard, GiftCardRedeem, GiftCardRecharge
 
 
-class LoyaltyCardRedeemSerializer(serializers.ModelSerializer):
+class LoyaltyCardRedeemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = LoyaltyCardRedeem
         fields = "__all__"
 
 
-class LoyaltyCardRechargeSerializer(serializers.ModelSerializer):
+class LoyaltyCardRechargeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = LoyaltyCardRecharge
         fields = "__all__"
 
 
 
-class LoyaltyCardSerializer(serializers.ModelSerializer):
+class LoyaltyCardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = LoyaltyCard
         fields = "__all__"
 
 
-class LoyaltyCardDetailSerializer(serializers.ModelSerializer):
+class LoyaltyCardDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     branch_name = serializers.CharField(source='branch.name', read_only=True)
     business_name = serializers.CharField(source='business.name', read_only=True)
     total_recharged = serializers.SerializerMethodField()
@@ -50,25 +51,25 @@ class LoyaltyCardUpdateSerializer(serializers.Serializer):
     money_spend = serializers.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'))
 
 
-class GiftCardRedeemSerializer(serializers.ModelSerializer):
+class GiftCardRedeemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = GiftCardRedeem
         fields = "__all__"
 
 
-class GiftCardRechargeSerializer(serializers.ModelSerializer):
+class GiftCardRechargeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = GiftCardRecharge
         fields = "__all__"
 
 
-class GiftCardSerializer(serializers.ModelSerializer):
+class GiftCardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = GiftCard
         fields = "__all__"
 
 
-class GiftCardDetailSerializer(serializers.ModelSerializer):
+class GiftCardDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     branch_name = serializers.CharField(source='branch.name', read_only=True)
     business_name = serializers.CharField(source='business.name', read_only=True)
     class Meta:
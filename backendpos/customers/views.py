@@ -2,7 +2,7 @@ from rest_framework import status, generics
 from rest_framework.response import Response 
 from rest_framework.permissions import IsAuthenticated
 
-from core.mixins import BusinessScopedQuerysetMixin
+from core.mixins import BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin
 
 
 from customers.models import (
@@ -16,7 +16,7 @@ from customers.serializers import (
 )
 
 # Create your views here.
-class LoyaltyCardAPIView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
+class LoyaltyCardAPIView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListCreateAPIView):
     queryset = LoyaltyCard.objects.all().order_by("-created_at")
     serializer_class = LoyaltyCardSerializer
     permission_classes = [IsAuthenticated]
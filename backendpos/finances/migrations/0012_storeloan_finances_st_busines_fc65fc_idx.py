@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_outboxevent'),
+        ('customers', '0013_giftcard_status'),
+        ('finances', '0011_storeloanrepayment_channel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='storeloan',
+            index=models.Index(fields=['business', 'created_at', 'id'], name='finances_st_busines_fc65fc_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('finances', '0012_storeloan_finances_st_busines_fc65fc_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['business', 'created_at'], name='finances_ex_busines_5d8faa_idx'),
+        ),
+    ]
@@ -12,6 +12,12 @@ class StoreLoan(AbstractBaseModel):
     issued_date = models.DateField(auto_now_add=True)
     issued_by = models.ForeignKey("users.User", on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at", "id"]),
+        ]
+
+
     def __str__(self):
         return f"Store Loan of {self.total_amount} for {self.customer}"
     
@@ -65,6 +71,11 @@ class Expense(AbstractBaseModel):
         ("Cheque", "Cheque"),
     ])
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return f"{self.description} - {self.amount}"
     
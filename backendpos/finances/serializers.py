@@ -1,15 +1,16 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 
 from finances.models import StoreLoan, Expense, PricingPlan, StoreLoanLog, StoreLoanRepayment
 from customers.models import LoyaltyCard, LoyaltyCardRecharge, LoyaltyCardRedeem
 
 
-class LoanRepaymentSerializer(serializers.ModelSerializer):
+class LoanRepaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = StoreLoanRepayment
         fields = "__all__"
 
-class LoanLogSerializer(serializers.ModelSerializer):
+class LoanLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = StoreLoanLog
         fields = "__all__"
@@ -17,20 +18,20 @@ class LoanLogSerializer(serializers.ModelSerializer):
 
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class ExpenseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     creator = serializers.CharField(source='actioned_by.get_full_name', read_only=True)
     class Meta:
         model = Expense
         fields = "__all__"
 
 
-class PricingPlanSerializer(serializers.ModelSerializer):
+class PricingPlanSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = PricingPlan
         fields = "__all__"
 
 
-class StoreCreditSerializer(serializers.ModelSerializer):
+class StoreCreditSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     customer_name = serializers.CharField(source='customer.customer_name', read_only=True)
     
     outstanding_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
@@ -38,8 +39,10 @@ class StoreCreditSerializer(serializers.ModelSerializer):
         model = StoreLoan
         fields = ["id", "customer_name", "total_amount", "amount_paid", "outstanding_amount", "issued_date"]
 
+    sparse_sources = {"outstanding_amount": ("total_amount", "amount_paid")}
 
-class StoreCreditDetailSerializer(serializers.ModelSerializer):
+
+class StoreCreditDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     customer_name = serializers.CharField(source='customer.customer_name', read_only=True)
     customer_email = serializers.CharField(source='customer.customer_email', read_only=True)
     customer_card_number = serializers.CharField(source='customer.card_number', read_only=True)
@@ -51,4 +54,6 @@ class StoreCreditDetailSerializer(serializers.ModelSerializer):
     loanawards = LoanLogSerializer(many=True)
     class Meta:
         model = StoreLoan
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+    sparse_sources = {"outstanding_amount": ("total_amount", "amount_paid")}
@@ -18,7 +18,8 @@ class ProcessStoreLoanMixin:
 
     @transaction.atomic
     def __process_store_loan(self):
-        loyalty_card = LoyaltyCard.objects.get(card_number=self.card_number)
+        # The credit itself was taken off the card at checkout.
+        loyalty_card = LoyaltyCard.objects.get(card_number=self.card_number, business=self.user.business)
         store_loan = StoreLoan.objects.filter(customer=loyalty_card).first()
 
         if not store_loan:
@@ -35,10 +36,6 @@ class ProcessStoreLoanMixin:
             store_loan.total_amount += self.amount
             store_loan.save()
 
-        store_loan.customer.available_credit -= self.amount
-        store_loan.customer.credit_issued += self.amount
-        store_loan.customer.save()
-
         StoreLoanLog.objects.create(
 
             loan=store_loan,
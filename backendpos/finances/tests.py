@@ -1,3 +1,18 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.urls import reverse
+
+from core.testing import BusinessAPITestCase
+from customers.models import LoyaltyCard
+from finances.models import StoreLoan
+
+
+class DebtorListTests(BusinessAPITestCase):
+    def test_debtor_list_pages_with_cursors(self):
+        card = LoyaltyCard.objects.create(
+            business=self.business, card_number="C-1", customer_name="Jane", phone_number="0700000001"
+        )
+        for _ in range(5):
+            StoreLoan.objects.create(business=self.business, customer=card, total_amount=Decimal("100"), issued_by=self.user)
+
+        self.assert_cursor_pages(reverse("debtors"), 5)
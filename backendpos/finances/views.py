@@ -3,7 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.db import transaction
 
-from core.mixins import BusinessScopedQuerysetMixin
+from core.mixins import BusinessScopedQuerysetMixin, SparseQuerysetMixin
 
 from finances.models import PricingPlan, StoreLoan, Expense
 from payments.models import BusinessLedger
@@ -12,8 +12,8 @@ from customers.models import LoyaltyCard
 from finances.serializers import StoreCreditSerializer, ExpenseSerializer, PricingPlanSerializer, StoreCreditDetailSerializer
 
 # Create your views here.
-class StoreCreditListCreateView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
-    queryset = StoreLoan.objects.all().order_by("-created_at")
+class StoreCreditListCreateView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, generics.ListCreateAPIView):
+    queryset = StoreLoan.objects.select_related("customer").order_by("-created_at")
     serializer_class = StoreCreditSerializer
     permission_classes = [IsAuthenticated]
 
@@ -50,14 +50,18 @@ class PricingPlanListCreateView(generics.ListCreateAPIView):
 
 
 
-class DebtorsListView(BusinessScopedQuerysetMixin, generics.ListAPIView):
-    queryset = StoreLoan.objects.all().order_by("-created_at")
+class DebtorsListView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, generics.ListAPIView):
+    queryset = StoreLoan.objects.select_related("customer").order_by("-created_at")
     serializer_class = StoreCreditSerializer
     permission_classes = [IsAuthenticated]
 
 
-class DebtorDetailView(BusinessScopedQuerysetMixin, generics.RetrieveAPIView):
-    queryset = StoreLoan.objects.all()
+class DebtorDetailView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, generics.RetrieveAPIView):
+    queryset = (
+        StoreLoan.objects
+        .select_related("customer", "branch", "business", "issued_by")
+        .prefetch_related("repayments", "loanawards")
+    )
     serializer_class = StoreCreditDetailSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "pk"
\ No newline at end of file
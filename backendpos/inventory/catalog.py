@@ -0,0 +1,126 @@
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from core.models import Business, DeletedRecord
+from customers.models import LoyaltyCard
+from inventory.models import Category, InventoryItem, Menu
+
+
+# Resource name -> (model, columns). Rows are emitted as positional lists in
+# column order so a large catalog compresses well and parses quickly. Only
+# what a till needs offline is sent: loyalty cards carry no contact details.
+CATALOG_RESOURCES = {
+    "categories": (Category, ["id", "name", "description"]),
+    "items": (
+        InventoryItem,
+        ["id", "barcode", "name", "category_id", "branch_id", "quantity", "selling_price", "restock_level"],
+    ),
+    "menus": (Menu, ["id", "name", "branch_id", "quantity", "price"]),
+    "loyalty_cards": (
+        LoyaltyCard,
+        ["id", "card_number", "customer_name", "points", "available_credit"],
+    ),
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def to_version(value) -> int:
+    """
+    Converts a timestamp into the integer version handed out to terminals.
+    """
+    return (value - EPOCH) // timedelta(microseconds=1) if value else 0
+
+
+def from_version(version: int) -> datetime:
+    return EPOCH + timedelta(microseconds=version)
+
+
+def catalog_state(business: Business) -> Dict[str, Any]:
+    """
+    Cheap catalog fingerprint: the latest change and the row count of every
+    resource, plus the latest tombstone, one aggregate query each.
+    """
+    state = {}
+    for name, (model, _) in CATALOG_RESOURCES.items():
+        state[name] = model.objects.filter(business=business).aggregate(
+            last_modified=Max("updated_at"),
+            rows=Count("id"),
+        )
+
+    last_deleted = DeletedRecord.objects.filter(business=business).aggregate(
+        last_deleted=Max("created_at"),
+    )["last_deleted"]
+
+    state["version"] = max(
+        [to_version(last_deleted)]
+        + [to_version(state[name]["last_modified"]) for name in CATALOG_RESOURCES]
+    )
+    return state
+
+
+def catalog_etag(state: Dict[str, Any]) -> str:
+    fingerprint = ":".join(
+        [str(state["version"])] + [str(state[name]["rows"]) for name in CATALOG_RESOURCES]
+    )
+    return '"{}"'.format(hashlib.md5(fingerprint.encode()).hexdigest())
+
+
+def build_catalog(business: Business, version: int) -> Dict[str, Any]:
+    """
+    Returns the whole business catalog in a column-oriented payload.
+    """
+    payload: Dict[str, Any] = {"version": version}
+
+    for name, (model, columns) in CATALOG_RESOURCES.items():
+        payload[name] = {
+            "columns": columns,
+            "rows": list(
+                model.objects.filter(business=business).order_by("id").values_list(*columns)
+            ),
+        }
+
+    return payload
+
+
+def build_catalog_delta(business: Business, since: int, version: int) -> Dict[str, Any]:
+    """
+    Returns only the rows changed after `since`, in the same column-oriented
+    shape as the snapshot, plus the ids deleted since then under `deleted`.
+
+    `updated_at` is stamped before a write commits, so a row can become
+    visible with a timestamp older than a version already handed out. The
+    delta reaches back CATALOG_DELTA_OVERLAP seconds to cover such rows;
+    terminals apply rows and tombstones idempotently, so repeats are harmless.
+    """
+    payload: Dict[str, Any] = {"version": version, "since": since, "deleted": {}}
+    for name in CATALOG_RESOURCES:
+        payload["deleted"][name] = []
+
+    changed_after = from_version(since) - timedelta(seconds=getattr(settings, "CATALOG_DELTA_OVERLAP", 300))
+
+    for name, (model, columns) in CATALOG_RESOURCES.items():
+        payload[name] = {
+            "columns": columns,
+            "rows": list(
+                model.objects
+                .filter(business=business, updated_at__gt=changed_after)
+                .order_by("id")
+                .values_list(*columns)
+            ),
+        }
+
+    tombstones = (
+        DeletedRecord.objects
+        .filter(business=business, created_at__gt=changed_after)
+        .values_list("resource", "object_id")
+    )
+    for resource, object_id in tombstones:
+        if resource in payload["deleted"]:
+            payload["deleted"][resource].append(object_id)
+
+    return payload
@@ -0,0 +1,134 @@
+import itertools
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.benchmarking import delete_business, seed_business
+from inventory.models import InventoryItem
+from orders.models import OrderItem
+
+
+# Outcomes where the till got an answer; anything else is an error.
+ANSWERED = ("sold", "refused")
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires concurrent POS checkouts at a single SKU and reports throughput "
+        "and whether the final stock level matches the successful sales."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--checkouts", type=int, default=50, help="Checkouts per thread.")
+        parser.add_argument("--stock", type=int, default=200, help="Starting stock of the hot SKU.")
+        parser.add_argument("--quantity", type=int, default=1, help="Units sold per checkout.")
+        parser.add_argument("--allow-negative", action="store_true")
+        parser.add_argument(
+            "--allow-sqlite", action="store_true",
+            help="Run on SQLite anyway; it locks the whole database per write, so most checkouts error.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor == "sqlite" and not options["allow_sqlite"]:
+            raise CommandError(
+                "SQLite lets one writer in at a time, so concurrent checkouts mostly fail with "
+                "'database is locked' instead of contending for the stock row. Run against "
+                "PostgreSQL, or pass --allow-sqlite."
+            )
+
+        fixture = seed_business(1, quantity=options["stock"])
+        business, user = fixture["business"], fixture["user"]
+        business.allow_negative_stock = options["allow_negative"]
+        business.save()
+        item = fixture["items"][0]
+
+        receipt_numbers = itertools.count(1)
+        receipt_lock = threading.Lock()
+        outcomes: Counter = Counter()
+        outcomes_lock = threading.Lock()
+
+        def next_receipt():
+            with receipt_lock:
+                return f"STRESS-{business.id}-{next(receipt_numbers)}"
+
+        def till():
+            client = APIClient()
+            client.force_authenticate(user=user)
+            url = reverse("pos-place-order")
+            try:
+                for _ in range(options["checkouts"]):
+                    payload = self._build_payload(item, options["quantity"], next_receipt())
+                    try:
+                        response = client.post(url, {"data": payload}, format="json")
+                        outcome = {201: "sold", 400: "refused"}.get(response.status_code, f"http_{response.status_code}")
+                    except OperationalError as e:
+                        outcome = "database_locked" if "locked" in str(e) else "OperationalError"
+                    except Exception as e:
+                        outcome = type(e).__name__
+                    with outcomes_lock:
+                        outcomes[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=till) for _ in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            final_quantity = InventoryItem.objects.get(id=item.id).quantity
+            units_sold = sum(OrderItem.objects.filter(inventory_item=item).values_list("quantity", flat=True))
+        finally:
+            delete_business(business)
+
+        expected = options["stock"] - units_sold
+        total = sum(outcomes.values())
+        errored = sum(count for outcome, count in outcomes.items() if outcome not in ANSWERED)
+
+        self.stdout.write(f"checkouts:      {total} in {elapsed:.2f}s ({total / elapsed:.1f}/s)")
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome:<15} {count}")
+        self.stdout.write(f"units sold:     {units_sold}")
+        self.stdout.write(f"final quantity: {final_quantity} (expected {expected})")
+
+        if final_quantity != expected:
+            self.stderr.write(self.style.ERROR("Lost update detected: stock does not match sales."))
+        elif final_quantity < 0 and not options["allow_negative"]:
+            self.stderr.write(self.style.ERROR("Oversold: stock went negative."))
+        elif errored:
+            self.stderr.write(self.style.WARNING(
+                f"{errored} of {total} checkouts errored; stock matches the sales that went through, "
+                "but the run is inconclusive."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("Stock is consistent with sales."))
+
+    def _build_payload(self, item, quantity, receipt_number):
+        total = float(item.selling_price) * quantity
+        return {
+            "items": [{"id": item.id, "quantity": quantity, "total_price": total}],
+            "subtotal": total,
+            "tax": 0,
+            "total": total,
+            "paymentMethod": "cash",
+            "amountReceived": total,
+            "change": 0,
+            "mobileNumber": "",
+            "mobileNetwork": "",
+            "splitCashAmount": 0,
+            "splitMobileAmount": 0,
+            "cardNumber": "",
+            "loyaltyPointsUsed": 0,
+            "status": "Paid",
+            "date": "2026-01-29",
+            "receiptNo": receipt_number,
+        }
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:33
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def clear_duplicate_barcodes(apps, schema_editor):
+    """
+    Keeps each barcode on the oldest item of its business (the one scans
+    already resolved to) and clears it on the rest, listing them so they can
+    be relabelled before the unique constraint is added.
+    """
+    InventoryItem = apps.get_model("inventory", "InventoryItem")
+    items = InventoryItem.objects.filter(barcode__isnull=False).exclude(barcode="")
+    duplicates = (
+        items.values("business_id", "barcode")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        extra = list(
+            items.filter(business_id=duplicate["business_id"], barcode=duplicate["barcode"])
+            .order_by("id")
+            .values_list("id", flat=True)[1:]
+        )
+        InventoryItem.objects.filter(id__in=extra).update(barcode=None)
+        print(
+            f"\n  Cleared duplicate barcode {duplicate['barcode']!r} of business "
+            f"{duplicate['business_id']} on items {extra}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_deletedrecord'),
+        ('inventory', '0013_category_business'),
+        ('supplychain', '0006_alter_purchaseorder_order_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_duplicate_barcodes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='inventoryitem',
+            constraint=models.UniqueConstraint(condition=models.Q(('barcode__isnull', False), models.Q(('barcode', ''), _negated=True)), fields=('business', 'barcode'), name='unique_business_barcode'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_outboxevent'),
+        ('inventory', '0014_inventoryitem_unique_business_barcode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventorylog',
+            index=models.Index(fields=['business', 'created_at', 'id'], name='inventory_i_busines_589229_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('inventory', '0015_inventorylog_inventory_i_busines_589229_idx'),
+        ('supplychain', '0007_purchaseorderitem_supplychain_busines_ace9a7_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['business', 'created_at'], name='inventory_c_busines_5120be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['business', 'updated_at'], name='inventory_c_busines_115d40_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventoryitem',
+            index=models.Index(fields=['business', 'created_at'], name='inventory_i_busines_b37463_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventoryitem',
+            index=models.Index(fields=['business', 'updated_at'], name='inventory_i_busines_4cc3ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menu',
+            index=models.Index(fields=['business', 'created_at'], name='inventory_m_busines_b603ac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menu',
+            index=models.Index(fields=['business', 'updated_at'], name='inventory_m_busines_7d42f6_idx'),
+        ),
+    ]
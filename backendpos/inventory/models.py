@@ -3,12 +3,22 @@ from decimal import Decimal
 
 from core.models import AbstractBaseModel
 
+# Rows covered by the (business, barcode) unique index. Lookups repeat this
+# condition so the database can use the partial index.
+HAS_BARCODE = models.Q(barcode__isnull=False) & ~models.Q(barcode="")
+
 # Create your models here.
 class Category(AbstractBaseModel):
     business = models.ForeignKey("core.Business", on_delete=models.SET_NULL, null=True, related_name="businesscategories")
     name = models.CharField(max_length=255)
     description = models.CharField(max_length=255, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+            models.Index(fields=["business", "updated_at"]),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -24,6 +34,19 @@ class InventoryItem(AbstractBaseModel):
     restock_level = models.IntegerField(default=0)
     supplier = models.ForeignKey("supplychain.Supplier", on_delete=models.SET_NULL, null=True, related_name="supplieditems")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+            models.Index(fields=["business", "updated_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business", "barcode"],
+                condition=HAS_BARCODE,
+                name="unique_business_barcode",
+            ),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -35,6 +58,12 @@ class InventoryLog(AbstractBaseModel):
     action_type = models.CharField(max_length=255)
     quantity = models.IntegerField(default=0)
     actioned_by = models.ForeignKey("users.User", on_delete=models.SET_NULL, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at", "id"]),
+        ]
+
     
 
 class Menu(AbstractBaseModel):
@@ -42,4 +71,10 @@ class Menu(AbstractBaseModel):
     branch = models.ForeignKey("core.Branch", on_delete=models.SET_NULL, null=True, related_name="branchmenus")
     name = models.CharField(max_length=255)
     quantity = models.IntegerField(default=0)
-    price = models.DecimalField(max_digits=10, decimal_places=2)
\ No newline at end of file
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+            models.Index(fields=["business", "updated_at"]),
+        ]
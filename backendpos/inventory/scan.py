@@ -0,0 +1,56 @@
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from core.cache import LRUCache
+from inventory.models import InventoryItem, HAS_BARCODE
+from inventory.serializers import InventoryItemSerializer
+
+
+# (business_id, barcode) -> serialized item. Saves and stock movements in this
+# process invalidate entries; the TTL bounds staleness from other processes.
+barcode_cache = LRUCache(
+    maxsize=getattr(settings, "BARCODE_CACHE_SIZE", 10_000),
+    ttl=getattr(settings, "BARCODE_CACHE_TTL", 60),
+)
+
+
+def lookup_barcode(business_id: int, barcode: str) -> Optional[Dict[str, Any]]:
+    """
+    Resolves a scanned barcode to the serialized inventory item, going to the
+    (business, barcode) index only on a cache miss.
+    """
+    key = (business_id, barcode)
+    item = barcode_cache.get(key)
+    if item is not None:
+        return item
+
+    instance = (
+        InventoryItem.objects
+        .select_related("category")
+        .filter(HAS_BARCODE, business_id=business_id, barcode=barcode)
+        .first()
+    )
+    if instance is None:
+        return None
+
+    item = dict(InventoryItemSerializer(instance).data)
+    barcode_cache.set(key, item)
+    return item
+
+
+def invalidate_items(item_ids: Iterable[int]) -> None:
+    """
+    Drops the cached scans of the items once the current transaction commits.
+    Evicting earlier would let a concurrent scan cache the old row again.
+    """
+    item_ids = list(item_ids)
+    transaction.on_commit(lambda: _evict(item_ids))
+
+
+def _evict(item_ids: Iterable[int]) -> None:
+    # Matched on the cached item itself: a separate id -> key index ages out
+    # on its own and would let a still-cached scan escape invalidation.
+    item_ids = set(item_ids)
+    barcode_cache.pop_where(lambda key, item: item["id"] in item_ids)
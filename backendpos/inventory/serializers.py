@@ -1,20 +1,24 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 
 from inventory.models import InventoryItem, Category, Menu, InventoryLog
 
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     items_count = serializers.SerializerMethodField()
     class Meta:
         model = Category
         fields = "__all__"
 
     def get_items_count(self, obj):
+        # The list view annotates the count; single objects fall back to a query.
+        if hasattr(obj, "items_count"):
+            return obj.items_count
         return obj.products.count()
 
 
-class InventoryItemSerializer(serializers.ModelSerializer):
+class InventoryItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category_name = serializers.SerializerMethodField()
     class Meta:
         model = InventoryItem
@@ -23,9 +27,19 @@ class InventoryItemSerializer(serializers.ModelSerializer):
 
     def get_category_name(self, obj):
         return obj.category.name
+
+    # Columns the method fields read (see core.mixins.sparse_queryset).
+    sparse_sources = {"category_name": ("category__name",)}
+
+    # Same fields from a `.values()` row (see core.mixins.ValuesListMixin).
+    values_lookups = ("category__name",)
+
+    @staticmethod
+    def values_category_name(row):
+        return row["category__name"]
     
 
-class MenuSerializer(serializers.ModelSerializer):
+class MenuSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Menu
         fields = "__all__"
@@ -38,7 +52,7 @@ class StockRestokSerializer(serializers.Serializer):
 
 
 
-class InventoryLogSerializer(serializers.ModelSerializer):
+class InventoryLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     business = serializers.CharField(source="business.name", read_only=True)
     branch = serializers.CharField(source="branch.name", read_only=True)
     item = serializers.CharField(source="item.name", read_only=True)
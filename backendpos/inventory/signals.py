@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.models import DeletedRecord
+from customers.models import LoyaltyCard
+from inventory.models import Category, InventoryItem, Menu
+from inventory.scan import invalidate_items
+
+
+# Model -> resource name used by the catalog sync feed.
+SYNCED_MODELS = {
+    Category: "categories",
+    InventoryItem: "items",
+    Menu: "menus",
+    LoyaltyCard: "loyalty_cards",
+}
+
+
+def record_deletion(sender, instance, **kwargs):
+    DeletedRecord.objects.create(
+        business_id=instance.business_id,
+        resource=SYNCED_MODELS[sender],
+        object_id=instance.pk,
+    )
+
+
+def invalidate_barcode_cache(sender, instance, **kwargs):
+    invalidate_items([instance.pk])
+
+
+def connect_signals():
+    for model in SYNCED_MODELS:
+        post_delete.connect(record_deletion, sender=model, dispatch_uid=f"record_deletion_{model.__name__}")
+
+    post_save.connect(invalidate_barcode_cache, sender=InventoryItem, dispatch_uid="invalidate_barcode_cache_save")
+    post_delete.connect(invalidate_barcode_cache, sender=InventoryItem, dispatch_uid="invalidate_barcode_cache_delete")
@@ -0,0 +1,83 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from inventory.models import InventoryItem
+from inventory.scan import invalidate_items
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, item_ids: List[int]):
+        self.item_ids = item_ids
+        super().__init__(f"Insufficient stock for inventory items: {', '.join(map(str, item_ids))}")
+
+
+def collect_quantities(items: Iterable[Dict[str, Any]], key: str = "id") -> Dict[int, int]:
+    """
+    Folds basket lines into {inventory_item_id: total_quantity} so a SKU that
+    appears on several lines is only touched once.
+    """
+    quantities: Counter = Counter()
+    for item in items:
+        quantities[int(item[key])] += int(item["quantity"])
+    return dict(quantities)
+
+
+@transaction.atomic
+def decrement_stock(quantities: Dict[int, int], allow_negative: bool = True) -> int:
+    """
+    Decrements stock for every SKU in a single UPDATE using a CASE expression.
+    The database applies `quantity = quantity - n` atomically, so concurrent
+    tills never lose each other's movements.
+
+    With `allow_negative=False` each row is only updated while it still holds
+    enough stock; if any SKU falls short the whole movement is rolled back and
+    `InsufficientStockError` is raised. Returns the number of rows touched.
+    """
+    if not quantities:
+        return 0
+
+    delta = Case(
+        *[When(id=item_id, then=Value(quantity)) for item_id, quantity in quantities.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+    queryset = InventoryItem.objects.filter(id__in=quantities.keys())
+    if not allow_negative:
+        queryset = queryset.filter(reduce(or_, (
+            Q(id=item_id, quantity__gte=quantity) for item_id, quantity in quantities.items()
+        )))
+
+    updated = queryset.update(
+        quantity=F("quantity") - delta,
+        updated_at=timezone.now(),
+    )
+
+    if not allow_negative and updated != len(quantities):
+        raise InsufficientStockError(_short_items(quantities))
+
+    invalidate_items(quantities.keys())
+    return updated
+
+
+def increment_stock(item_id: int, quantity: int) -> int:
+    updated = InventoryItem.objects.filter(id=item_id).update(
+        quantity=F("quantity") + quantity,
+        updated_at=timezone.now(),
+    )
+    invalidate_items([item_id])
+    return updated
+
+
+def _short_items(quantities: Dict[int, int]) -> List[int]:
+    available = dict(InventoryItem.objects.filter(id__in=quantities.keys()).values_list("id", "quantity"))
+    return sorted(
+        item_id for item_id, quantity in quantities.items()
+        if available.get(item_id, 0) < quantity
+    )
@@ -1,3 +1,267 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import override_settings
+from django.urls import reverse
+
+from core.models import OutboxEvent
+from core.testing import BusinessAPITestCase, checkout_payload
+from customers.models import LoyaltyCard
+from inventory.catalog import from_version
+from inventory.models import Category, InventoryItem, InventoryLog
+from inventory.scan import barcode_cache, lookup_barcode
+from inventory.stock import InsufficientStockError, collect_quantities, decrement_stock
+from orders.models import Order, OrderItem
+from payments.models import Payment
+
+
+class InventoryListQueryCountTests(BusinessAPITestCase):
+    """
+    List pages must cost a constant number of queries (COUNT + page) however
+    many rows they hold.
+    """
+
+    user_fields = {"username": "manager", "first_name": "Jane", "last_name": "Doe"}
+
+    def create_items(self, count):
+        for index in range(count):
+            category = Category.objects.create(business=self.business, name=f"Category {index}")
+            item = InventoryItem.objects.create(
+                business=self.business, branch=self.branch, category=category,
+                name=f"Item {index}", quantity=10, selling_price=Decimal("50"),
+            )
+            InventoryItem.objects.create(
+                business=self.business, branch=self.branch, category=category,
+                name=f"Item {index}b", quantity=10, selling_price=Decimal("50"),
+            )
+            InventoryLog.objects.create(
+                business=self.business, branch=self.branch, item=item,
+                action_type="Restock", quantity=5, actioned_by=self.user,
+            )
+
+    def assert_constant_list_queries(self, url_name, queries=2):
+        response = self.assert_constant_queries(reverse(url_name), self.create_items, queries)
+        self.assertEqual(len(response.data["results"]), 10)
+        return response
+
+    def test_inventory_log_list_pages_with_cursors(self):
+        self.create_items(5)
+        self.assert_cursor_pages(reverse("inventory-logs"), 5)
+
+    def test_category_list_query_count_is_constant(self):
+        # COUNT + page, plus the two ETag version aggregates.
+        response = self.assert_constant_list_queries("categories", queries=4)
+        self.assertEqual(response.data["results"][0]["items_count"], 2)
+
+    def test_inventory_item_list_query_count_is_constant(self):
+        response = self.assert_constant_list_queries("items")
+        for row in response.data["results"]:
+            self.assertEqual(row["category_name"], f"Category {row['name'].rstrip('b').split()[-1]}")
+
+    def test_inventory_log_list_query_count_is_constant(self):
+        response = self.assert_constant_list_queries("inventory-logs")
+        self.assertEqual(response.data["results"][0]["actioned_by"], "Jane Doe")
+
+
+class CategoryConditionalGetTests(BusinessAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = Category.objects.create(business=cls.business, name="Drinks")
+
+    def test_unchanged_list_returns_not_modified(self):
+        etag = self.client.get(reverse("categories"))["ETag"]
+
+        response = self.client.get(reverse("categories"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_inventory_change_invalidates_list(self):
+        etag = self.client.get(reverse("categories"))["ETag"]
+        InventoryItem.objects.create(business=self.business, category=self.category, name="Soda", quantity=1)
+
+        response = self.client.get(reverse("categories"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["items_count"], 1)
+
+
+class BarcodeCacheTests(BusinessAPITestCase):
+    def setUp(self):
+        super().setUp()
+        barcode_cache.clear()
+
+    def test_stock_movement_evicts_scan_after_commit(self):
+        category = Category.objects.create(business=self.business, name="Drinks")
+        item = InventoryItem.objects.create(
+            business=self.business, category=category, name="Soda", barcode="6001",
+            quantity=5, selling_price=Decimal("50"),
+        )
+        self.assertEqual(lookup_barcode(self.business.id, "6001")["quantity"], 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            decrement_stock({item.id: 2})
+            # Other tills keep the committed row until the movement commits.
+            self.assertEqual(lookup_barcode(self.business.id, "6001")["quantity"], 5)
+
+        self.assertEqual(lookup_barcode(self.business.id, "6001")["quantity"], 3)
+
+    def test_busy_scan_is_evicted_after_other_items_churn_the_cache(self):
+        category = Category.objects.create(business=self.business, name="Drinks")
+        soda = InventoryItem.objects.create(
+            business=self.business, category=category, name="Soda", barcode="6001",
+            quantity=5, selling_price=Decimal("50"),
+        )
+        for index in range(3):
+            InventoryItem.objects.create(
+                business=self.business, category=category, name=f"Item {index}", barcode=f"700{index}",
+                quantity=1, selling_price=Decimal("10"),
+            )
+
+        with mock.patch.object(barcode_cache, "maxsize", 2):
+            lookup_barcode(self.business.id, "6001")
+            for index in range(3):
+                # The soda keeps selling while other items cycle through the cache.
+                lookup_barcode(self.business.id, f"700{index}")
+                lookup_barcode(self.business.id, "6001")
+
+            with self.captureOnCommitCallbacks(execute=True):
+                decrement_stock({soda.id: 2})
+
+            self.assertEqual(lookup_barcode(self.business.id, "6001")["quantity"], 3)
+
+
+class CatalogSyncTests(BusinessAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.soda = InventoryItem.objects.create(
+            business=cls.business, category=cls.category, name="Soda", quantity=5, selling_price=Decimal("50")
+        )
+        LoyaltyCard.objects.create(business=cls.business, card_number="C-1", customer_name="Jane", phone_number="0700000001")
+
+    def create_item(self, name):
+        return InventoryItem.objects.create(
+            business=self.business, category=self.category, name=name, quantity=5, selling_price=Decimal("50")
+        )
+
+    def sync(self, since=None):
+        response = self.client.get(reverse("catalog"), {} if since is None else {"since": since})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def item_names(self, payload):
+        name = payload["items"]["columns"].index("name")
+        return {row[name] for row in payload["items"]["rows"]}
+
+    def test_snapshot_leaves_out_customer_contacts(self):
+        cards = self.sync()["loyalty_cards"]
+        self.assertNotIn("phone_number", cards["columns"])
+        self.assertEqual(len(cards["rows"]), 1)
+
+    @override_settings(CATALOG_DELTA_OVERLAP=0)
+    def test_delta_returns_changes_and_tombstones(self):
+        version = self.sync()["version"]
+        self.create_item("Juice")
+        soda_id = self.soda.id
+        self.soda.delete()
+
+        delta = self.sync(since=version)
+        self.assertEqual(self.item_names(delta), {"Juice"})
+        self.assertEqual(delta["deleted"]["items"], [soda_id])
+        self.assertGreater(delta["version"], version)
+
+        delta = self.sync(since=delta["version"])
+        self.assertEqual(self.item_names(delta), set())
+        self.assertEqual(delta["deleted"]["items"], [])
+
+    def test_delta_covers_writes_committed_after_the_version(self):
+        version = self.sync()["version"]
+        # Stamped just before `version` was handed out, committed afterwards.
+        late = self.create_item("Water")
+        InventoryItem.objects.filter(id=late.id).update(updated_at=from_version(version) - timedelta(seconds=1))
+
+        self.assertIn("Water", self.item_names(self.sync(since=version)))
+
+
+class StockMovementTests(BusinessAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.soda = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Soda", quantity=5, selling_price=Decimal("50")
+        )
+        cls.juice = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Juice", quantity=5, selling_price=Decimal("100")
+        )
+
+    def assert_stock(self, soda, juice):
+        self.assertEqual(
+            dict(InventoryItem.objects.filter(business=self.business).values_list("name", "quantity")),
+            {"Soda": soda, "Juice": juice},
+        )
+
+    def restock(self, action_type, quantity):
+        return self.client.post(
+            reverse("update-stock-item"),
+            {"inventory_item_id": self.soda.id, "action_type": action_type, "quantity": quantity},
+            format="json",
+        )
+
+    def test_lines_of_one_sku_are_moved_once(self):
+        quantities = collect_quantities([
+            {"id": self.soda.id, "quantity": 2}, {"id": self.juice.id, "quantity": "1"}, {"id": self.soda.id, "quantity": 4},
+        ])
+        self.assertEqual(quantities, {self.soda.id: 6, self.juice.id: 1})
+        self.assertEqual(decrement_stock(quantities), 2)
+        # Negative stock is allowed by default.
+        self.assert_stock(soda=-1, juice=4)
+
+    def test_oversell_is_rejected_without_negative_stock(self):
+        with self.assertRaises(InsufficientStockError) as raised:
+            decrement_stock({self.soda.id: 2, self.juice.id: 6}, allow_negative=False)
+        self.assertEqual(raised.exception.item_ids, [self.juice.id])
+        # The SKU that had enough is rolled back with the rest.
+        self.assert_stock(soda=5, juice=5)
+
+        self.assertEqual(decrement_stock({self.soda.id: 5}, allow_negative=False), 1)
+        self.assert_stock(soda=0, juice=5)
+
+    def test_checkout_is_rolled_back_when_stock_runs_out(self):
+        self.user.business.allow_negative_stock = False
+        self.user.business.save()
+
+        card = LoyaltyCard.objects.create(
+            business=self.business, card_number="C-1", customer_name="Jane", phone_number="0700000001", points=5
+        )
+
+        payload = checkout_payload("R-1", [(self.soda, 2), (self.juice, 6)], cardNumber="C-1", loyaltyPointsUsed=5)
+        response = self.client.post(reverse("pos-place-order"), {"data": payload}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["items"], [self.juice.id])
+
+        self.assert_stock(soda=5, juice=5)
+        card.refresh_from_db()
+        self.assertEqual(card.points, 5)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+        self.assertFalse(Payment.objects.exists())
+        self.assertFalse(OutboxEvent.objects.filter(topic="loyalty.checkout").exists())
+
+    def test_restock_endpoint(self):
+        self.assertEqual(self.restock("Add Stock", 3).status_code, 201)
+        self.assert_stock(soda=8, juice=5)
+
+        response = self.restock("Remove Stock", 9)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"failed": "You cannot remove more that what is available"})
+        self.assert_stock(soda=8, juice=5)
+
+        self.assertEqual(self.restock("Remove Stock", 8).status_code, 201)
+        self.assert_stock(soda=0, juice=5)
+        self.assertEqual(
+            list(InventoryLog.objects.filter(item=self.soda).order_by("id").values_list("action_type", flat=True)),
+            ["Add Stock", "Remove Stock"],
+        )
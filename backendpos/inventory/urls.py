@@ -4,7 +4,9 @@ from inventory.views import (
     CategoryAPIView, CategoryDetailAPIView,
     MenuAPIView, MenuDetailAPIView,
     StockRestockAPIView,
-    InventoryLogAPIView
+    InventoryLogAPIView,
+    CatalogSnapshotAPIView,
+    BarcodeScanAPIView
 )   
 
 urlpatterns = [
@@ -17,4 +19,6 @@ urlpatterns = [
     path("menus/<int:pk>/details/", MenuDetailAPIView.as_view(), name="menu-details"),
     path("update-stock-item/", StockRestockAPIView.as_view(), name="update-stock-item"),
     path("logs/", InventoryLogAPIView.as_view(), name="inventory-logs"),
+    path("catalog/", CatalogSnapshotAPIView.as_view(), name="catalog"),
+    path("scan/<str:barcode>/", BarcodeScanAPIView.as_view(), name="barcode-scan"),
 ]
\ No newline at end of file
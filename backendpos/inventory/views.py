@@ -1,11 +1,15 @@
 from django.shortcuts import render
 from rest_framework import status, generics
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
 from rest_framework.response import Response
 from django.db import transaction
+from django.db.models import Count
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
 
-from core.mixins import BusinessScopedQuerysetMixin
+from core.mixins import BusinessScopedQuerysetMixin, ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin
 
 from inventory.serializers import (
     InventoryItemSerializer, CategorySerializer,
@@ -14,26 +18,37 @@ from inventory.serializers import (
     InventoryLogSerializer
 )
 from inventory.models import InventoryItem, Category, Menu, InventoryLog
+from inventory.scan import lookup_barcode
+from inventory.stock import increment_stock, decrement_stock, InsufficientStockError
+from inventory.catalog import catalog_state, catalog_etag, build_catalog, build_catalog_delta
 # Create your views here.
-class CategoryAPIView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
-    queryset = Category.objects.all().order_by("-created_at")
+class CategoryAPIView(BusinessScopedQuerysetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
+    queryset = Category.objects.annotate(items_count=Count("products")).order_by("-created_at")
     serializer_class = CategorySerializer
 
+    def get_etag_querysets(self):
+        # Without the items_count join; the count moves with the business's inventory.
+        business = self.get_business()
+        return [Category.objects.filter(business=business), InventoryItem.objects.filter(business=business)]
+
 
-class CategoryDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailAPIView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all().order_by("-created_at")
     serializer_class = CategorySerializer
 
     lookup_field = "pk"
 
+    def get_etag_querysets(self):
+        return super().get_etag_querysets() + [InventoryItem.objects.filter(category_id=self.kwargs["pk"])]
+
 
-class InventoryItemAPIView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
-    queryset = InventoryItem.objects.all().order_by("-created_at")
+class InventoryItemAPIView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListCreateAPIView):
+    queryset = InventoryItem.objects.select_related("category").order_by("-created_at")
     serializer_class = InventoryItemSerializer
 
 
-class InventoryItemDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = InventoryItem.objects.all().order_by("-created_at")
+class InventoryItemDetailAPIView(SparseQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = InventoryItem.objects.select_related("category").order_by("-created_at")
     serializer_class = InventoryItemSerializer
 
     lookup_field = "pk"
@@ -73,14 +88,12 @@ class StockRestockAPIView(generics.CreateAPIView):
             item = InventoryItem.objects.get(id=inventory_item_id)
 
             if action_type.lower() == "add stock":
-                item.quantity += int(quantity)
-                item.save()
+                increment_stock(item.id, int(quantity))
             elif action_type.lower() == "remove stock":
-                if item.quantity < int(quantity):
+                try:
+                    decrement_stock({item.id: int(quantity)}, allow_negative=False)
+                except InsufficientStockError:
                     return Response({ "failed": "You cannot remove more that what is available" }, status=status.HTTP_400_BAD_REQUEST)
-                else:
-                    item.quantity -= int(quantity)
-                    item.save()
 
             InventoryLog.objects.create(
                 item=item,
@@ -94,6 +107,71 @@ class StockRestockAPIView(generics.CreateAPIView):
 
 
 class InventoryLogAPIView(BusinessScopedQuerysetMixin, generics.ListAPIView):
-    queryset = InventoryLog.objects.all().order_by("-created_at")
+    queryset = (
+        InventoryLog.objects
+        .select_related("business", "branch", "item", "actioned_by")
+        .order_by("-created_at")
+    )
     serializer_class = InventoryLogSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+
+
+@method_decorator(gzip_page, name="dispatch")
+class CatalogSnapshotAPIView(APIView):
+    """
+    Returns the whole business catalog (categories, inventory items, menus and
+    loyalty cards) in one payload. Terminals send the ETag back in
+    `If-None-Match` and get a 304 while nothing has changed, or pass
+    `?since=<version>` to receive only the rows changed or deleted since then.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        business = getattr(request.user, "business", None)
+        if not business:
+            return Response(
+                {"detail": "User has no associated business"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        since = request.query_params.get("since")
+        if since is not None and not since.isdigit():
+            return Response(
+                {"detail": "since must be a catalog version"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        state = catalog_state(business)
+
+        if since is not None:
+            return Response(build_catalog_delta(business, int(since), state["version"]), status=status.HTTP_200_OK)
+
+        etag = catalog_etag(state)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(build_catalog(business, state["version"]), status=status.HTTP_200_OK, headers=headers)
+
+
+
+class BarcodeScanAPIView(APIView):
+    """
+    Resolves a scanned barcode to an inventory item of the user's business.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, barcode, *args, **kwargs):
+        business = getattr(request.user, "business", None)
+        if not business:
+            return Response(
+                {"detail": "User has no associated business"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        item = lookup_barcode(business.id, barcode)
+        if item is None:
+            return Response({"detail": "Item not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(item, status=status.HTTP_200_OK)
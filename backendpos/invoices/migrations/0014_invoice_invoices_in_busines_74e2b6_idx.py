@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_salesrollup'),
+        ('invoices', '0013_supplierinvoiceitem_branch_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['business', 'created_at'], name='invoices_in_busines_74e2b6_idx'),
+        ),
+    ]
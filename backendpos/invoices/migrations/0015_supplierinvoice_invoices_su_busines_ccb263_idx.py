@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('invoices', '0014_invoice_invoices_in_busines_74e2b6_idx'),
+        ('supplychain', '0008_productsupplier_supplychain_busines_269696_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supplierinvoice',
+            index=models.Index(fields=['business', 'created_at'], name='invoices_su_busines_ccb263_idx'),
+        ),
+    ]
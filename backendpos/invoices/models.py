@@ -28,6 +28,11 @@ class Invoice(AbstractBaseModel):
     sub_total = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'))
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
     amount_paid = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
     
     def __str__(self):
         return f"{self.customer_name} #{self.invoice_number}"
@@ -63,6 +68,11 @@ class SupplierInvoice(AbstractBaseModel):
     amount_paid = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'))
     status = models.CharField(max_length=50, default="Unpaid")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return f"Invoice #{self.id} - {self.supplier.name}"
     
@@ -1,10 +1,11 @@
 from decimal import Decimal
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from invoices.models import Invoice, InvoiceItem, SupplierInvoice, SupplierInvoiceItem
 from payments.models import SupplierPayment
 from payments.serializers import CustomerInvoicePaymentSerializer
 
-class InvoiceItemSerializer(serializers.ModelSerializer):
+class InvoiceItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     item_name = serializers.SerializerMethodField()
     unit_price = serializers.SerializerMethodField()
     class Meta:
@@ -20,7 +21,7 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
 
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     balance = serializers.SerializerMethodField()
     items_count = serializers.SerializerMethodField()
     class Meta:
@@ -33,11 +34,14 @@ class InvoiceSerializer(serializers.ModelSerializer):
         return obj.total_amount - obj.amount_paid
     
     def get_items_count(self, obj):
+        # The list view annotates the count; single objects fall back to a query.
+        if hasattr(obj, "items_count"):
+            return obj.items_count
         return obj.invoiceitems.count()
 
 
 
-class InvoiceDetailSerializer(serializers.ModelSerializer):
+class InvoiceDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     invoiceitems = InvoiceItemSerializer(many=True)
     balance = serializers.SerializerMethodField()
     invoice_payments = CustomerInvoicePaymentSerializer(many=True)
@@ -80,14 +84,14 @@ class InvoicePaymentSerializer(serializers.Serializer):
     data = serializers.DictField()
     
 
-class SupplierInvoiceItemSerializer(serializers.ModelSerializer):
+class SupplierInvoiceItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
     class Meta:
         model = SupplierInvoiceItem
         fields = "__all__"
 
 
-class SupplierInvoiceSerializer(serializers.ModelSerializer):
+class SupplierInvoiceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     branch_name = serializers.CharField(source='branch.name', read_only=True)
     business_name = serializers.CharField(source='business.name', read_only=True)
@@ -98,7 +102,7 @@ class SupplierInvoiceSerializer(serializers.ModelSerializer):
 
 
 
-class SupplierInvoiceDetailSerializer(serializers.ModelSerializer):
+class SupplierInvoiceDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     invoiceitems = SupplierInvoiceItemSerializer(many=True)
     branch_name = serializers.CharField(source='branch.name', read_only=True)
     business_name = serializers.CharField(source='business.name', read_only=True)
@@ -1,3 +1,40 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.urls import reverse
+
+from core.testing import BusinessAPITestCase
+from inventory.models import Category, InventoryItem
+from invoices.models import Invoice, InvoiceItem
+
+
+class InvoiceListQueryCountTests(BusinessAPITestCase):
+    """
+    The invoice list must cost a constant number of queries (COUNT + page)
+    however many invoices and invoice items it holds.
+    """
+
+    user_fields = {"username": "accountant"}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.item = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Soda", quantity=100, selling_price=Decimal("50")
+        )
+
+    def create_invoices(self, count):
+        for index in range(count):
+            invoice = Invoice.objects.create(
+                business=self.business, branch=self.branch, customer_name="Customer", phone_number="0711111111",
+                due_date=date(2026, 1, 31), invoice_number=f"INV-{index}", total_amount=Decimal("150"),
+                amount_paid=Decimal("0"),
+            )
+            for _ in range(3):
+                InvoiceItem.objects.create(invoice=invoice, item=self.item, quantity=1, item_total=Decimal("50"))
+
+    def test_invoice_list_query_count_is_constant(self):
+        response = self.assert_constant_queries(reverse("invoices"), self.create_invoices)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(response.data["results"][0]["items_count"], 3)
@@ -1,5 +1,6 @@
 from decimal import Decimal
 from django.db import transaction
+from django.db.models import Count
 
 from core.mixins import BusinessScopedQuerysetMixin
 
@@ -22,7 +23,7 @@ from payments.models import Payment, SupplierPayment, BusinessLedger, CustomerIn
 # Create your views here.
 class InvoiceAPIView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
-    queryset = Invoice.objects.all().order_by("-created_at")
+    queryset = Invoice.objects.annotate(items_count=Count("invoiceitems")).order_by("-created_at")
     serializer_class = InvoiceSerializer
 
     @transaction.atomic
@@ -0,0 +1,303 @@
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from orders.idempotency import ReceiptConflict
+from orders.models import Order, OrderItem
+from payments.models import Payment
+from inventory.stock import collect_quantities, decrement_stock
+from customers.models import LoyaltyCard
+from core.outbox import enqueue
+from core.rollups import mark_records_dirty
+from orders.side_effects import card_ordering_key
+from bnpl.bnpl_order_processing import BNPLPurchaseProcessor
+from users.models import User
+
+
+class POSCheckoutProcessor:
+    """
+    Places a POS order with a fixed number of statements regardless of
+    basket size: one order INSERT, one payment INSERT, one bulk INSERT for
+    the line items and one set-based UPDATE for stock.
+
+    Loyalty and store credit are only reserved here (one conditional UPDATE
+    on the card each); the rest is written to the outbox and run by the
+    `run_outbox` worker after commit.
+
+    Raises `InsufficientStockError` when the business does not allow negative
+    stock and the basket would oversell a SKU.
+    """
+
+    def __init__(self, order_data: Dict[str, Any], user: User):
+        self.order_data = order_data
+        self.user = user
+
+    def run(self) -> Order:
+        return self._process_order()
+
+    # ------------------------
+    # Core Transaction
+    # ------------------------
+    @transaction.atomic
+    def _process_order(self) -> Order:
+        self._apply_loyalty()
+
+        order = self._create_order()
+        self._create_payment(order)
+        self._create_order_items(order)
+        self._apply_store_credit()
+
+        # Hot SKU rows are locked by the stock UPDATE, so it runs last to keep
+        # the lock held for as short a time as possible.
+        self._update_inventory()
+
+        return order
+
+    # ------------------------
+    # Helpers
+    # ------------------------
+    def _apply_loyalty(self) -> None:
+        card_number = self.order_data.get("cardNumber")
+        if not card_number:
+            return
+
+        points_to_redeem = self.order_data.get("loyaltyPointsUsed") or 0
+        points_earned = int(Decimal(str(self.order_data.get("total") or 0)) // 100)
+        cards = LoyaltyCard.objects.filter(card_number=card_number, business=self.user.business)
+
+        # Redeemed points are taken off the card here, with a conditional
+        # UPDATE in the sale's transaction, so checkouts racing on one card
+        # cannot spend the same points while the worker lags. The worker
+        # only credits the earned points and writes the history.
+        if not points_to_redeem:
+            if not cards.exists():
+                raise ValueError("Loyalty card not found.")
+        elif not cards.filter(points__gte=points_to_redeem - points_earned).update(
+            points=F("points") - points_to_redeem,
+            updated_at=timezone.now(),
+        ):
+            raise ValueError("Insufficient points to redeem." if cards.exists() else "Loyalty card not found.")
+
+        enqueue(
+            "loyalty.checkout",
+            {
+                "card_number": card_number,
+                "amount": str(self.order_data.get("total") or 0),
+                "points_to_redeem": points_to_redeem,
+                "user_id": self.user.id,
+            },
+            business=self.user.business,
+            ordering_key=card_ordering_key(self.user.business_id, card_number),
+        )
+
+    def _get_status(self) -> str:
+        amount_received = Decimal(str(self.order_data.get("amountReceived") or 0))
+        total = Decimal(str(self.order_data.get("total") or 0))
+        return "Paid" if amount_received >= total else self.order_data.get("status")
+
+    def _create_order(self) -> Order:
+        order = self._build_order()
+        order.save()
+        return order
+
+    def _build_order(self) -> Order:
+        return Order(
+            business=self.user.business,
+            branch=self.user.branch,
+            order_number=self.order_data.get("receiptNo"),
+            tax=self.order_data.get("tax"),
+            sub_total=self.order_data.get("subtotal"),
+            total_amount=self.order_data.get("total"),
+            amount_received=self.order_data.get("amountReceived"),
+            amount_paid=self.order_data.get("total"),
+            status=self._get_status(),
+            sold_by=self.user,
+        )
+
+    def _create_payment(self, order: Order) -> None:
+        self._build_payment(order).save()
+
+    def _build_payment(self, order: Order) -> Payment:
+        return Payment(
+            business=order.business,
+            branch=order.branch,
+            order=order,
+            subtotal=self.order_data.get("subtotal"),
+            tax=self.order_data.get("tax"),
+            total=self.order_data.get("total"),
+            payment_method=self.order_data.get("paymentMethod"),
+            amount_received=self.order_data.get("amountReceived"),
+            change=self.order_data.get("change"),
+            mobile_number=self.order_data.get("mobileNumber"),
+            mobile_network=self.order_data.get("mobileNetwork"),
+            split_cash_amount=self.order_data.get("splitCashAmount"),
+            split_mobile_amount=self.order_data.get("splitMobileAmount"),
+            status=order.status,
+            payment_date=self.order_data.get("date", timezone.now()),
+            receipt_number=self.order_data.get("receiptNo"),
+        )
+
+    def _create_order_items(self, order: Order) -> None:
+        OrderItem.objects.bulk_create(self._build_order_items(order))
+
+    def _build_order_items(self, order: Order) -> List[OrderItem]:
+        return [
+            OrderItem(
+                order=order,
+                business=self.user.business,
+                branch=self.user.branch,
+                inventory_item_id=item["id"],
+                quantity=item["quantity"],
+                item_total=item["total_price"],
+            )
+            for item in self.order_data.get("items")
+        ]
+
+    def _update_inventory(self) -> None:
+        decrement_stock(
+            collect_quantities(self.order_data.get("items")),
+            allow_negative=self.user.business.allow_negative_stock,
+        )
+
+    def _apply_store_credit(self) -> None:
+        if self.order_data.get("paymentMethod") != "store_credit":
+            return
+
+        card_number = self.order_data.get("cardNumber")
+        amount = Decimal(str(self.order_data.get("storeCreditUsed") or 0))
+
+        # Reserved like loyalty redemptions: the credit leaves the card in the
+        # sale's transaction and the worker only records the loan.
+        cards = LoyaltyCard.objects.filter(card_number=card_number, business=self.user.business)
+        if not cards.filter(available_credit__gte=amount).update(
+            available_credit=F("available_credit") - amount,
+            credit_issued=F("credit_issued") + amount,
+            updated_at=timezone.now(),
+        ):
+            raise ValueError("Insufficient store credit." if cards.exists() else "Loyalty card not found.")
+
+        enqueue(
+            "store_credit.issue",
+            {
+                "card_number": card_number,
+                "amount": str(amount),
+                "user_id": self.user.id,
+            },
+            business=self.user.business,
+            ordering_key=card_ordering_key(self.user.business_id, card_number),
+        )
+
+
+class POSBatchCheckoutProcessor:
+    """
+    Ingests orders queued by an offline till. Orders are processed in chunks,
+    each in its own transaction: plain sales in a chunk are bulk-inserted
+    together and their stock moved in one UPDATE, while orders with loyalty,
+    store credit or BNPL side effects go through their regular processor.
+
+    Returns per-order results keyed by `receiptNo`.
+    """
+
+    def __init__(self, orders: List[Dict[str, Any]], user: User, chunk_size: int = 50):
+        self.orders = orders
+        self.user = user
+        self.chunk_size = chunk_size
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        pending = self._filter_pending()
+
+        for start in range(0, len(pending), self.chunk_size):
+            self._process_chunk(pending[start:start + self.chunk_size])
+
+        return self.results
+
+    # ------------------------
+    # Helpers
+    # ------------------------
+    def _filter_pending(self) -> List[Dict[str, Any]]:
+        receipts = [order_data.get("receiptNo") for order_data in self.orders]
+        # receipt -> owning business. Receipt numbers are unique across
+        # businesses, so another business's receipt is a conflict, like in
+        # `find_checkout`, and never a duplicate the till may drop.
+        existing = dict(
+            Order.objects.filter(order_number__in=[r for r in receipts if r]).values_list("order_number", "business_id")
+        )
+
+        pending = []
+        for index, order_data in enumerate(self.orders):
+            receipt_no = order_data.get("receiptNo")
+            if not receipt_no:
+                self.results[f"#{index}"] = {"status": "failed", "error": "receiptNo is required"}
+            elif receipt_no in self.results:
+                # Repeated within the batch: the first copy's result stands.
+                continue
+            elif receipt_no in existing and existing[receipt_no] != self.user.business_id:
+                self.results[receipt_no] = {"status": "failed", "error": str(ReceiptConflict(receipt_no))}
+            elif receipt_no in existing:
+                self.results[receipt_no] = {"status": "duplicate"}
+            else:
+                self.results[receipt_no] = {"status": "pending"}
+                pending.append(order_data)
+
+        return pending
+
+    def _is_plain_sale(self, order_data: Dict[str, Any]) -> bool:
+        return (
+            order_data.get("paymentMethod") not in ("bnpl", "store_credit")
+            and not order_data.get("cardNumber")
+        )
+
+    def _process_chunk(self, chunk: List[Dict[str, Any]]) -> None:
+        plain = [order_data for order_data in chunk if self._is_plain_sale(order_data)]
+        others = [order_data for order_data in chunk if not self._is_plain_sale(order_data)]
+
+        try:
+            self._bulk_place(plain)
+        except Exception:
+            # Something in the chunk is bad (oversell, unknown item...), so
+            # fall back to placing its orders one by one to isolate it.
+            others = plain + others
+
+        for order_data in others:
+            self._place_one(order_data)
+
+    @transaction.atomic
+    def _bulk_place(self, chunk: List[Dict[str, Any]]) -> None:
+        if not chunk:
+            return
+
+        processors = [POSCheckoutProcessor(order_data, self.user) for order_data in chunk]
+
+        orders = Order.objects.bulk_create([processor._build_order() for processor in processors])
+        payments = Payment.objects.bulk_create([
+            processor._build_payment(order) for processor, order in zip(processors, orders)
+        ])
+        OrderItem.objects.bulk_create([
+            item for processor, order in zip(processors, orders) for item in processor._build_order_items(order)
+        ])
+        decrement_stock(
+            collect_quantities(item for order_data in chunk for item in order_data.get("items")),
+            allow_negative=self.user.business.allow_negative_stock,
+        )
+
+        # bulk_create skips post_save, so the rollups are refreshed here.
+        mark_records_dirty(orders + payments)
+
+        for order in orders:
+            self.results[order.order_number] = {"status": "created", "order_id": order.id}
+
+    def _place_one(self, order_data: Dict[str, Any]) -> None:
+        try:
+            with transaction.atomic():
+                if order_data.get("paymentMethod") == "bnpl":
+                    order = BNPLPurchaseProcessor(order_data=order_data, user=self.user).run().order
+                else:
+                    order = POSCheckoutProcessor(order_data=order_data, user=self.user).run()
+        except Exception as e:
+            self.results[order_data["receiptNo"]] = {"status": "failed", "error": str(e)}
+        else:
+            self.results[order.order_number] = {"status": "created", "order_id": order.id}
@@ -0,0 +1,58 @@
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import Business
+from orders.models import Order
+
+
+class ReceiptConflict(Exception):
+    """
+    The receipt number is already used by another business.
+    """
+
+    def __init__(self, receipt_no: str):
+        self.receipt_no = receipt_no
+        super().__init__(f"Receipt number {receipt_no} is already in use")
+
+
+def _cache_key(business: Business, receipt_no: str) -> str:
+    return f"pos-checkout:{business.id}:{receipt_no}"
+
+
+def remember_checkout(business: Business, receipt_no: str, body: Dict[str, Any]) -> None:
+    cache.set(
+        _cache_key(business, receipt_no),
+        body,
+        getattr(settings, "CHECKOUT_IDEMPOTENCY_TTL", 60 * 60 * 24),
+    )
+
+
+def find_checkout(business: Business, receipt_no: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Returns the original response body when this receipt was already placed
+    for the business: from the result cache first, then from the order table.
+    Raises `ReceiptConflict` when another business owns the receipt number.
+    """
+    if not receipt_no:
+        return None
+
+    body = cache.get(_cache_key(business, receipt_no))
+    if body is not None:
+        return body
+
+    order = Order.objects.filter(order_number=receipt_no).values("id", "business_id").first()
+    if order is None:
+        return None
+
+    if order["business_id"] != business.id:
+        raise ReceiptConflict(receipt_no)
+
+    body = checkout_response(order["id"], receipt_no)
+    remember_checkout(business, receipt_no, body)
+    return body
+
+
+def checkout_response(order_id: int, receipt_no: str) -> Dict[str, Any]:
+    return {"success": "Order successfully placed", "order_id": order_id, "order_number": receipt_no}
@@ -0,0 +1,68 @@
+import copy
+import itertools
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.benchmarking import measure, rolled_back, seed_business
+from orders.order import hello
+
+
+class Command(BaseCommand):
+    help = "Benchmarks POS checkout latency and query count across basket sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 20, 40, 80])
+        parser.add_argument("--runs", type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes = options["sizes"]
+        runs = options["runs"]
+        receipt_numbers = itertools.count(1)
+
+        with rolled_back():
+            fixture = seed_business(max(sizes))
+            client = APIClient()
+            client.force_authenticate(user=fixture["user"])
+            url = reverse("pos-place-order")
+
+            self.stdout.write(f"{'basket':>8} {'median ms':>10} {'p95 ms':>10} {'queries':>8}")
+
+            for size in sizes:
+                def place_order():
+                    payload = self._build_payload(fixture["items"][:size], next(receipt_numbers))
+                    response = client.post(url, {"data": payload}, format="json")
+                    assert response.status_code == 201, response.content
+
+                result = measure(place_order, runs)
+                self.stdout.write(
+                    f"{size:>8} {result['median_ms']:>10.2f} {result['p95_ms']:>10.2f} {result['queries']:>8}"
+                )
+
+    def _build_payload(self, items, receipt_number):
+        """
+        Builds a cash checkout from the sample payload in `orders/order.py`.
+        """
+        payload = copy.deepcopy(hello)
+        payload["items"] = [
+            {
+                "id": item.id,
+                "item_name": item.name,
+                "quantity": 1,
+                "unit_price": float(item.selling_price),
+                "total_price": float(item.selling_price),
+            }
+            for item in items
+        ]
+        subtotal = sum(line["total_price"] for line in payload["items"])
+        payload.update({
+            "subtotal": subtotal,
+            "tax": round(subtotal * 0.08, 2),
+            "total": round(subtotal * 1.08, 2),
+            "amountReceived": round(subtotal * 1.08, 2),
+            "paymentMethod": "cash",
+            "status": "Paid",
+            "receiptNo": f"BENCH-{receipt_number}",
+        })
+        return payload
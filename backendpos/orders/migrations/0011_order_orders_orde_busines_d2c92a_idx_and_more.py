@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_outboxevent'),
+        ('inventory', '0015_inventorylog_inventory_i_busines_589229_idx'),
+        ('orders', '0010_order_order_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business', 'created_at', 'id'], name='orders_orde_busines_d2c92a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['business', 'created_at', 'id'], name='orders_orde_busines_5053cb_idx'),
+        ),
+    ]
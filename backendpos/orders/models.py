@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.db import models
-from decimal import Decimal
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+from decimal import ROUND_HALF_UP, Decimal
 
 from core.models import AbstractBaseModel
 # Create your models here.
@@ -8,6 +12,15 @@ ORDER_TYPES = [
     ("Paid", "Paid"),
 ]
 
+def order_tax_rate() -> Decimal:
+    return Decimal(str(getattr(settings, "ORDER_TAX_RATE", "0.08")))
+
+
+def order_tax(sub_total: Decimal) -> Decimal:
+    # Half up, like SQL ROUND() in `apply_item_delta`.
+    return (Decimal(sub_total) * order_tax_rate()).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
 class Order(AbstractBaseModel):
     business = models.ForeignKey("core.Business", on_delete=models.CASCADE, related_name="businessorders")
     branch = models.ForeignKey("core.Branch", on_delete=models.SET_NULL, null=True, related_name="branchorders")
@@ -23,6 +36,11 @@ class Order(AbstractBaseModel):
     sold_by = models.ForeignKey("users.User", on_delete=models.SET_NULL, null=True, related_name="orders")
     order_type = models.CharField(max_length=50, default="Paid", choices=ORDER_TYPES)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at", "id"]),
+        ]
+
     def __str__(self):
         return self.order_number
     
@@ -38,10 +56,36 @@ class Order(AbstractBaseModel):
             self.save()
 
     def refresh_total_amount(self):
-        self.sub_total = sum(self.items.values_list("item_total", flat=True))
-        self.tax = Decimal(sum(self.items.values_list("item_total", flat=True))) * Decimal(0.08)
-        self.total_amount = sum(self.items.values_list("item_total", flat=True)) + (Decimal(sum(self.items.values_list("item_total", flat=True))) * Decimal(0.08))
-        self.save()
+        """
+        Full recompute from the line items with a single aggregate. Line edits
+        use `apply_item_delta` instead; this is the authoritative fallback.
+        """
+        self.sub_total = self.items.aggregate(total=Sum("item_total"))["total"] or Decimal("0")
+        self.tax = order_tax(self.sub_total)
+        self.total_amount = self.sub_total + self.tax
+        self.save(update_fields=["sub_total", "tax", "total_amount", "updated_at"])
+
+    @classmethod
+    def apply_item_delta(cls, order_id: int, delta: Decimal):
+        """
+        Shifts an order's sub total by the change in one line's total with a
+        single UPDATE, without reading the other lines. Tax and total are
+        recomputed from the new sub total in the same statement, so they
+        match `refresh_total_amount` however many edits came before.
+        """
+        money = DecimalField(max_digits=10, decimal_places=2)
+        sub_total = F("sub_total") + Value(Decimal(str(delta)), output_field=money)
+        tax = Round(sub_total * Value(order_tax_rate(), output_field=money), 2, output_field=money)
+        cls.objects.filter(id=order_id).update(
+            sub_total=sub_total,
+            tax=tax,
+            total_amount=sub_total + tax,
+            updated_at=timezone.now(),
+        )
+
+        from core.rollups import mark_orders_dirty
+        mark_orders_dirty([order_id])
+
 
 class OrderItem(AbstractBaseModel):
     business = models.ForeignKey("core.Business", on_delete=models.CASCADE)
@@ -52,5 +96,11 @@ class OrderItem(AbstractBaseModel):
     quantity = models.IntegerField()
     item_total = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at", "id"]),
+        ]
+
+
     def __str__(self):
         return f"Order: {self.order.order_number}"
\ No newline at end of file
@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 
 from orders.models import Order, OrderItem
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     item_name = serializers.SerializerMethodField()
     unit_price = serializers.SerializerMethodField()
 
@@ -20,7 +21,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     balance = serializers.SerializerMethodField()
     seller = serializers.SerializerMethodField()
     business_name = serializers.SerializerMethodField()
@@ -41,10 +42,45 @@ class OrderSerializer(serializers.ModelSerializer):
         return obj.business.name
     
     def get_items_count(self, obj):
+        # The list view annotates the count; single objects fall back to a query.
+        if hasattr(obj, "items_count"):
+            return obj.items_count
         return obj.items.count()
+
+    # Columns the method fields read (see core.mixins.sparse_queryset).
+    sparse_sources = {
+        "balance": ("total_amount", "amount_received"),
+        "seller": ("sold_by__first_name", "sold_by__last_name", "sold_by__username"),
+        "business_name": ("business__name",),
+        "items_count": ("items_count",),
+    }
+
+    # Same fields from a `.values()` row (see core.mixins.ValuesListMixin).
+    values_lookups = (
+        "total_amount", "amount_received", "sold_by__first_name", "sold_by__last_name", "sold_by__username",
+        "business__name", "items_count",
+    )
+
+    @staticmethod
+    def values_balance(row):
+        return row["total_amount"] - row["amount_received"]
+
+    @staticmethod
+    def values_seller(row):
+        if row["sold_by__first_name"]:
+            return f'{row["sold_by__first_name"]} {row["sold_by__last_name"]}'.strip()
+        return row["sold_by__username"]
+
+    @staticmethod
+    def values_business_name(row):
+        return row["business__name"]
+
+    @staticmethod
+    def values_items_count(row):
+        return row["items_count"]
     
 
-class OrderDetailSerializer(serializers.ModelSerializer):
+class OrderDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     balance = serializers.SerializerMethodField()
     items = OrderItemSerializer(many=True)
     payments = serializers.SerializerMethodField()
@@ -101,6 +137,10 @@ class PlacePOSOrderSerializer(serializers.Serializer):
 
 
 
+class PlacePOSOrderBatchSerializer(serializers.Serializer):
+    orders = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
+
+
 class PayOrderSerializer(serializers.Serializer):
     order = serializers.IntegerField()
     paymentMethod = serializers.CharField(max_length=255, required=False, allow_null=True, allow_blank=True)
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from typing import Any, Dict
+
+from core.outbox import register
+from customers.customer_points_processing import CustomerCheckoutLoyaltyProcessor
+from finances.store_loan_mixin import ProcessStoreLoanMixin
+from users.models import User
+
+
+# Checkout side effects run by the outbox worker after the order commits.
+
+def card_ordering_key(business_id: int, card_number: str) -> str:
+    return f"card:{business_id}:{card_number}"
+
+
+def _get_user(user_id: int) -> User:
+    return User.objects.select_related("business", "branch").get(id=user_id)
+
+
+@register("loyalty.checkout")
+def apply_checkout_loyalty(payload: Dict[str, Any]) -> None:
+    CustomerCheckoutLoyaltyProcessor(
+        card_number=payload["card_number"],
+        amount=Decimal(payload["amount"]),
+        points_to_redeem=payload["points_to_redeem"],
+        user=_get_user(payload["user_id"]),
+    ).run()
+
+
+@register("store_credit.issue")
+def issue_store_credit(payload: Dict[str, Any]) -> None:
+    ProcessStoreLoanMixin(
+        card_number=payload["card_number"],
+        amount=Decimal(payload["amount"]),
+        user=_get_user(payload["user_id"]),
+    ).run()
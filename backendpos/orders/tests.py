@@ -1,3 +1,351 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Business, OutboxEvent
+from core.outbox import process_batch
+from core.testing import BusinessAPITestCase, checkout_payload
+from customers.models import LoyaltyCard
+from finances.models import StoreLoan
+from inventory.models import Category, InventoryItem
+from orders.idempotency import find_checkout
+from orders.models import Order, OrderItem
+from payments.models import Payment
+
+
+class OrderListQueryCountTests(BusinessAPITestCase):
+    """
+    List pages must cost a constant number of queries (COUNT + page) however
+    many rows and line items they hold.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.item = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Soda", quantity=100, selling_price=Decimal("50")
+        )
+
+    def create_orders(self, count):
+        for _ in range(count):
+            order = Order.objects.create(
+                business=self.business,
+                branch=self.branch,
+                order_number=f"R-{Order.objects.count() + 1}",
+                status="Paid",
+                sold_by=self.user,
+            )
+            OrderItem.objects.create(
+                business=self.business, order=order, inventory_item=self.item, quantity=2, item_total=Decimal("100")
+            )
+
+    def test_order_list_query_count_is_constant(self):
+        response = self.assert_constant_queries(reverse("orders"), self.create_orders)
+        self.assertEqual(response.data["results"][0]["items_count"], 1)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(response.data["results"][0]["seller"], "cashier")
+
+    def test_order_item_list_query_count_is_constant(self):
+        response = self.assert_constant_queries(reverse("order-items"), self.create_orders)
+        self.assertEqual(response.data["results"][0]["item_name"], "Soda")
+
+    def test_order_list_sparse_fields(self):
+        self.create_orders(2)
+        response = self.client.get(reverse("orders"), {"fields": "id,order_number,balance"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "order_number", "balance"})
+
+        order = Order.objects.first()
+        response = self.client.get(reverse("order-details", args=[order.id]), {"fields": "id,seller"})
+        self.assertEqual(response.data, {"id": order.id, "seller": "cashier"})
+
+    def test_order_lists_page_with_cursors(self):
+        self.create_orders(5)
+        self.assert_cursor_pages(reverse("orders"), 5)
+        self.assert_cursor_pages(reverse("order-items"), 5)
+
+    def test_cursor_pages_with_sparse_fields(self):
+        self.create_orders(3)
+        for order in Order.objects.all():
+            Payment.objects.create(
+                business=self.business, order=order, status="Paid", payment_date=date.today(), amount_received=order.total_amount
+            )
+
+        for name, fields in (("orders", {"id", "order_number"}), ("payments", {"id", "status"})):
+            response = self.client.get(reverse(name), {"pagination": "cursor", "fields": ",".join(fields), "limit": 2})
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual([set(row) for row in response.data["results"]], [fields, fields])
+
+            response = self.client.get(response.data["next"])
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual(len(response.data["results"]), 1)
+
+
+class CheckoutTests(BusinessAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.soda = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Soda", quantity=10, selling_price=Decimal("50")
+        )
+        cls.juice = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Juice", quantity=10, selling_price=Decimal("100")
+        )
+
+    def checkout_payload(self, receipt_no, lines=None, **fields):
+        return checkout_payload(receipt_no, lines or [(self.soda, 1)], **fields)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def place(self, payload):
+        return self.client.post(reverse("pos-place-order"), {"data": payload}, format="json")
+
+    def test_store_credit_beyond_available_credit_is_refused(self):
+        LoyaltyCard.objects.create(
+            business=self.business, card_number="C-1", customer_name="Jane", phone_number="0700000000",
+            available_credit=Decimal("20"),
+        )
+        for card_number, error in (("C-1", "Insufficient store credit."), ("C-404", "Loyalty card not found.")):
+            payload = self.checkout_payload(
+                f"SC-{card_number}", paymentMethod="store_credit", cardNumber=card_number, storeCreditUsed=50,
+            )
+            response = self.place(payload)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data, {"failed": error})
+
+        self.assertFalse(Order.objects.filter(order_number__startswith="SC-").exists())
+        self.assertFalse(OutboxEvent.objects.filter(topic="store_credit.issue").exists())
+        self.soda.refresh_from_db()
+        self.assertEqual(self.soda.quantity, 10)
+
+    def test_redemptions_are_reserved_at_checkout(self):
+        card = LoyaltyCard.objects.create(
+            business=self.business, card_number="C-1", customer_name="Jane", phone_number="0700000000",
+            points=10, available_credit=Decimal("60"),
+        )
+        # Both sales pass the till before the worker applies either.
+        self.assertEqual(self.place(self.checkout_payload("P-1", cardNumber="C-1", loyaltyPointsUsed=10)).status_code, 201)
+        response = self.place(self.checkout_payload("P-2", cardNumber="C-1", loyaltyPointsUsed=10))
+        self.assertEqual(response.data, {"failed": "Insufficient points to redeem."})
+
+        credit = {"paymentMethod": "store_credit", "cardNumber": "C-1", "storeCreditUsed": 50}
+        self.assertEqual(self.place(self.checkout_payload("S-1", **credit)).status_code, 201)
+        response = self.place(self.checkout_payload("S-2", **credit))
+        self.assertEqual(response.data, {"failed": "Insufficient store credit."})
+
+        while process_batch():
+            pass
+        self.assertEqual(set(OutboxEvent.objects.values_list("status", flat=True)), {"Done"})
+        card.refresh_from_db()
+        # 10 points became credit; 50 of the credit went on a store loan.
+        self.assertEqual((card.points, card.available_credit, card.credit_issued), (0, Decimal("20"), Decimal("50")))
+        self.assertEqual(StoreLoan.objects.get(customer=card).total_amount, Decimal("50"))
+
+    def test_unknown_loyalty_card_is_refused(self):
+        response = self.place(self.checkout_payload("U-1", cardNumber="C-404"))
+        self.assertEqual((response.status_code, response.data), (400, {"failed": "Loyalty card not found."}))
+        self.assertFalse(Order.objects.filter(order_number="U-1").exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+
+    def test_retried_checkout_replays_the_first_response(self):
+        payload = self.checkout_payload("R-1", [(self.soda, 2)])
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.place(payload)
+        self.assertEqual(first.status_code, 201)
+
+        retry = self.place(payload)
+        self.assertEqual((retry.status_code, retry.data), (201, first.data))
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+
+        # Without the cached response the order table answers.
+        cache.clear()
+        retry = self.place(payload)
+        self.assertEqual((retry.status_code, retry.data), (201, first.data))
+
+        self.assertEqual(Order.objects.filter(order_number="R-1").count(), 1)
+        self.assertEqual(Payment.objects.filter(receipt_number="R-1").count(), 1)
+        self.soda.refresh_from_db()
+        self.assertEqual(self.soda.quantity, 8)
+
+    def test_receipt_of_another_business_conflicts(self):
+        other = Business.objects.create(name="Other", address="Mombasa", phone_number="0700000009")
+        Order.objects.create(business=other, order_number="R-9", status="Paid")
+
+        response = self.place(self.checkout_payload("R-9"))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data, {"failed": "Receipt number R-9 is already in use"})
+        self.soda.refresh_from_db()
+        self.assertEqual(self.soda.quantity, 10)
+
+    def test_retry_losing_the_insert_race_is_replayed(self):
+        winner = Order.objects.create(business=self.business, order_number="R-5", status="Paid", sold_by=self.user)
+        lookups = []
+
+        def racing_find_checkout(business, receipt_no):
+            # The first lookup runs before the concurrent retry commits.
+            lookups.append(receipt_no)
+            return None if len(lookups) == 1 else find_checkout(business, receipt_no)
+
+        with mock.patch("orders.views.find_checkout", side_effect=racing_find_checkout):
+            response = self.place(self.checkout_payload("R-5"))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+        self.assertEqual(response.data["order_id"], winner.id)
+        self.assertEqual(len(lookups), 2)
+        self.assertFalse(Payment.objects.filter(receipt_number="R-5").exists())
+        self.soda.refresh_from_db()
+        self.assertEqual(self.soda.quantity, 10)
+
+
+class BatchCheckoutTests(BusinessAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.soda = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Soda", quantity=10, selling_price=Decimal("50")
+        )
+        cls.juice = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Juice", quantity=10, selling_price=Decimal("100")
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.user.business.allow_negative_stock = False
+        self.user.business.save()
+        LoyaltyCard.objects.create(business=self.business, card_number="C-1", customer_name="Jane", phone_number="0700000000")
+
+    def place_batch(self, orders):
+        response = self.client.post(reverse("pos-place-orders-batch"), {"orders": orders}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assert_stock(self, soda, juice):
+        self.soda.refresh_from_db()
+        self.juice.refresh_from_db()
+        self.assertEqual((self.soda.quantity, self.juice.quantity), (soda, juice))
+
+    def test_batch_reports_created_duplicate_and_failed_orders(self):
+        self.client.post(reverse("pos-place-order"), {"data": checkout_payload("R-0", [(self.soda, 1)])}, format="json")
+        other = Business.objects.create(name="Other", address="Mombasa", phone_number="0700000009")
+        Order.objects.create(business=other, order_number="X-1", status="Paid")
+
+        data = self.place_batch([
+            checkout_payload("R-1", [(self.soda, 2)]),
+            checkout_payload("R-1", [(self.soda, 2)]),
+            checkout_payload("R-0", [(self.soda, 1)]),
+            checkout_payload("", [(self.soda, 1)]),
+            checkout_payload("R-2", [(self.juice, 1)], cardNumber="C-1"),
+            checkout_payload("X-1", [(self.juice, 1)]),
+        ])
+
+        self.assertEqual((data["created"], data["duplicate"], data["failed"]), (2, 1, 2))
+        # Another business's receipt number is never reported as saved.
+        self.assertEqual(data["results"]["X-1"], {"status": "failed", "error": "Receipt number X-1 is already in use"})
+        self.assertEqual(data["results"]["R-0"], {"status": "duplicate"})
+        self.assertEqual(data["results"]["#3"], {"status": "failed", "error": "receiptNo is required"})
+        self.assertEqual(data["results"]["R-1"]["order_id"], Order.objects.get(order_number="R-1").id)
+        self.assertEqual(Order.objects.filter(order_number="R-1").count(), 1)
+        self.assert_stock(soda=7, juice=9)
+        # Loyalty sales go through the regular processor and its outbox event.
+        self.assertTrue(OutboxEvent.objects.filter(topic="loyalty.checkout").exists())
+
+    def test_plain_sales_cost_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            self.place_batch([checkout_payload(f"S-{n}", [(self.soda, 1)]) for n in range(2)])
+        with CaptureQueriesContext(connection) as large:
+            self.place_batch([checkout_payload(f"L-{n}", [(self.soda, 1), (self.juice, 1)]) for n in range(6)])
+        self.assertEqual(len(small), len(large))
+        self.assert_stock(soda=2, juice=4)
+
+    @override_settings(POS_BATCH_CHUNK_SIZE=2)
+    def test_failed_chunk_falls_back_to_one_savepoint_per_order(self):
+        data = self.place_batch([
+            checkout_payload("R-1", [(self.soda, 4)]),
+            checkout_payload("R-2", [(self.soda, 20)]),
+            checkout_payload("R-3", [(self.juice, 1)]),
+        ])
+
+        self.assertEqual((data["created"], data["failed"]), (2, 1))
+        self.assertEqual(data["results"]["R-2"]["status"], "failed")
+        self.assertIn("Insufficient stock", data["results"]["R-2"]["error"])
+        self.assertEqual(set(Order.objects.values_list("order_number", flat=True)), {"R-1", "R-3"})
+        self.assertFalse(Payment.objects.filter(receipt_number="R-2").exists())
+        self.assert_stock(soda=6, juice=9)
+
+
+class OrderItemEditTests(BusinessAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.soda = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Soda", quantity=100, selling_price=Decimal("33.33")
+        )
+        cls.juice = InventoryItem.objects.create(
+            business=cls.business, category=category, name="Juice", quantity=100, selling_price=Decimal("12.49")
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.order = Order.objects.create(
+            business=self.business, order_number="EDIT-1", status="Pending",
+            sub_total=Decimal("79.15"), tax=Decimal("6.33"), total_amount=Decimal("85.48"),
+        )
+        # Checkout can leave two lines for one SKU.
+        self.soda_lines = [
+            OrderItem.objects.create(business=self.business, order=self.order, inventory_item=self.soda, quantity=1, item_total=Decimal("33.33"))
+            for _ in range(2)
+        ]
+        self.juice_line = OrderItem.objects.create(
+            business=self.business, order=self.order, inventory_item=self.juice, quantity=1, item_total=Decimal("12.49")
+        )
+
+    def assert_totals_match_recompute(self):
+        self.order.refresh_from_db()
+        totals = (self.order.sub_total, self.order.tax, self.order.total_amount)
+        self.order.refresh_total_amount()
+        self.order.refresh_from_db()
+        self.assertEqual(totals, (self.order.sub_total, self.order.tax, self.order.total_amount))
+
+    def edit(self, order_item, action_type, quantity=1):
+        response = self.client.post(
+            reverse("update-order-items"),
+            {"order_item": order_item.id, "action_type": action_type, "quantity": quantity},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_line_edits_keep_totals_equal_to_a_recompute(self):
+        for _ in range(3):
+            self.edit(self.juice_line, "increase")
+            self.assert_totals_match_recompute()
+        self.edit(self.soda_lines[0], "decrease")
+        self.assert_totals_match_recompute()
+        self.edit(self.soda_lines[1], "delete")
+        self.assert_totals_match_recompute()
+        self.assertEqual(self.order.sub_total, Decimal("49.96"))
+
+    def test_adding_a_sku_with_duplicate_lines_updates_one_line(self):
+        response = self.client.post(
+            reverse("create-order-items"),
+            {"order": self.order.id, "item": {"id": self.soda.id, "quantity": 2, "item_total": "66.66"}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        quantities = list(OrderItem.objects.filter(order=self.order, inventory_item=self.soda).order_by("id").values_list("quantity", flat=True))
+        self.assertEqual(quantities, [3, 1])
+        self.assert_totals_match_recompute()
+        self.assertEqual(self.order.sub_total, Decimal("145.81"))
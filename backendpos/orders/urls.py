@@ -1,6 +1,6 @@
 from django.urls import path
 from orders.views import (
-    POSOrderPlacementAPIView, OrderAPIView, 
+    POSOrderPlacementAPIView, POSOrderBatchPlacementAPIView, OrderAPIView, 
     OrderDetailAPIView, PayOrderAPIView,
     CreateOrderItemsAPIView, OrderItemUpdateAPIView, OrderItemAPIView
 )
@@ -9,6 +9,7 @@ urlpatterns = [
     path("", OrderAPIView.as_view(), name="orders"),
     path("<int:pk>/details/", OrderDetailAPIView.as_view(), name="order-details"),
     path("pos-place-order/", POSOrderPlacementAPIView.as_view(), name="pos-place-order"),
+    path("pos-place-orders/batch/", POSOrderBatchPlacementAPIView.as_view(), name="pos-place-orders-batch"),
     path("pay-order/", PayOrderAPIView.as_view(), name="pay-order"),
     path("update-order-items/", OrderItemUpdateAPIView.as_view(), name="update-order-items"),
     path("create-order-items/", CreateOrderItemsAPIView.as_view(), name="create-order-items"),
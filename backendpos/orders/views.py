@@ -1,5 +1,9 @@
+import logging
+
 from django.shortcuts import render
-from django.db import transaction
+from django.db import transaction, IntegrityError
+from django.db.models import Count, F, Subquery
+from django.utils import timezone
 from rest_framework import status, generics
 from decimal import Decimal
 
@@ -7,10 +11,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 
-from core.mixins import BusinessScopedQuerysetMixin
+from core.mixins import BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin
 
 from orders.serializers import (
-    PlacePOSOrderSerializer, PayOrderSerializer, 
+    PlacePOSOrderSerializer, PlacePOSOrderBatchSerializer, PayOrderSerializer, 
     OrderSerializer, OrderDetailSerializer,
     OrderItemUpdateSerializer, CreateOrderItemsSerializer, OrderItemSerializer
 )
@@ -18,24 +22,34 @@ from orders.models import Order, OrderItem
 from payments.models import Payment
 
 
-from finances.store_loan_mixin import ProcessStoreLoanMixin
-from customers.customer_points_processing import CustomerPointsProcessor, CustomerPointsRedeemer
 from bnpl.bnpl_order_processing import BNPLPurchaseProcessor
+from django.conf import settings
+from orders.checkout import POSCheckoutProcessor, POSBatchCheckoutProcessor
+from inventory.stock import InsufficientStockError
+from orders.idempotency import find_checkout, remember_checkout, checkout_response, ReceiptConflict
+
+logger = logging.getLogger(__name__)
+
 # Create your views here.
-class OrderAPIView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
-    queryset = Order.objects.all().order_by("-created_at")
+class OrderAPIView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListCreateAPIView):
+    queryset = (
+        Order.objects
+        .select_related("business", "sold_by")
+        .annotate(items_count=Count("items"))
+        .order_by("-created_at")
+    )
     serializer_class = OrderSerializer
 
 
-class OrderDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class OrderDetailAPIView(SparseQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Order.objects.all().order_by("-created_at")
     serializer_class = OrderDetailSerializer
 
     lookup_field = "pk"
 
 
-class OrderItemAPIView(generics.ListAPIView):
-    queryset = OrderItem.objects.all().order_by("-created_at")
+class OrderItemAPIView(BusinessScopedQuerysetMixin, generics.ListAPIView):
+    queryset = OrderItem.objects.select_related("inventory_item", "menu_item").order_by("-created_at")
     serializer_class = OrderItemSerializer
     permission_classes = [IsAuthenticated]
 
@@ -54,91 +68,72 @@ class POSOrderPlacementAPIView(generics.CreateAPIView):
 
             order_data = serializer.validated_data.get("data")
 
-            print(order_data)
+            logger.debug("POS checkout payload: %s", order_data)
+
+            # A retried checkout replays the original response without
+            # touching inventory, loyalty or payments again.
+            receipt_no = order_data.get("receiptNo")
+            try:
+                replay = find_checkout(request.user.business, receipt_no)
+            except ReceiptConflict as e:
+                return Response({"failed": str(e)}, status=status.HTTP_409_CONFLICT)
+            if replay is not None:
+                return Response(replay, status=status.HTTP_201_CREATED, headers={"Idempotent-Replayed": "true"})
+
+            try:
+                if order_data.get("paymentMethod") == "bnpl":
+                    order = BNPLPurchaseProcessor(
+                        user=request.user,
+                        order_data=order_data
+                    ).run().order
+                else:
+                    order = POSCheckoutProcessor(
+                        user=request.user,
+                        order_data=order_data
+                    ).run()
+            except InsufficientStockError as e:
+                return Response({"failed": str(e), "items": e.item_ids}, status=status.HTTP_400_BAD_REQUEST)
+            except ValueError as e:
+                # Loyalty points or store credit the card cannot cover.
+                return Response({"failed": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            except IntegrityError:
+                # A concurrent retry won the race for this receipt number.
+                replay = find_checkout(request.user.business, receipt_no)
+                if replay is None:
+                    raise
+                return Response(replay, status=status.HTTP_201_CREATED, headers={"Idempotent-Replayed": "true"})
+
+            body = checkout_response(order.id, order.order_number)
+            transaction.on_commit(lambda: remember_checkout(request.user.business, order.order_number, body))
+            return Response(body, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
 
-            
-            if order_data.get("paymentMethod") == "bnpl":
-                BNPLPurchaseProcessor(
-                    user=request.user,
-                    order_data=order_data
-                ).run()
-            
-            else:
 
-                CustomerPointsProcessor(
-                    card_number=order_data.get("cardNumber"),
-                    amount=order_data.get("total"),
-                    user=request.user
-                ).run()
+class POSOrderBatchPlacementAPIView(generics.CreateAPIView):
+    """
+    Drains an offline till's queue in one call. Takes a list of orders in the
+    same shape as `pos-place-order` and reports a result per `receiptNo`.
+    """
+    serializer_class = PlacePOSOrderBatchSerializer
+    permission_classes = [IsAuthenticated]
 
-                CustomerPointsRedeemer(
-                    card_number=order_data.get("cardNumber"),
-                    points_to_redeem=order_data.get("loyaltyPointsUsed"),
-                    user=request.user
-                ).run()
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
 
-                order = Order.objects.create(
-                    business=request.user.business,
-                    order_number=order_data.get("receiptNo"),
-                    tax=order_data.get("tax"),
-                    sub_total=order_data.get("subtotal"),
-                    total_amount=order_data.get("total"),
-                    amount_received=order_data.get("amountReceived"),
-                    amount_paid=order_data.get("total"),
-                    status=order_data.get("status"),
-                    sold_by=request.user
-                )
-                order.status == "Paid" if order.amount_received >= order.total_amount else order_data.get("status")
-                order.save()
-                Payment.objects.create(
-                    business=order.business,
-                    branch=order.branch,
-                    order=order,
-                    subtotal=order_data.get("subtotal"), 
-                    tax=order_data.get("tax"), 
-                    total=order_data.get("total"), 
-                    payment_method=order_data.get("paymentMethod"), 
-                    amount_received=order_data.get("amountReceived"), 
-                    change=order_data.get("change"), 
-                    mobile_number=order_data.get("mobileNumber"), 
-                    mobile_network=order_data.get("mobileNetwork"), 
-                    split_cash_amount=order_data.get("splitCashAmount"), 
-                    split_mobile_amount=order_data.get("splitMobileAmount"), 
-                    status=order.status, 
-                    payment_date=order_data.get("date"), 
-                    receipt_number=order_data.get("receiptNo")
-                )
+        if serializer.is_valid(raise_exception=True):
+            results = POSBatchCheckoutProcessor(
+                orders=serializer.validated_data["orders"],
+                user=request.user,
+                chunk_size=getattr(settings, "POS_BATCH_CHUNK_SIZE", 50)
+            ).run()
 
-                for x in order_data.get("items"):
-                    OrderItem.objects.create(
-                        order=order,
-                        business=request.user.business,
-                        inventory_item_id=x["id"],
-                        quantity=x["quantity"],
-                        item_total=x["total_price"]
-                    )
-
-                for item in order.items.all():
-                    item.inventory_item.quantity -= item.quantity
-                    item.inventory_item.save()
-
-            
-                if order_data.get("paymentMethod") == "store_credit":
-                    loyalty_card_number = order_data.get('cardNumber')
-                    amount = order_data.get("storeCreditUsed")
-
-                    print(f"Loyalty Card Number: {loyalty_card_number}, Amount: {amount}")
-
-                    ProcessStoreLoanMixin(
-                        card_number=loyalty_card_number,
-                        amount=amount,
-                        user=request.user
-                    ).run()
+            summary = {"created": 0, "duplicate": 0, "failed": 0}
+            for result in results.values():
+                summary[result["status"]] += 1
 
-            
-            return Response({"success": "Order successfully placed"}, status=status.HTTP_201_CREATED)
+            return Response({**summary, "results": results}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
 
 
 class PayOrderAPIView(generics.CreateAPIView):
@@ -192,32 +187,31 @@ class OrderItemUpdateAPIView(generics.CreateAPIView):
             if action_type in ["delete", "remove"]:
                 order_item = OrderItem.objects.get(id=serializer.validated_data["order_item"])
                 print(f"Order Item: {order_item}")
-                order = Order.objects.get(id=order_item.order.id)
 
                 order_item.delete()
-                order.refresh_total_amount()
+                Order.apply_item_delta(order_item.order_id, -order_item.item_total)
                 return Response({"success": "Order item deleted successfully"}, status=status.HTTP_201_CREATED)
-            elif action_type in ["increase", "increment"]:
-                order_item = OrderItem.objects.get(id=serializer.validated_data["order_item"])
-                order_item.quantity += int(serializer.validated_data["quantity"])
-                order_item.save()
-                order_item.item_total = Decimal(order_item.quantity) * Decimal(order_item.inventory_item.selling_price)
-                order_item.save()
-
-                order_item.refresh_from_db()
-                order_item.order.refresh_total_amount()
-                order_item.order.save()
-                return Response({"success": "Order item increased successfully"}, status=status.HTTP_201_CREATED)
-            
-            elif action_type in ["decrease", "decrement"]:
-                order_item = OrderItem.objects.get(id=serializer.validated_data["order_item"])
-                order_item.quantity -= int(serializer.validated_data["quantity"])
-                order_item.save()
-                order_item.item_total = Decimal(order_item.quantity) * Decimal(order_item.inventory_item.selling_price)
-                order_item.save()
+            elif action_type in ["increase", "increment", "decrease", "decrement"]:
+                order_item = (
+                    OrderItem.objects
+                    .select_related("inventory_item", "menu_item")
+                    .get(id=serializer.validated_data["order_item"])
+                )
+                quantity = int(serializer.validated_data["quantity"])
+                if action_type in ["decrease", "decrement"]:
+                    quantity = -quantity
 
-                order_item.refresh_from_db()
-                order_item.order.refresh_total_amount()
+                unit_price = (
+                    order_item.inventory_item.selling_price if order_item.inventory_item else order_item.menu_item.price
+                )
+                previous_total = order_item.item_total
+                order_item.quantity += quantity
+                order_item.item_total = Decimal(order_item.quantity) * Decimal(unit_price)
+                order_item.save(update_fields=["quantity", "item_total", "updated_at"])
+
+                Order.apply_item_delta(order_item.order_id, order_item.item_total - previous_total)
+                if quantity > 0:
+                    return Response({"success": "Order item increased successfully"}, status=status.HTTP_201_CREATED)
                 return Response({"success": "Order item decreased successfully"}, status=status.HTTP_201_CREATED)
             else:
                 return Response({"failed": "The action you provided is unknown here!!"}, status=status.HTTP_400_BAD_REQUEST)
@@ -233,22 +227,28 @@ class CreateOrderItemsAPIView(generics.CreateAPIView):
         serializer = self.serializer_class(data=request.data)
 
         if serializer.is_valid(raise_exception=True):
-            order = Order.objects.get(id=serializer.validated_data.get("order"))
+            order_id = serializer.validated_data.get("order")
             item = serializer.validated_data["item"]
+            item_total = Decimal(str(item["item_total"]))
 
-            order_item = OrderItem.objects.filter(order=order, inventory_item__id=item["id"]).first()
-            if order_item:
-                order_item.quantity += item["quantity"]
-                order_item.item_total += item["item_total"]
-                order_item.save()
-            else:
+            # Checkout may have left several lines for the SKU; the quantity
+            # goes onto the first one only, matching the single delta below.
+            first_line = (
+                OrderItem.objects.filter(order_id=order_id, inventory_item_id=item["id"]).order_by("id").values("id")[:1]
+            )
+            updated = OrderItem.objects.filter(pk=Subquery(first_line)).update(
+                quantity=F("quantity") + item["quantity"],
+                item_total=F("item_total") + item_total,
+                updated_at=timezone.now(),
+            )
+            if not updated:
                 OrderItem.objects.create(
                     business=request.user.business,
-                    order=order,
+                    order_id=order_id,
                     inventory_item_id=item["id"],
                     quantity=item["quantity"],
-                    item_total=item["item_total"]
+                    item_total=item_total
                 )
-            order.refresh_total_amount()
+            Order.apply_item_delta(order_id, item_total)
             return Response({"success": "Order items added successfully!!"}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PaymentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "payments"
+
+    def ready(self):
+        import payments.side_effects  # noqa: F401  registers outbox handlers
+        import payments.mpesa.tasks  # noqa: F401
@@ -0,0 +1,165 @@
+import contextlib
+import io
+import time
+from decimal import Decimal
+from urllib.parse import urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.benchmarking import measure, rolled_back, seed_business
+from core.outbox import process_batch
+from orders.models import Order
+from payments.models import MpesaTransaction, Payment
+from payments.mpesa import client as mpesa_client
+from payments.mpesa.simulator import DarajaSimulator
+from payments.mpesa.views import ConfirmPaymentAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the M-Pesa flow end to end against the local Daraja simulator: STK push request, "
+        "outbox send, result callback, order settlement and payment confirmation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=200)
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every Daraja response.")
+        parser.add_argument("--failure-rate", type=float, default=0.05)
+        parser.add_argument("--cancel-rate", type=float, default=0.1)
+        parser.add_argument("--callback-delay", type=float, default=0.5)
+        parser.add_argument("--callback-repeats", type=int, default=2, help="Times each callback is delivered.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        simulator = DarajaSimulator(
+            latency=options["latency"],
+            failure_rate=options["failure_rate"],
+            cancel_rate=options["cancel_rate"],
+            callback_delay=options["callback_delay"],
+            callback_repeats=options["callback_repeats"],
+            seed=options["seed"],
+        ).start()
+        mpesa_client.token_cache = mpesa_client.MpesaTokenCache()
+
+        try:
+            with override_settings(MPESA_BASE_URL=simulator.url, MPESA_CALLBACK_BASE_URL="http://testserver"):
+                with rolled_back(), contextlib.redirect_stdout(io.StringIO()):
+                    rows, summary = self._run(simulator, options["orders"])
+        finally:
+            simulator.stop()
+
+        self.stdout.write(f"{'phase':<10} {'count':>6} {'wall s':>8} {'median ms':>10} {'p95 ms':>8} {'queries':>8}")
+        for name, count, wall, result in rows:
+            self.stdout.write(
+                f"{name:<10} {count:>6} {wall:>8.2f} {result['median_ms']:>10.2f} {result['p95_ms']:>8.2f} {result['queries']:>8}"
+            )
+        self.stdout.write(summary)
+
+    def _run(self, simulator, count):
+        fixture = seed_business(1)
+        business, branch = fixture["business"], fixture["branch"]
+        orders = Order.objects.bulk_create(
+            Order(
+                business=business,
+                branch=branch,
+                order_number=f"MPESA-{business.id}-{index}",
+                sub_total=Decimal("150"),
+                total_amount=Decimal("150"),
+                status="Pending",
+                sold_by=fixture["user"],
+            )
+            for index in range(count)
+        )
+        self._drain()
+
+        client = APIClient()
+        client.force_authenticate(user=fixture["user"])
+        rows = []
+        started = time.perf_counter()
+
+        pending_orders = iter(orders)
+
+        def push():
+            response = client.post(
+                reverse("mpesa-stk-push"),
+                {"phone_number": "0700000000", "amount": "150", "order": next(pending_orders).id},
+                format="json",
+            )
+            assert response.status_code == 202, response.content
+
+        rows.append(self._phase("push", count, lambda: measure(push, count)))
+        rows.append(self._phase("send", count, lambda: self._drain()))
+
+        callbacks = []
+        while simulator.pending_callbacks:
+            callbacks.extend(simulator.take_callbacks(wait=True))
+        pending_callbacks = iter(callbacks)
+
+        def callback():
+            url, body = next(pending_callbacks)
+            response = client.post(urlparse(url).path, body, format="json")
+            assert response.status_code == 200, response.content
+
+        rows.append(self._phase("callback", len(callbacks), lambda: measure(callback, len(callbacks))))
+
+        transactions = MpesaTransaction.objects.filter(business=business)
+        completed = transactions.filter(status="Completed")
+        rows.append(self._phase("settle", completed.count(), lambda: self._drain()))
+        settled_in = time.perf_counter() - started
+
+        merchant_request_ids = iter(completed.values_list("merchant_request_id", "checkout_request_id"))
+        factory = APIRequestFactory()
+        view = ConfirmPaymentAPIView.as_view()
+
+        def confirm():
+            merchant_request_id, checkout_request_id = next(merchant_request_ids)
+            request = factory.post(
+                "/", {"MerchantRequestID": merchant_request_id, "CheckoutRequestID": checkout_request_id}, format="json"
+            )
+            response = view(request)
+            assert response.status_code == 200, response.data
+
+        completed_count = completed.count()
+        rows.append(self._phase("confirm", completed_count, lambda: measure(confirm, completed_count)))
+
+        statuses = {status: transactions.filter(status=status).count() for status in ("Confirmed", "Cancelled", "Failed")}
+        paid = Order.objects.filter(business=business, status="Paid").count()
+        payments = Payment.objects.filter(business=business, payment_method="mpesa").count()
+        if paid != statuses["Confirmed"] or payments != statuses["Confirmed"]:
+            raise CommandError(
+                f"{statuses['Confirmed']} completed transactions but {paid} paid orders and {payments} payments"
+            )
+
+        summary = (
+            f"{count} pushes: {statuses['Confirmed']} paid, {statuses['Cancelled']} cancelled, {statuses['Failed']} failed; "
+            f"{len(callbacks)} callbacks delivered; settled in {settled_in:.2f}s ({count / settled_in:.0f} orders/s)"
+        )
+        return rows, summary
+
+    def _phase(self, name, count, fn):
+        started = time.perf_counter()
+        result = fn()
+        return name, count, time.perf_counter() - started, result
+
+    def _drain(self):
+        """
+        Runs the outbox until nothing is due, timing each event.
+        """
+        timings = []
+        while True:
+            started = time.perf_counter()
+            if not process_batch(limit=1):
+                break
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        if not timings:
+            return {"median_ms": 0.0, "p95_ms": 0.0, "queries": 0}
+        return {
+            "median_ms": timings[len(timings) // 2],
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            "queries": "-",
+        }
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.mpesa.simulator import DarajaSimulator
+
+
+class Command(BaseCommand):
+    help = (
+        "Serves a local Daraja stand-in (OAuth, STK push and result callbacks). Start the API with "
+        "MPESA_BASE_URL pointing at it and MPESA_CALLBACK_BASE_URL at the API itself."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8090)
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every Daraja response.")
+        parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of pushes refused with a 500.")
+        parser.add_argument("--cancel-rate", type=float, default=0.0, help="Share of accepted pushes the customer cancels.")
+        parser.add_argument("--callback-delay", type=float, default=2.0, help="Seconds between a push and its callback.")
+        parser.add_argument("--callback-repeats", type=int, default=1, help="Times each callback is delivered.")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        simulator = DarajaSimulator(
+            host=options["host"],
+            port=options["port"],
+            latency=options["latency"],
+            failure_rate=options["failure_rate"],
+            cancel_rate=options["cancel_rate"],
+            callback_delay=options["callback_delay"],
+            callback_repeats=options["callback_repeats"],
+            deliver_callbacks=True,
+            seed=options["seed"],
+        ).start()
+        self.stdout.write(f"Daraja simulator listening on {simulator.url}")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            simulator.stop()
+            self.stdout.write(f"Pushes: {len(simulator.pushes)}, callbacks delivered: {dict(simulator.deliveries)}")
@@ -0,0 +1,54 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.reconciliation import (
+    payments_for,
+    reconcile,
+    statement_from_csv,
+    statement_from_transactions,
+    unresolved_pushes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconciles one day's M-Pesa statement (a CSV export, or the STK transactions table) against "
+        "the business's mobile money payments, by receipt number, then phone and amount."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business", type=int, required=True)
+        parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="YYYY-MM-DD, defaults to today.")
+        parser.add_argument("--csv", help="M-Pesa statement export; the STK transactions table is used when omitted.")
+        parser.add_argument("--show", type=int, default=10, help="Rows listed per unmatched or duplicate group.")
+
+    def handle(self, *args, **options):
+        business_id, day = options["business"], options["date"]
+        started = time.perf_counter()
+
+        try:
+            if options["csv"]:
+                with open(options["csv"], newline="", encoding="utf-8-sig") as file:
+                    result = reconcile(statement_from_csv(file), payments_for(business_id, day))
+            else:
+                result = reconcile(statement_from_transactions(business_id, day), payments_for(business_id, day))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        result["unresolved_pushes"] = unresolved_pushes(business_id, day)
+        elapsed = time.perf_counter() - started
+        by_receipt = sum(1 for _, _, how in result["matched"] if how == "receipt")
+
+        self.stdout.write(f"Reconciliation for business {business_id} on {day} ({elapsed:.2f}s)")
+        self.stdout.write(f"  matched              {len(result['matched']):>8}  ({by_receipt} by receipt, {len(result['matched']) - by_receipt} by phone and amount)")
+        for key in ("amount_mismatch", "unmatched_statement", "unmatched_payments", "duplicate_statement", "duplicate_payments", "unresolved_pushes"):
+            self.stdout.write(f"  {key.replace('_', ' '):<20} {len(result[key]):>8}")
+
+        for key in ("amount_mismatch", "unmatched_statement", "unmatched_payments", "duplicate_statement", "duplicate_payments", "unresolved_pushes"):
+            rows = result[key][:options["show"]]
+            if rows:
+                self.stdout.write(f"\n{key.replace('_', ' ').capitalize()}:")
+                for row in rows:
+                    self.stdout.write(f"  {row}")
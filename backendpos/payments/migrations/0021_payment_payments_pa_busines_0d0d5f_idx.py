@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bnpl', '0006_alter_bnplinstallment_options_and_more'),
+        ('core', '0011_outboxevent'),
+        ('invoices', '0013_supplierinvoiceitem_branch_and_more'),
+        ('orders', '0011_order_orders_orde_busines_d2c92a_idx_and_more'),
+        ('payments', '0020_businessledger_reference'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['business', 'created_at', 'id'], name='payments_pa_busines_0d0d5f_idx'),
+        ),
+    ]
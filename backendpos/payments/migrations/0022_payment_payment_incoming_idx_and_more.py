@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bnpl', '0007_bnplinstallment_bnpl_bnplin_purchas_8dcb3a_idx'),
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('invoices', '0015_supplierinvoice_invoices_su_busines_ccb263_idx'),
+        ('orders', '0011_order_orders_orde_busines_d2c92a_idx_and_more'),
+        ('payments', '0021_payment_payments_pa_busines_0d0d5f_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('direction', 'Incoming')), fields=['business', 'branch', 'created_at'], name='payment_incoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('payment_method', 'BNPL')), fields=['business', 'created_at'], name='payment_bnpl_idx'),
+        ),
+    ]
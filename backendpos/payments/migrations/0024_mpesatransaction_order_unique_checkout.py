@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_order_orders_orde_busines_d2c92a_idx_and_more'),
+        ('payments', '0023_mpesatransaction_business'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mpesatransaction',
+            name='order',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mpesa_transactions', to='orders.order'),
+        ),
+        migrations.AlterField(
+            model_name='mpesatransaction',
+            name='checkout_request_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -26,6 +26,14 @@ class Payment(AbstractBaseModel):
     mobile_network = models.CharField(max_length=255, null=True)
     direction = models.CharField(max_length=255, default="Incoming")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at", "id"]),
+            models.Index(fields=["business", "branch", "created_at"], condition=models.Q(direction="Incoming"), name="payment_incoming_idx"),
+            models.Index(fields=["business", "created_at"], condition=models.Q(payment_method="BNPL"), name="payment_bnpl_idx"),
+        ]
+
+
 
 
 class BusinessLedger(AbstractBaseModel):
@@ -94,8 +102,11 @@ class CustomerInvoicePayment(AbstractBaseModel):
 
 
 class MpesaTransaction(AbstractBaseModel):
+    business = models.ForeignKey("core.Business", on_delete=models.SET_NULL, null=True, blank=True, related_name="mpesa_transactions")
+    order = models.ForeignKey("orders.Order", on_delete=models.SET_NULL, null=True, blank=True, related_name="mpesa_transactions")
     merchant_request_id = models.CharField(max_length=255, null=True, blank=True)
-    checkout_request_id = models.CharField(max_length=255, null=True, blank=True)
+    # Callbacks are matched and de-duplicated on this id.
+    checkout_request_id = models.CharField(max_length=255, null=True, blank=True, unique=True)
     response_desc = models.CharField(max_length=255, null=True, blank=True)
     customer_message = models.CharField(max_length=255, null=True, blank=True)
     result_code = models.IntegerField(null=True, blank=True)
@@ -105,6 +116,9 @@ class MpesaTransaction(AbstractBaseModel):
     balance = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     transaction_date = models.CharField(max_length=14, null=True, blank=True)
     phone_number = models.CharField(max_length=15, null=True, blank=True)
+    # Queued -> Sending -> Pending (accepted by Daraja, awaiting the customer),
+    # Failed, or Submitted (sent, answer lost); the callback then moves Pending
+    # (or a Submitted row it matches) to Completed, Cancelled or Failed.
     status = models.CharField(max_length=20, default='Pending')
 
     def __str__(self):
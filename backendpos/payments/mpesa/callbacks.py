@@ -0,0 +1,110 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import OutboxEvent
+from core.outbox import enqueue
+from payments.models import MpesaTransaction
+
+
+# Daraja ResultCode -> MpesaTransaction.status; any other code is a failure.
+RESULT_STATUSES = {
+    0: "Completed",
+    1032: "Cancelled",  # Request cancelled by the customer
+}
+
+
+def callback_url() -> str:
+    return f"{settings.MPESA_CALLBACK_BASE_URL}/payments/mpesa/callback/{settings.MPESA_CALLBACK_SECRET}/"
+
+
+def _decimal(value) -> Optional[Decimal]:
+    try:
+        return Decimal(str(value)) if value is not None else None
+    except InvalidOperation:
+        return None
+
+
+def adopt_submitted(result: Dict[str, Any]) -> bool:
+    """
+    Gives a callback's checkout id to the one Submitted push (sent, but the
+    acknowledgement was lost) for the same phone number and amount. Only
+    successful callbacks carry those, so others cannot be matched.
+    """
+    phone_number, amount = result.get("phone_number"), _decimal(result.get("amount"))
+    if not phone_number or amount is None:
+        return False
+
+    candidates = list(
+        MpesaTransaction.objects
+        .filter(status="Submitted", checkout_request_id__isnull=True, phone_number=str(phone_number), amount=amount)
+        .values_list("id", flat=True)[:2]
+    )
+    if len(candidates) != 1:
+        return False
+    return bool(MpesaTransaction.objects.filter(id=candidates[0], status="Submitted").update(
+        status="Pending",
+        checkout_request_id=result["checkout_request_id"],
+        merchant_request_id=result.get("merchant_request_id"),
+        updated_at=timezone.now(),
+    ))
+
+
+def apply_callback(result: Dict[str, Any]) -> Optional[bool]:
+    """
+    Stores a cleaned STK callback (see `cleanup_mpesa_callback`) with one
+    UPDATE that only matches a transaction still waiting for its result, so
+    repeated deliveries are no-ops. The amount and phone number pushed are
+    kept; a success whose amount differs is recorded as Failed. A completed
+    payment is handed to the `mpesa.settle` outbox handler. Call inside the
+    caller's transaction.
+
+    Returns True when applied, False for a duplicate, and None when no
+    transaction has this checkout id (yet).
+    """
+    checkout_request_id = result["checkout_request_id"]
+    stored = MpesaTransaction.objects.filter(checkout_request_id=checkout_request_id).values("amount").first()
+    if stored is None and adopt_submitted(result):
+        stored = MpesaTransaction.objects.filter(checkout_request_id=checkout_request_id).values("amount").first()
+    if stored is None:
+        return None
+
+    result_code = int(result["result_code"])
+    status = RESULT_STATUSES.get(result_code, "Failed")
+    result_desc = result.get("result_desc") or ""
+    paid = _decimal(result.get("amount"))
+    if status == "Completed" and (paid is None or paid != stored["amount"]):
+        status = "Failed"
+        result_desc = f"Amount mismatch: paid {result.get('amount')}, requested {stored['amount']}"
+
+    updated = MpesaTransaction.objects.filter(
+        checkout_request_id=checkout_request_id,
+        result_code__isnull=True,
+    ).update(
+        result_code=result_code,
+        result_desc=str(result_desc)[:255],
+        status=status,
+        mpesa_receipt_number=str(result.get("mpesa_receipt_number") or "")[:20] or None,
+        balance=_decimal(result.get("balance")),
+        transaction_date=str(result.get("transaction_date") or "")[:14] or None,
+        updated_at=timezone.now(),
+    )
+
+    if updated and status == "Completed":
+        enqueue("mpesa.settle", {"checkout_request_id": checkout_request_id}, ordering_key=f"mpesa:{checkout_request_id}")
+    return bool(updated)
+
+
+def defer_callback(result: Dict[str, Any]) -> bool:
+    """
+    Queues a callback that beat the worker storing its checkout id, unless
+    `MPESA_EARLY_CALLBACK_LIMIT` are already waiting. Returns whether it was
+    queued; dropped ones are left to reconciliation.
+    """
+    waiting = OutboxEvent.objects.filter(topic="mpesa.callback", status="Pending").count()
+    if waiting >= settings.MPESA_EARLY_CALLBACK_LIMIT:
+        return False
+    enqueue("mpesa.callback", result, ordering_key=f"mpesa:{result['checkout_request_id']}")
+    return True
@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class MpesaAuthenticationError(Exception):
+    pass
+
+
+def mpesa_url(path: str) -> str:
+    return f"{settings.MPESA_BASE_URL.rstrip('/')}{path}"
+
+
+def build_session() -> requests.Session:
+    """
+    Keep-alive session for the Daraja API. Token GETs are retried on
+    connection errors, read timeouts and 429/5xx with exponential backoff;
+    POSTs only when the connection could not be opened, so a push is never
+    sent twice.
+    """
+    retry = Retry(
+        total=settings.MPESA_MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=settings.MPESA_POOL_SIZE)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class MpesaTokenCache:
+    """
+    Process-wide OAuth token, refreshed shortly before Safaricom expires it.
+    Refreshes are single-flight: concurrent callers wait for the one request
+    in progress instead of each fetching a token.
+    """
+
+    # Refresh this many seconds before the token's stated expiry.
+    EXPIRY_MARGIN = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+
+    def get(self, session: requests.Session) -> str:
+        token = self._token
+        if token is not None and time.monotonic() < self._expires_at:
+            return token
+
+        with self._lock:
+            # Another thread may have refreshed while this one waited.
+            if self._token is not None and time.monotonic() < self._expires_at:
+                return self._token
+            return self._refresh(session)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Drops `token` after Daraja rejected it, unless it was already replaced.
+        """
+        with self._lock:
+            if self._token == token:
+                self._token = None
+                self._expires_at = 0.0
+
+    def _refresh(self, session: requests.Session) -> str:
+        response = session.get(
+            mpesa_url("/oauth/v1/generate"),
+            params={"grant_type": "client_credentials"},
+            auth=(settings.MPESA_CONSUMER_KEY, settings.MPESA_CONSUMER_SECRET),
+            timeout=settings.MPESA_TIMEOUT,
+        )
+        if response.status_code != 200:
+            raise MpesaAuthenticationError(f"Failed to authenticate with Mpesa API ({response.status_code})")
+
+        data = response.json()
+        expires_in = int(data.get("expires_in") or 3599)
+        self._token = data["access_token"]
+        self._expires_at = time.monotonic() + expires_in - min(self.EXPIRY_MARGIN, expires_in / 10)
+        return self._token
+
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+token_cache = MpesaTokenCache()
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_access_token() -> str:
+    return token_cache.get(get_session())
+
+
+def post(path: str, payload: dict) -> requests.Response:
+    """
+    Authenticated POST to Daraja. A 401 means the cached token was revoked
+    early; it is refreshed once and the request repeated.
+    """
+    session = get_session()
+    for _ in range(2):
+        token = token_cache.get(session)
+        response = session.post(
+            mpesa_url(path),
+            json=payload,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=settings.MPESA_TIMEOUT,
+        )
+        if response.status_code != 401:
+            break
+        token_cache.invalidate(token)
+    return response
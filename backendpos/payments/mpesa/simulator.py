@@ -0,0 +1,252 @@
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+
+class DarajaSimulator:
+    """
+    Local stand-in for the Safaricom Daraja endpoints the POS calls: the
+    OAuth token endpoint and STK push, followed by the customer's result
+    posted to the push's CallBackURL. Counts requests and TCP connections
+    so tests and benchmarks can check token reuse and keep-alive.
+
+        simulator = DarajaSimulator().start()
+        with override_settings(MPESA_BASE_URL=simulator.url): ...
+        simulator.stop()
+
+    `failure_rate` of pushes are refused with a 500, and `cancel_rate` of
+    the accepted ones come back cancelled (1032). Each result is due
+    `callback_delay` seconds after its push and sent `callback_repeats`
+    times, as Safaricom sometimes does. With `deliver_callbacks` a thread
+    POSTs them; otherwise the caller collects them with `take_callbacks`
+    and delivers them itself (e.g. through the Django test client).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token_ttl: int = 3599,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        cancel_rate: float = 0.0,
+        callback_delay: float = 0.0,
+        callback_repeats: int = 1,
+        deliver_callbacks: bool = False,
+        seed: Optional[int] = None,
+    ):
+        self.token_ttl = token_ttl
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.cancel_rate = cancel_rate
+        self.callback_delay = callback_delay
+        self.callback_repeats = callback_repeats
+        self.deliver_callbacks = deliver_callbacks
+        self.calls: Counter = Counter()
+        self.connections = 0
+        self.pushes = []
+        # Callback responses by HTTP status, when delivered by this simulator.
+        self.deliveries: Counter = Counter()
+        self._random = random.Random(seed)
+        self._receipts = itertools.count(1)
+        self._callbacks: List[Tuple[float, int, str, dict]] = []
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._callbacks_ready = threading.Condition(self._lock)
+        self._stopped = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "DarajaSimulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        if self.deliver_callbacks:
+            threading.Thread(target=self._deliver_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            self._callbacks_ready.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def revoke_tokens(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+    def issue_token(self) -> dict:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.monotonic() + self.token_ttl
+        return {"access_token": token, "expires_in": str(self.token_ttl)}
+
+    def token_is_valid(self, token: str) -> bool:
+        with self._lock:
+            expires_at = self._tokens.get(token)
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def accept_push(self, payload: dict) -> Optional[dict]:
+        """
+        Records the push and schedules its callback. Returns the
+        acknowledgement, or None when the push is refused.
+        """
+        with self._lock:
+            self.pushes.append(payload)
+            if self._random.random() < self.failure_rate:
+                return None
+            cancelled = self._random.random() < self.cancel_rate
+
+        acknowledgement = {
+            "MerchantRequestID": f"SIM-{uuid.uuid4().hex[:12]}",
+            "CheckoutRequestID": f"ws_CO_SIM_{uuid.uuid4().hex[:16]}",
+            "ResponseCode": "0",
+            "ResponseDescription": "Success. Request accepted for processing",
+            "CustomerMessage": "Success. Request accepted for processing",
+        }
+        if payload.get("CallBackURL"):
+            callback = self.callback_body(acknowledgement, payload, 1032 if cancelled else 0)
+            due = time.monotonic() + self.callback_delay
+            with self._lock:
+                for _ in range(self.callback_repeats):
+                    heapq.heappush(self._callbacks, (due, next(self._receipts), payload["CallBackURL"], callback))
+                self._callbacks_ready.notify_all()
+        return acknowledgement
+
+    def callback_body(self, acknowledgement: dict, payload: dict, result_code: int) -> dict:
+        result = {
+            "MerchantRequestID": acknowledgement["MerchantRequestID"],
+            "CheckoutRequestID": acknowledgement["CheckoutRequestID"],
+            "ResultCode": result_code,
+            "ResultDesc": "The service request is processed successfully." if result_code == 0 else "Request cancelled by user",
+        }
+        if result_code == 0:
+            result["CallbackMetadata"] = {
+                "Item": [
+                    {"Name": "Amount", "Value": payload.get("Amount")},
+                    {"Name": "MpesaReceiptNumber", "Value": f"SIM{uuid.uuid4().hex[:7].upper()}"},
+                    {"Name": "TransactionDate", "Value": int(datetime.now().strftime("%Y%m%d%H%M%S"))},
+                    {"Name": "PhoneNumber", "Value": int(payload.get("PhoneNumber") or 0)},
+                ]
+            }
+        return {"Body": {"stkCallback": result}}
+
+    @property
+    def pending_callbacks(self) -> int:
+        with self._lock:
+            return len(self._callbacks)
+
+    def take_callbacks(self, wait: bool = False) -> List[Tuple[str, dict]]:
+        """
+        Removes and returns the callbacks that are due as (url, body) pairs.
+        With `wait`, first sleeps until the earliest one is due.
+        """
+        with self._lock:
+            if wait and self._callbacks:
+                delay = self._callbacks[0][0] - time.monotonic()
+                if delay > 0:
+                    self._callbacks_ready.wait(delay)
+
+            now = time.monotonic()
+            due = []
+            while self._callbacks and self._callbacks[0][0] <= now:
+                _, _, url, body = heapq.heappop(self._callbacks)
+                due.append((url, body))
+            return due
+
+    def _deliver_forever(self) -> None:
+        session = requests.Session()
+        while not self._stopped.is_set():
+            with self._lock:
+                if not self._callbacks:
+                    self._callbacks_ready.wait(0.5)
+            for url, body in self.take_callbacks(wait=True):
+                try:
+                    status_code = session.post(url, json=body, timeout=10).status_code
+                except requests.RequestException as e:
+                    status_code = type(e).__name__
+                with self._lock:
+                    self.deliveries[status_code] += 1
+
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this each
+            # keep-alive reply stalls on the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with simulator._lock:
+                    simulator.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                simulator.calls[f"GET {path}"] += 1
+                self._delay()
+
+                if path != "/oauth/v1/generate":
+                    return self._reply(404, {"errorMessage": "Not found"})
+                if not self.headers.get("Authorization", "").startswith("Basic "):
+                    return self._reply(400, {"errorMessage": "Invalid Authentication passed"})
+                self._reply(200, simulator.issue_token())
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                simulator.calls[f"POST {path}"] += 1
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._delay()
+
+                if path != "/mpesa/stkpush/v1/processrequest":
+                    return self._reply(404, {"errorMessage": "Not found"})
+                token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+                if not simulator.token_is_valid(token):
+                    return self._reply(401, {"errorCode": "404.001.03", "errorMessage": "Invalid Access Token"})
+                acknowledgement = simulator.accept_push(json.loads(body or b"{}"))
+                if acknowledgement is None:
+                    return self._reply(500, {
+                        "requestId": uuid.uuid4().hex[:12],
+                        "errorCode": "500.001.1001",
+                        "errorMessage": "Unable to lock subscriber, a transaction is already in process for the current subscriber",
+                    })
+                self._reply(200, acknowledgement)
+
+            def _delay(self):
+                if simulator.latency:
+                    time.sleep(simulator.latency)
+
+            def _reply(self, status_code, data):
+                body = json.dumps(data).encode()
+                try:
+                    self.send_response(status_code)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out; Daraja would have gone ahead anyway.
+                    self.close_connection = True
+
+        return Handler
@@ -0,0 +1,140 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict
+
+import requests
+from django.utils import timezone
+from urllib3.exceptions import NewConnectionError
+
+from core.outbox import register
+from orders.models import Order
+from payments.models import MpesaTransaction, Payment
+from payments.mpesa.callbacks import apply_callback
+from payments.mpesa import client
+from payments.mpesa.client import MpesaAuthenticationError
+from payments.mpesa.stk_push import MpesaSTKPush, MpesaSTKPushError
+
+
+def _never_sent(e: Exception) -> bool:
+    """
+    Whether `e` was raised before the push could reach Daraja.
+    """
+    if isinstance(e, (MpesaAuthenticationError, requests.ConnectTimeout)):
+        return True
+    reason = getattr(e.args[0], "reason", None) if isinstance(e, requests.ConnectionError) and e.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _push_not_sent(payload: Dict[str, Any], error: Exception) -> None:
+    """
+    The outbox gave up on a push that never reached Daraja; the till sees it
+    Failed instead of waiting on a Queued push forever.
+    """
+    MpesaTransaction.objects.filter(id=payload["transaction_id"], status="Queued").update(
+        status="Failed",
+        result_desc=f"Could not reach M-Pesa: {error}"[:255],
+        updated_at=timezone.now(),
+    )
+
+
+@register("mpesa.stk_push", atomic=False, on_failure=_push_not_sent)
+def send_stk_push(payload: Dict[str, Any]) -> None:
+    """
+    Sends a queued STK push. Runs outside any transaction so a slow Daraja
+    response holds no database connection in a transaction; the row is
+    updated with single UPDATEs once the answer is in.
+
+    The row is claimed (Queued -> Sending) first and only the worker that
+    claimed it sends, so overlapping runs never prompt the customer twice.
+    Failures before the push could have reached Daraja (token, connection
+    not opened) put it back to Queued and are raised so the outbox retries
+    them; once it gives up, the row is Failed. A refusal from Daraja is Failed. Anything else after the request
+    went out (read timeout, dropped connection) leaves the outcome unknown:
+    the row is Submitted and is resolved by its callback (matched on phone
+    and amount, see `adopt_submitted`) or by reconciliation.
+    """
+    transaction_id = payload["transaction_id"]
+    row = MpesaTransaction.objects.filter(id=transaction_id, status="Queued").values("phone_number", "amount").first()
+    if row is None:
+        return
+    if not MpesaTransaction.objects.filter(id=transaction_id, status="Queued").update(status="Sending", updated_at=timezone.now()):
+        return
+    sending = MpesaTransaction.objects.filter(id=transaction_id, status="Sending")
+
+    try:
+        client.get_access_token()
+        data = MpesaSTKPush(phone_number=row["phone_number"], amount=row["amount"]).send()
+    except MpesaSTKPushError as e:
+        sending.update(status="Failed", result_desc=str(e)[:255], updated_at=timezone.now())
+        return
+    except Exception as e:
+        if _never_sent(e):
+            sending.update(status="Queued", updated_at=timezone.now())
+            raise
+        sending.update(status="Submitted", result_desc=f"Outcome unknown: {e}"[:255], updated_at=timezone.now())
+        return
+
+    sending.update(
+        status="Pending",
+        merchant_request_id=data.get("MerchantRequestID"),
+        checkout_request_id=data.get("CheckoutRequestID"),
+        response_desc=data.get("ResponseDescription"),
+        customer_message=data.get("CustomerMessage"),
+        updated_at=timezone.now(),
+    )
+
+
+@register("mpesa.callback")
+def apply_early_callback(payload: Dict[str, Any]) -> None:
+    """
+    A callback that arrived before the push's checkout id was stored; the
+    outbox retries it with backoff until the transaction shows up.
+    """
+    if apply_callback(payload) is None:
+        raise LookupError(f"No M-Pesa transaction with checkout id {payload['checkout_request_id']}")
+
+
+@register("mpesa.settle")
+def settle_mpesa_payment(payload: Dict[str, Any]) -> None:
+    """
+    Records a successful STK payment against its order, like a manual order
+    payment, with the M-Pesa receipt as the payment's receipt number. Rows
+    already confirmed by ConfirmPaymentAPIView are settled too; amount
+    mismatches (result code 0 but Failed) never are.
+    """
+    mpesa = (
+        MpesaTransaction.objects
+        .filter(checkout_request_id=payload["checkout_request_id"], result_code=0, order__isnull=False)
+        .exclude(status="Failed")
+        .values("order_id", "amount", "mpesa_receipt_number", "phone_number")
+        .first()
+    )
+    if mpesa is None:
+        return
+
+    order = Order.objects.select_for_update().get(id=mpesa["order_id"])
+    receipt_number = mpesa["mpesa_receipt_number"] or payload["checkout_request_id"]
+    if Payment.objects.filter(order=order, receipt_number=receipt_number).exists():
+        return
+
+    amount = Decimal(str(mpesa["amount"]))
+    order.amount_received += amount
+    order.save(update_fields=["amount_received", "updated_at"])
+
+    Payment.objects.create(
+        business_id=order.business_id,
+        branch_id=order.branch_id,
+        order=order,
+        subtotal=order.sub_total,
+        tax=order.tax,
+        total=order.total_amount,
+        payment_method="mpesa",
+        amount_received=amount,
+        mobile_number=mpesa["phone_number"],
+        mobile_network="Safaricom",
+        split_mobile_amount=amount,
+        status="Paid",
+        payment_date=date.today(),
+        receipt_number=receipt_number,
+    )
+    order.refresh_status()
@@ -1,41 +1,105 @@
+import logging
 from urllib import response
+
+from django.conf import settings
 from django.db import transaction
+from django.utils.crypto import constant_time_compare
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.views import APIView
 
 
 
-from payments.serializers import MpesaSTKPushSerializer, ConfirmPaymentSerializer
+from payments.serializers import MpesaCallbackSerializer, MpesaSTKPushSerializer, ConfirmPaymentSerializer, MpesaTransactionSerializer
 from payments.models import MpesaTransaction
+from core.mixins import BusinessScopedQuerysetMixin, ConditionalGetMixin
+from core.outbox import enqueue
 from core.support_functions import cleanup_mpesa_callback, cleanup_phone_number
-from payments.mpesa.stk_push import MpesaSTKPush
+from payments.mpesa.callbacks import apply_callback, defer_callback
 from orders.models import Order, OrderItem
 
 
+logger = logging.getLogger(__name__)
+
+
 # Create your views here.
 class MpesaSTKPushAPIView(generics.GenericAPIView):
+    """
+    Queues the push and answers at once; the outbox worker talks to Daraja
+    (payments.mpesa.tasks). Poll the returned transaction for its status.
+    """
     serializer_class = MpesaSTKPushSerializer
+    permission_classes = [IsAuthenticated]
 
-    @transaction.atomic
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
 
         if serializer.is_valid(raise_exception=True):
-            # Process the callback data as needed
             phone_number = serializer.validated_data.get("phone_number")
             amount = serializer.validated_data.get("amount")
-
-            cleaned_phone_number = cleanup_phone_number(phone_number)
-
-            stk_push_instance = MpesaSTKPush(
-                phone_number=cleaned_phone_number,
-                amount=amount
+            order_id = serializer.validated_data.get("order")
+            business = request.user.business
+
+            if order_id is not None and not Order.objects.filter(id=order_id, business=business).exists():
+                return Response({"failed": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
+
+            with transaction.atomic():
+                mpesa_transaction = MpesaTransaction.objects.create(
+                    business=business,
+                    order_id=order_id,
+                    phone_number=cleanup_phone_number(phone_number),
+                    amount=amount,
+                    status="Queued",
+                )
+                enqueue("mpesa.stk_push", {"transaction_id": mpesa_transaction.id}, business=business)
+
+            return Response(
+                {
+                    "success": "STK push queued",
+                    "transaction_id": mpesa_transaction.id,
+                    "status": mpesa_transaction.status,
+                },
+                status=status.HTTP_202_ACCEPTED,
             )
-            data = stk_push_instance.stk_push()
-            return Response(data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class MpesaCallbackAPIView(APIView):
+    """
+    STK push results from Safaricom, posted to the secret CallBackURL (see
+    `callback_url`). Does one UPDATE (plus an outbox row for completed
+    payments) and acknowledges; order settlement runs in the outbox worker.
+    Repeated deliveries are acknowledged and ignored.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request, secret, *args, **kwargs):
+        if not constant_time_compare(secret, settings.MPESA_CALLBACK_SECRET):
+            return Response({"ResultCode": 1, "ResultDesc": "Rejected"}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = MpesaCallbackSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"ResultCode": 1, "ResultDesc": "Rejected"}, status=status.HTTP_400_BAD_REQUEST)
+        result = cleanup_mpesa_callback(serializer.validated_data)
+
+        with transaction.atomic():
+            if apply_callback(result) is None and not defer_callback(result):
+                logger.warning("Dropped M-Pesa callback for unknown checkout id %s", result["checkout_request_id"])
+
+        return Response({"ResultCode": 0, "ResultDesc": "Accepted"}, status=status.HTTP_200_OK)
+
+
+class MpesaTransactionStatusAPIView(BusinessScopedQuerysetMixin, ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    Status of a push for clients to poll; unchanged polls get a 304.
+    """
+    queryset = MpesaTransaction.objects.all()
+    serializer_class = MpesaTransactionSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = "pk"
     
 
 class ConfirmPaymentAPIView(generics.GenericAPIView):
@@ -51,7 +115,7 @@ class ConfirmPaymentAPIView(generics.GenericAPIView):
 
             # Here you would typically confirm the payment with Mpesa API
             # For demonstration, we just return a success response
-            transaction = MpesaTransaction.objects.filter(merchant_request_id=merchant_request_id, result_code__in=[0, "0"]).first()
+            transaction = MpesaTransaction.objects.filter(merchant_request_id=merchant_request_id, result_code__in=[0, "0"]).exclude(status="Failed").first()
             if transaction:
                 transaction.status = 'Confirmed'
                 transaction.save()
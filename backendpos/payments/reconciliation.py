@@ -0,0 +1,214 @@
+import csv
+from collections import deque
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from core.support_functions import cleanup_phone_number
+from payments.models import MpesaTransaction, Payment
+
+
+# Payment methods the POS records for M-Pesa money (see PaymentModal).
+MOBILE_METHODS = ("mpesa", "mobile", "cash+mpesa")
+
+# Column names accepted for each field of an M-Pesa statement CSV.
+CSV_COLUMNS = {
+    "receipt_number": ("Receipt No.", "Receipt No", "MpesaReceiptNumber", "receipt_number"),
+    "amount": ("Paid In", "Amount", "amount"),
+    "phone_number": ("Other Party Info", "Phone Number", "PhoneNumber", "phone_number"),
+    "status": ("Transaction Status", "Status", "status"),
+}
+
+CHUNK_SIZE = 5000
+
+
+class StatementRow(NamedTuple):
+    receipt_number: str
+    phone_number: str
+    amount: Decimal
+    # MpesaTransaction id, or the line number of a CSV statement.
+    reference: object
+
+
+class PaymentRow(NamedTuple):
+    id: int
+    receipt_number: str
+    phone_number: str
+    amount: Decimal
+
+
+def normalize_phone(phone_number) -> str:
+    """
+    2547XXXXXXXX for any of the forms the POS and Safaricom use, including
+    statement party info such as "254712345678 - JANE DOE".
+    """
+    if phone_number is None:
+        return ""
+    phone_number = str(phone_number).split("-")[0].strip().replace(" ", "")
+    return cleanup_phone_number(phone_number) if phone_number else ""
+
+
+def statement_from_csv(file: TextIO) -> Iterator[StatementRow]:
+    """
+    Reads an M-Pesa statement export. Rows that are not completed or carry
+    no money in (withdrawals, charges) are skipped.
+    """
+    reader = csv.DictReader(file)
+    columns = {
+        field: next((name for name in names if name in (reader.fieldnames or ())), None)
+        for field, names in CSV_COLUMNS.items()
+    }
+    if columns["receipt_number"] is None or columns["amount"] is None:
+        raise ValueError(f"Statement needs a receipt number and amount column, got {reader.fieldnames}")
+
+    for line, row in enumerate(reader, start=2):
+        if columns["status"] and row[columns["status"]].strip().lower() not in ("completed", ""):
+            continue
+        try:
+            amount = Decimal(row[columns["amount"]].replace(",", "").strip() or "0")
+        except InvalidOperation:
+            continue
+        if amount <= 0:
+            continue
+
+        yield StatementRow(
+            receipt_number=row[columns["receipt_number"]].strip(),
+            phone_number=normalize_phone(row[columns["phone_number"]]) if columns["phone_number"] else "",
+            amount=amount,
+            reference=line,
+        )
+
+
+def statement_from_transactions(business_id: int, day: date) -> Iterator[StatementRow]:
+    """
+    Completed STK payments of `day`, by the M-Pesa transaction date.
+    """
+    rows = (
+        MpesaTransaction.objects
+        .filter(
+            business_id=business_id,
+            status__in=("Completed", "Confirmed"),
+            transaction_date__startswith=day.strftime("%Y%m%d"),
+        )
+        .values_list("id", "mpesa_receipt_number", "phone_number", "amount")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for transaction_id, receipt_number, phone_number, amount in rows:
+        yield StatementRow(receipt_number or "", normalize_phone(phone_number), amount, transaction_id)
+
+
+def unresolved_pushes(business_id: int, day: date) -> List[Dict]:
+    """
+    Pushes of `day` whose outcome is unknown (sent, but Daraja's answer was
+    lost) and that no callback has resolved; check them against the statement.
+    """
+    return list(
+        MpesaTransaction.objects
+        .filter(business_id=business_id, status__in=("Sending", "Submitted"), created_at__date=day)
+        .values("id", "order_id", "phone_number", "amount", "status", "created_at")
+        .order_by("id")
+    )
+
+
+def payments_for(business_id: int, day: date) -> Iterator[PaymentRow]:
+    """
+    Incoming mobile money payments recorded on `day`. Split payments count
+    only their M-Pesa part.
+    """
+    rows = (
+        Payment.objects
+        .filter(business_id=business_id, payment_date=day, payment_method__in=MOBILE_METHODS, direction="Incoming")
+        .values_list("id", "receipt_number", "mobile_number", "amount_received", "split_mobile_amount")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for payment_id, receipt_number, mobile_number, amount_received, split_mobile_amount in rows:
+        amount = split_mobile_amount if split_mobile_amount else amount_received
+        yield PaymentRow(payment_id, receipt_number or "", normalize_phone(mobile_number), amount)
+
+
+def reconcile(statement: Iterable[StatementRow], payments: Iterable[PaymentRow]) -> Dict[str, List]:
+    """
+    Matches statement rows to payments. The payments are indexed by receipt
+    number and by (phone, amount). Every statement row is first matched by
+    receipt number; only the rows and payments left over are then paired by
+    phone and amount, so a fallback match can never take a payment that a
+    later row's receipt accounts for.
+
+    Returns lists keyed by:
+      matched             (statement row, payment row, "receipt" | "phone_amount")
+      amount_mismatch     receipt matches whose amounts differ (also in matched)
+      unmatched_statement statement rows no payment accounts for
+      unmatched_payments  payments missing from the statement
+      duplicate_statement statement rows repeating an earlier receipt number
+      duplicate_payments  payments sharing a receipt number with an earlier one
+    """
+    by_id: Dict[int, PaymentRow] = {}
+    by_receipt: Dict[str, int] = {}
+    by_phone_amount: Dict[Tuple[str, Decimal], deque] = {}
+    duplicate_payments: List[PaymentRow] = []
+
+    for payment in payments:
+        by_id[payment.id] = payment
+        if payment.receipt_number:
+            if payment.receipt_number in by_receipt:
+                duplicate_payments.append(payment)
+            else:
+                by_receipt[payment.receipt_number] = payment.id
+        by_phone_amount.setdefault((payment.phone_number, payment.amount), deque()).append(payment.id)
+
+    matched_ids = set()
+    seen_receipts = set()
+    result = {
+        "matched": [],
+        "amount_mismatch": [],
+        "unmatched_statement": [],
+        "unmatched_payments": [],
+        "duplicate_statement": [],
+        "duplicate_payments": duplicate_payments,
+    }
+
+    # Rows without a receipt match, kept for the phone/amount pass.
+    leftover: List[StatementRow] = []
+
+    for row in statement:
+        if row.receipt_number:
+            if row.receipt_number in seen_receipts:
+                result["duplicate_statement"].append(row)
+                continue
+            seen_receipts.add(row.receipt_number)
+
+        payment_id = by_receipt.get(row.receipt_number)
+        if payment_id is None or payment_id in matched_ids:
+            leftover.append(row)
+            continue
+        _match(result, matched_ids, row, by_id[payment_id], "receipt")
+
+    for row in leftover:
+        payment_id = _take(by_phone_amount.get((row.phone_number, row.amount)), matched_ids)
+        if payment_id is None:
+            result["unmatched_statement"].append(row)
+            continue
+        _match(result, matched_ids, row, by_id[payment_id], "phone_amount")
+
+    duplicate_ids = {payment.id for payment in duplicate_payments}
+    result["unmatched_payments"] = [
+        payment for payment_id, payment in by_id.items()
+        if payment_id not in matched_ids and payment_id not in duplicate_ids
+    ]
+    return result
+
+
+def _match(result: Dict[str, List], matched_ids: set, row: StatementRow, payment: PaymentRow, how: str) -> None:
+    matched_ids.add(payment.id)
+    result["matched"].append((row, payment, how))
+    if payment.amount != row.amount:
+        result["amount_mismatch"].append((row, payment, how))
+
+
+def _take(candidates: Optional[deque], matched_ids: set) -> Optional[int]:
+    # Payments matched by receipt stay in the phone/amount index; skip them here.
+    while candidates:
+        payment_id = candidates.popleft()
+        if payment_id not in matched_ids:
+            return payment_id
+    return None
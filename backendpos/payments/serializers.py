@@ -1,8 +1,9 @@
 from rest_framework import serializers
-from payments.models import Payment, CustomerInvoicePayment
+from core.serializers import SparseFieldsetMixin
+from payments.models import Payment, CustomerInvoicePayment, BusinessLedger, MpesaTransaction
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     paid_by = serializers.SerializerMethodField()
     class Meta:
         model = Payment
@@ -11,8 +12,24 @@ class PaymentSerializer(serializers.ModelSerializer):
     def get_paid_by(self, obj):
         return obj.invoice.customer_name if obj.invoice else "One-Time Customer"
 
+    # Columns the method fields read (see core.mixins.sparse_queryset).
+    sparse_sources = {"paid_by": ("invoice__customer_name",)}
 
-class CustomerInvoicePaymentSerializer(serializers.ModelSerializer):
+    # Same fields from a `.values()` row (see core.mixins.ValuesListMixin).
+    values_lookups = ("invoice_id", "invoice__customer_name")
+
+    @staticmethod
+    def values_paid_by(row):
+        return row["invoice__customer_name"] if row["invoice_id"] else "One-Time Customer"
+
+
+class BusinessLedgerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = BusinessLedger
+        fields = "__all__"
+
+
+class CustomerInvoicePaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomerInvoicePayment
         fields = ["id", "amount_paid", "payment_method", "created_at"]
@@ -21,10 +38,45 @@ class CustomerInvoicePaymentSerializer(serializers.ModelSerializer):
 class MpesaCallbackSerializer(serializers.Serializer):
     Body = serializers.JSONField()
 
+    def validate_Body(self, value):
+        stk = value.get("stkCallback") if isinstance(value, dict) else None
+        if not isinstance(stk, dict):
+            raise serializers.ValidationError("stkCallback is required")
+        if not isinstance(stk.get("CheckoutRequestID"), str) or not stk["CheckoutRequestID"]:
+            raise serializers.ValidationError("CheckoutRequestID is required")
+        if isinstance(stk.get("ResultCode"), bool):
+            raise serializers.ValidationError("ResultCode must be an integer")
+        try:
+            int(stk.get("ResultCode"))
+        except (TypeError, ValueError):
+            raise serializers.ValidationError("ResultCode must be an integer")
+
+        metadata = stk.get("CallbackMetadata", {})
+        items = metadata.get("Item", []) if isinstance(metadata, dict) else None
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise serializers.ValidationError("CallbackMetadata.Item must be a list of objects")
+        return value
+
+
+class MpesaTransactionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = MpesaTransaction
+        fields = [
+            "id", "status", "order", "phone_number", "amount", "merchant_request_id", "checkout_request_id",
+            "customer_message", "result_code", "result_desc", "mpesa_receipt_number", "created_at", "updated_at",
+        ]
+
 
 class MpesaSTKPushSerializer(serializers.Serializer):
     phone_number = serializers.CharField(max_length=15)
     amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    order = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_amount(self, value):
+        # Daraja only takes whole shillings; callbacks are checked against this amount.
+        if value != value.to_integral_value() or value <= 0:
+            raise serializers.ValidationError("Amount must be a whole number of shillings")
+        return value
 
 
 
@@ -33,7 +85,7 @@ class ConfirmPaymentSerializer(serializers.Serializer):
     CheckoutRequestID = serializers.CharField(max_length=255)
 
 
-class BNPLInstallmentPaymentSerializer(serializers.ModelSerializer):
+class BNPLInstallmentPaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = ["id", "installment", "amount_received", "payment_method", "created_at"]
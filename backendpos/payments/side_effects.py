@@ -0,0 +1,21 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict
+
+from core.outbox import register
+from payments.models import BusinessLedger
+
+
+@register("ledger.post")
+def post_ledger_entry(payload: Dict[str, Any]) -> None:
+    BusinessLedger.objects.create(
+        business_id=payload["business_id"],
+        branch_id=payload["branch_id"],
+        source=payload["source"],
+        record_type=payload["record_type"],
+        debit=Decimal(payload["debit"]),
+        credit=Decimal(payload["credit"]),
+        date=date.fromisoformat(payload["date"]),
+        description=payload["description"],
+        reference=payload["reference"],
+    )
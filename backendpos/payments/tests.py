@@ -1,3 +1,305 @@
-from django.test import TestCase
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from urllib.parse import urlparse
 
-# Create your tests here.
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Business, OutboxEvent
+from core.outbox import enqueue, process_batch
+from core.testing import BusinessAPITestCase
+from orders.models import Order
+from payments.models import MpesaTransaction, Payment
+from payments.mpesa import client
+from payments.mpesa.simulator import DarajaSimulator
+from payments.mpesa.stk_push import MpesaSTKPush
+from payments.mpesa.tasks import send_stk_push
+from payments.reconciliation import PaymentRow, StatementRow, reconcile, statement_from_csv
+from users.models import User
+
+
+class MpesaClientTests(APITestCase):
+    """
+    Runs the Daraja client against the local simulator.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.simulator = DarajaSimulator().start()
+        cls.settings_override = override_settings(MPESA_BASE_URL=cls.simulator.url)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.simulator.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.simulator.calls.clear()
+        self.simulator.connections = 0
+        client.token_cache = client.MpesaTokenCache()
+        client._session = None
+
+    def test_concurrent_callers_share_one_token_request(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tokens = set(pool.map(lambda _: client.get_access_token(), range(16)))
+
+        self.assertEqual(len(tokens), 1)
+        self.assertEqual(self.simulator.calls["GET /oauth/v1/generate"], 1)
+
+    def test_pushes_reuse_token_and_connection(self):
+        for _ in range(3):
+            MpesaSTKPush(phone_number="254700000000", amount=10).stk_push()
+
+        self.assertEqual(self.simulator.calls["GET /oauth/v1/generate"], 1)
+        self.assertEqual(self.simulator.calls["POST /mpesa/stkpush/v1/processrequest"], 3)
+        self.assertEqual(self.simulator.connections, 1)
+        self.assertEqual(MpesaTransaction.objects.filter(status="Pending").count(), 3)
+
+    def test_revoked_token_is_refreshed_once(self):
+        MpesaSTKPush(phone_number="254700000000", amount=10).stk_push()
+        self.simulator.revoke_tokens()
+        MpesaSTKPush(phone_number="254700000000", amount=10).stk_push()
+
+        self.assertEqual(self.simulator.calls["GET /oauth/v1/generate"], 2)
+        self.assertEqual(self.simulator.calls["POST /mpesa/stkpush/v1/processrequest"], 3)
+
+    def test_stk_push_api_queues_and_worker_sends(self):
+        business = Business.objects.create(name="Shop", address="Nairobi", phone_number="0700000000")
+        self.client.force_authenticate(user=User.objects.create(username="cashier", business=business))
+
+        response = self.client.post(reverse("mpesa-stk-push"), {"phone_number": "0700000000", "amount": "150"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "Queued")
+        self.assertEqual(self.simulator.calls["POST /mpesa/stkpush/v1/processrequest"], 0)
+
+        process_batch()
+
+        status_url = reverse("mpesa-stk-push-status", args=[response.data["transaction_id"]])
+        response = self.client.get(status_url)
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(response.data["phone_number"], "254700000000")
+        self.assertTrue(response.data["checkout_request_id"].startswith("ws_CO_SIM_"))
+        self.assertEqual(self.client.get(status_url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def push_for_order(self, amount="150"):
+        business = Business.objects.create(name="Shop", address="Nairobi", phone_number="0700000000")
+        self.client.force_authenticate(user=User.objects.create(username=f"cashier-{business.id}", business=business))
+        order = Order.objects.create(business=business, order_number=f"MPESA-{business.id}", sub_total=amount, total_amount=amount, status="Pending")
+
+        response = self.client.post(reverse("mpesa-stk-push"), {"phone_number": "0700000000", "amount": amount, "order": order.id}, format="json")
+        self.assertEqual(response.status_code, 202)
+        process_batch()
+        self.client.force_authenticate(user=None)
+        return order, MpesaTransaction.objects.get(id=response.data["transaction_id"]).checkout_request_id
+
+    def post_callback(self, checkout_request_id, amount=150, secret=None):
+        callback = {"Body": {"stkCallback": {
+            "MerchantRequestID": "SIM-1",
+            "CheckoutRequestID": checkout_request_id,
+            "ResultCode": 0,
+            "ResultDesc": "The service request is processed successfully.",
+            "CallbackMetadata": {"Item": [
+                {"Name": "Amount", "Value": amount},
+                {"Name": "MpesaReceiptNumber", "Value": "SIM0000001"},
+                {"Name": "TransactionDate", "Value": 20261017120000},
+                {"Name": "PhoneNumber", "Value": 254799999999},
+            ]},
+        }}}
+        url = reverse("mpesa-callback", args=[secret or settings.MPESA_CALLBACK_SECRET])
+        return self.client.post(url, callback, format="json")
+
+    def test_duplicate_callback_settles_order_once(self):
+        order, checkout_request_id = self.push_for_order()
+
+        for _ in range(3):
+            response = self.post_callback(checkout_request_id)
+            self.assertEqual(response.data, {"ResultCode": 0, "ResultDesc": "Accepted"})
+        process_batch()
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, "Paid")
+        self.assertEqual(order.amount_received, 150)
+        payment = Payment.objects.get(order=order, receipt_number="SIM0000001")
+        self.assertEqual(payment.mobile_number, "254700000000")
+        self.assertEqual(MpesaTransaction.objects.get(checkout_request_id=checkout_request_id).status, "Completed")
+
+    def test_callback_needs_secret_and_matching_amount(self):
+        order, checkout_request_id = self.push_for_order()
+
+        self.assertEqual(self.post_callback(checkout_request_id, amount=1, secret="guess").status_code, 404)
+        self.assertEqual(self.post_callback(checkout_request_id, amount=1_000_000).status_code, 200)
+        process_batch()
+
+        mpesa = MpesaTransaction.objects.get(checkout_request_id=checkout_request_id)
+        self.assertEqual((mpesa.status, mpesa.amount), ("Failed", 150))
+        self.assertTrue(mpesa.result_desc.startswith("Amount mismatch"))
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.amount_received), ("Pending", 0))
+        self.assertFalse(Payment.objects.filter(order=order).exists())
+
+    def test_malformed_callbacks_are_rejected(self):
+        url = reverse("mpesa-callback", args=[settings.MPESA_CALLBACK_SECRET])
+        for body in (
+            {"Body": "x"},
+            {"Body": {"stkCallback": "x"}},
+            {"Body": {"stkCallback": {"CheckoutRequestID": "ws_CO_1", "ResultCode": "abc"}}},
+            {"Body": {"stkCallback": {"CheckoutRequestID": "ws_CO_1", "ResultCode": 0, "CallbackMetadata": {"Item": "x"}}}},
+            ["x"],
+        ):
+            response = self.client.post(url, body, format="json")
+            self.assertEqual(response.status_code, 400, body)
+            self.assertEqual(response.data["ResultCode"], 1)
+
+    @override_settings(MPESA_EARLY_CALLBACK_LIMIT=2)
+    def test_unknown_checkout_callbacks_are_capped(self):
+        with self.assertLogs("payments.mpesa.views", "WARNING") as logs:
+            for index in range(5):
+                self.assertEqual(self.post_callback(f"ws_CO_UNKNOWN_{index}").status_code, 200)
+        self.assertEqual(len(logs.output), 3)
+        self.assertEqual(OutboxEvent.objects.filter(topic="mpesa.callback").count(), 2)
+
+    def test_confirmed_payment_is_still_settled(self):
+        order, checkout_request_id = self.push_for_order()
+        self.post_callback(checkout_request_id)
+        MpesaTransaction.objects.filter(checkout_request_id=checkout_request_id).update(status="Confirmed")
+        process_batch()
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, "Paid")
+
+    def test_claimed_push_is_not_sent_again(self):
+        mpesa = MpesaTransaction.objects.create(phone_number="254700000000", amount=150, status="Sending")
+        send_stk_push({"transaction_id": mpesa.id})
+        self.assertEqual(self.simulator.calls["POST /mpesa/stkpush/v1/processrequest"], 0)
+
+    @override_settings(MPESA_BASE_URL="http://127.0.0.1:9", MPESA_MAX_RETRIES=0, OUTBOX_MAX_ATTEMPTS=1)
+    def test_push_that_never_reaches_daraja_fails_with_its_event(self):
+        mpesa = MpesaTransaction.objects.create(phone_number="254700000000", amount=150, status="Queued")
+        event = enqueue("mpesa.stk_push", {"transaction_id": mpesa.id})
+
+        process_batch()
+
+        event.refresh_from_db()
+        mpesa.refresh_from_db()
+        self.assertEqual(event.status, "Failed")
+        self.assertEqual(mpesa.status, "Failed")
+        self.assertTrue(mpesa.result_desc.startswith("Could not reach M-Pesa"))
+
+    def test_lost_acknowledgement_is_resolved_by_callback(self):
+        self.simulator.take_callbacks()
+        client.get_access_token()
+        mpesa = MpesaTransaction.objects.create(phone_number="254700000000", amount=150, status="Queued")
+
+        self.simulator.latency = 0.3
+        try:
+            with override_settings(MPESA_TIMEOUT=(3.05, 0.1)):
+                send_stk_push({"transaction_id": mpesa.id})
+        finally:
+            self.simulator.latency = 0.0
+        mpesa.refresh_from_db()
+        self.assertEqual((mpesa.status, mpesa.checkout_request_id), ("Submitted", None))
+
+        # Daraja accepted the push after the client gave up waiting.
+        deadline = time.monotonic() + 5
+        while not self.simulator.pending_callbacks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        for url, body in self.simulator.take_callbacks(wait=True):
+            self.client.post(urlparse(url).path, body, format="json")
+        mpesa.refresh_from_db()
+        self.assertEqual(mpesa.status, "Completed")
+        self.assertTrue(mpesa.checkout_request_id.startswith("ws_CO_SIM_"))
+
+    def test_simulated_refusals_and_cancellations(self):
+        business = Business.objects.create(name="Shop", address="Nairobi", phone_number="0700000000")
+        self.client.force_authenticate(user=User.objects.create(username="cashier", business=business))
+
+        def push(failure_rate, cancel_rate):
+            self.simulator.failure_rate, self.simulator.cancel_rate = failure_rate, cancel_rate
+            try:
+                response = self.client.post(reverse("mpesa-stk-push"), {"phone_number": "0700000000", "amount": "150"}, format="json")
+                process_batch()
+            finally:
+                self.simulator.failure_rate = self.simulator.cancel_rate = 0.0
+            return MpesaTransaction.objects.get(id=response.data["transaction_id"])
+
+        self.simulator.take_callbacks()
+        refused, cancelled = push(1.0, 0.0), push(0.0, 1.0)
+        for url, body in self.simulator.take_callbacks():
+            self.client.post(urlparse(url).path, body, format="json")
+
+        refused.refresh_from_db()
+        cancelled.refresh_from_db()
+        self.assertEqual(refused.status, "Failed")
+        self.assertEqual(cancelled.status, "Cancelled")
+        self.assertEqual(cancelled.result_code, 1032)
+
+
+class PaymentListTests(BusinessAPITestCase):
+    def test_payment_list_pages_with_cursors(self):
+        for _ in range(5):
+            Payment.objects.create(
+                business=self.business, branch=self.branch, status="Paid", payment_date=date.today(), amount_received=Decimal("100")
+            )
+        self.assert_cursor_pages(reverse("payments"), 5)
+
+
+class ReconciliationTests(APITestCase):
+    def test_matches_by_receipt_then_phone_and_amount(self):
+        statement = [
+            StatementRow("QGH1", "254700000001", Decimal("100"), 1),
+            StatementRow("QGH2", "254700000002", Decimal("250"), 2),
+            StatementRow("QGH2", "254700000002", Decimal("250"), 3),
+            StatementRow("QGH3", "254700000003", Decimal("75"), 4),
+            StatementRow("QGH4", "254700000009", Decimal("10"), 5),
+        ]
+        payments = [
+            PaymentRow(1, "QGH1", "254700000001", Decimal("100.00")),
+            PaymentRow(2, "POS-2", "254700000002", Decimal("250.00")),
+            PaymentRow(3, "QGH3", "254700000003", Decimal("70.00")),
+            PaymentRow(4, "QGH3", "254700000003", Decimal("70.00")),
+            PaymentRow(5, "POS-5", "254700000005", Decimal("40.00")),
+        ]
+
+        result = reconcile(statement, payments)
+
+        self.assertEqual([(row.reference, payment.id, how) for row, payment, how in result["matched"]], [
+            (1, 1, "receipt"), (4, 3, "receipt"), (2, 2, "phone_amount"),
+        ])
+        self.assertEqual([payment.id for _, payment, _ in result["amount_mismatch"]], [3])
+        self.assertEqual([row.reference for row in result["duplicate_statement"]], [3])
+        self.assertEqual([payment.id for payment in result["duplicate_payments"]], [4])
+        self.assertEqual([row.reference for row in result["unmatched_statement"]], [5])
+        self.assertEqual([payment.id for payment in result["unmatched_payments"]], [5])
+
+    def test_receipt_match_wins_over_an_earlier_phone_and_amount_match(self):
+        statement = [
+            # Same phone and amount as payment 1, but a different M-Pesa payment.
+            StatementRow("QGH9", "254700000001", Decimal("100"), 1),
+            StatementRow("QGH1", "254700000001", Decimal("100"), 2),
+        ]
+        payments = [PaymentRow(1, "QGH1", "254700000001", Decimal("100.00"))]
+
+        result = reconcile(statement, payments)
+
+        self.assertEqual([(row.reference, payment.id, how) for row, payment, how in result["matched"]], [
+            (2, 1, "receipt"),
+        ])
+        self.assertEqual([row.reference for row in result["unmatched_statement"]], [1])
+        self.assertEqual(result["unmatched_payments"], [])
+
+    def test_reads_statement_export(self):
+        export = io.StringIO(
+            "Receipt No.,Completion Time,Details,Transaction Status,Paid In,Withdrawn,Other Party Info\n"
+            "QGH1,2026-10-17 10:00:00,Pay Bill,Completed,\"1,500.00\",,254700000001 - JANE DOE\n"
+            "QGH2,2026-10-17 10:05:00,Pay Bill,Failed,200.00,,0700000002 - JOHN DOE\n"
+            "QGH3,2026-10-17 10:10:00,Charge,Completed,,30.00,\n"
+        )
+        self.assertEqual(list(statement_from_csv(export)), [StatementRow("QGH1", "254700000001", Decimal("1500.00"), 2)])
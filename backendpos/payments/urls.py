@@ -1,12 +1,17 @@
 from django.urls import path
 
 from payments.views import (
-    PaymentAPIView,
+    PaymentAPIView, BusinessLedgerAPIView,
     BNPLInstallmentPaymentAPIView, MakeBNPLPaymentAPIView
 )
+from payments.mpesa.views import MpesaCallbackAPIView, MpesaSTKPushAPIView, MpesaTransactionStatusAPIView
 
 urlpatterns = [
     path("", PaymentAPIView.as_view(), name="payments"),
+    path("ledger/", BusinessLedgerAPIView.as_view(), name="business-ledger"),
     path("bnpl-payments/", BNPLInstallmentPaymentAPIView.as_view(), name="bnpl-payments"),
     path("make-bnpl-payment/", MakeBNPLPaymentAPIView.as_view(), name="make-bnpl-payment"),
+    path("mpesa/stk-push/", MpesaSTKPushAPIView.as_view(), name="mpesa-stk-push"),
+    path("mpesa/stk-push/<int:pk>/", MpesaTransactionStatusAPIView.as_view(), name="mpesa-stk-push-status"),
+    path("mpesa/callback/<str:secret>/", MpesaCallbackAPIView.as_view(), name="mpesa-callback"),
 ]
\ No newline at end of file
@@ -12,21 +12,28 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 
-from payments.serializers import PaymentSerializer, BNPLInstallmentPaymentSerializer, MakeBNPLPaymentSerializer, MpesaSTKPushSerializer, ConfirmPaymentSerializer
+from payments.serializers import PaymentSerializer, BusinessLedgerSerializer, BNPLInstallmentPaymentSerializer, MakeBNPLPaymentSerializer, MpesaSTKPushSerializer, ConfirmPaymentSerializer
 from payments.models import Payment, BNPLInstallmentPayment, BusinessLedger
 from bnpl.models import BNPLInstallment, BNPLPurchase
 
-from core.mixins import BusinessScopedQuerysetMixin
+from core.mixins import BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin
+from core.outbox import enqueue
 
 date_today = datetime.now().date()
 
 # Create your views here.
-class PaymentAPIView(BusinessScopedQuerysetMixin, generics.ListAPIView):
+class PaymentAPIView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListAPIView):
     queryset = Payment.objects.all().order_by("-created_at")
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
 
 
+class BusinessLedgerAPIView(BusinessScopedQuerysetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListAPIView):
+    queryset = BusinessLedger.objects.all().order_by("-date", "-created_at")
+    serializer_class = BusinessLedgerSerializer
+    permission_classes = [IsAuthenticated]
+
+
 
 class BNPLInstallmentPaymentAPIView(BusinessScopedQuerysetMixin, generics.ListAPIView):
     queryset = Payment.objects.filter(payment_method="BNPL").order_by("-created_at")
@@ -96,17 +103,17 @@ class MakeBNPLPaymentAPIView(BusinessScopedQuerysetMixin, generics.CreateAPIView
                     direction="Incoming",
                 )
 
-                BusinessLedger.objects.create(
-                    business=installment.business,
-                    branch=installment.branch,
-                    source="BNPL Payment",
-                    record_type="Debit",
-                    debit=installment.amount_paid,
-                    credit=0,
-                    date=date_today,
-                    description=f"BNPL Payment for {installment.purchase.customer.customer_name} for {installment.purchase.service_provider.name}",
-                    reference=serializer.validated_data["receipt_number"]
-                )
+                enqueue("ledger.post", {
+                    "business_id": installment.business_id,
+                    "branch_id": installment.branch_id,
+                    "source": "BNPL Payment",
+                    "record_type": "Debit",
+                    "debit": str(installment.amount_paid),
+                    "credit": "0",
+                    "date": timezone.localdate().isoformat(),
+                    "description": f"BNPL Payment for {installment.purchase.customer.customer_name} for {installment.purchase.service_provider.name}",
+                    "reference": serializer.validated_data.get("receipt_number")
+                }, business=installment.business)
 
             else:
                 print(serializer.validated_data)
@@ -158,17 +165,17 @@ class MakeBNPLPaymentAPIView(BusinessScopedQuerysetMixin, generics.CreateAPIView
                 )
 
 
-                BusinessLedger.objects.create(
-                    business=purchase.business,
-                    branch=purchase.branch,
-                    source="BNPL Payment",
-                    record_type="Debit",
-                    debit=serializer.validated_data["amount"],
-                    credit=0,
-                    date=date_today,
-                    description=f"BNPL Payment for {purchase.customer.customer_name} for {purchase.service_provider.name}",
-                    reference=serializer.validated_data["receipt_number"]
-                )
+                enqueue("ledger.post", {
+                    "business_id": purchase.business_id,
+                    "branch_id": purchase.branch_id,
+                    "source": "BNPL Payment",
+                    "record_type": "Debit",
+                    "debit": str(serializer.validated_data["amount"]),
+                    "credit": "0",
+                    "date": timezone.localdate().isoformat(),
+                    "description": f"BNPL Payment for {purchase.customer.customer_name} for {purchase.service_provider.name}",
+                    "reference": serializer.validated_data.get("receipt_number")
+                }, business=purchase.business)
                 
             return Response({"success": "Installment payment made successfully", "data": serializer.data}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
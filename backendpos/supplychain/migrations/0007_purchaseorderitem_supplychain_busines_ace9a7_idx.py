@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_outboxevent'),
+        ('inventory', '0015_inventorylog_inventory_i_busines_589229_idx'),
+        ('supplychain', '0006_alter_purchaseorder_order_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorderitem',
+            index=models.Index(fields=['business', 'created_at', 'id'], name='supplychain_busines_ace9a7_idx'),
+        ),
+    ]
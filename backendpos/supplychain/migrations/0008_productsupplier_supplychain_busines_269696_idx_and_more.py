@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('inventory', '0016_category_inventory_c_busines_5120be_idx_and_more'),
+        ('supplychain', '0007_purchaseorderitem_supplychain_busines_ace9a7_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productsupplier',
+            index=models.Index(fields=['business', 'created_at'], name='supplychain_busines_269696_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['business', 'created_at'], name='supplychain_busines_932318_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['supplier', 'status'], name='supplychain_supplie_330213_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorderitem',
+            index=models.Index(condition=models.Q(('status', 'Pending')), fields=['business', 'created_at', 'id'], name='poitem_pending_business_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['business', 'created_at'], name='supplychain_busines_39bf74_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyrequest',
+            index=models.Index(fields=['business', 'created_at'], name='supplychain_busines_64592d_idx'),
+        ),
+    ]
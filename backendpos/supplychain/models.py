@@ -14,6 +14,11 @@ class Supplier(AbstractBaseModel):
     lead_time_days = models.IntegerField(default=0)
     payment_terms = models.CharField(max_length=255, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -27,6 +32,11 @@ class ProductSupplier(AbstractBaseModel):
     cost_price = models.DecimalField(max_digits=10, decimal_places=2)
     moq = models.IntegerField(default=1)  # Minimum Order Quantity
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return f"{self.product.name} - {self.supplier.name}"
     
@@ -39,6 +49,11 @@ class SupplyRequest(AbstractBaseModel):
     requested_by = models.ForeignKey("users.User", on_delete=models.SET_NULL, null=True)
     status = models.CharField(max_length=50, default="Pending")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return f"Supply Request for {self.product.name} - {self.quantity}"
 
@@ -52,6 +67,12 @@ class PurchaseOrder(AbstractBaseModel):
     status = models.CharField(max_length=50, default="Pending")
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'))
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+            models.Index(fields=["supplier", "status"]),
+        ]
+
     def __str__(self):
         return f"PO #{self.id} - {self.supplier.name}"
     
@@ -67,6 +88,13 @@ class PurchaseOrderItem(AbstractBaseModel):
     item_total = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=50, default="Pending")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business", "created_at", "id"]),
+            models.Index(fields=["business", "created_at", "id"], condition=models.Q(status="Pending"), name="poitem_pending_business_idx"),
+        ]
+
+
     def __str__(self):
         return f"{self.product.name} x {self.quantity}"
     
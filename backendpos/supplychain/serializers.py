@@ -1,19 +1,20 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from supplychain.models import Supplier, ProductSupplier, SupplyRequest, PurchaseOrder, PurchaseOrderItem
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Supplier
         fields = '__all__'
 
 
-class ProductSupplierSerializer(serializers.ModelSerializer):
+class ProductSupplierSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ProductSupplier
         fields = '__all__'
 
 
-class SupplyRequestSerializer(serializers.ModelSerializer):
+class SupplyRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = SupplyRequest
         fields = '__all__'
@@ -21,7 +22,7 @@ class SupplyRequestSerializer(serializers.ModelSerializer):
 
 
 
-class PurchaseOrderItemSerializer(serializers.ModelSerializer):
+class PurchaseOrderItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
     supplier_name = serializers.CharField(source='purchase_order.supplier.name', read_only=True)
     class Meta:
@@ -30,13 +31,13 @@ class PurchaseOrderItemSerializer(serializers.ModelSerializer):
 
 
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = PurchaseOrder
         fields = '__all__'
 
 
-class PurchaseOrderDetailSerializer(serializers.ModelSerializer):
+class PurchaseOrderDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     orderitems = PurchaseOrderItemSerializer(many=True, read_only=True)
     bussiness_name = serializers.CharField(source='business.name', read_only=True)
     branch_name = serializers.CharField(source='branch.name', read_only=True)
@@ -49,7 +50,8 @@ class PurchaseOrderDetailSerializer(serializers.ModelSerializer):
 
     
     def get_has_items(self, obj):
-        return True if obj.orderitems.count() > 0 else False
+        # Reads the prefetched items when the view prefetched them.
+        return len(obj.orderitems.all()) > 0
 
 
 class PurchaseOrderItemCreateSerializer(serializers.Serializer):
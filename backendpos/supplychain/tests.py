@@ -1,3 +1,50 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.urls import reverse
+
+from core.testing import BusinessAPITestCase
+from inventory.models import Category, InventoryItem
+from supplychain.models import PurchaseOrder, PurchaseOrderItem, Supplier
+
+
+class PurchaseOrderQueryCountTests(BusinessAPITestCase):
+    """
+    The purchase order detail and the goods receipt list must cost a constant
+    number of queries however many items they hold.
+    """
+
+    user_fields = {"username": "buyer"}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.supplier = Supplier.objects.create(business=cls.business, name="Wholesaler", phone_number="0722222222")
+        cls.category = Category.objects.create(business=cls.business, name="Drinks")
+        cls.purchase_order = PurchaseOrder.objects.create(
+            business=cls.business, branch=cls.branch, supplier=cls.supplier, status="Completed"
+        )
+
+    def add_items(self, count):
+        for index in range(count):
+            product = InventoryItem.objects.create(
+                business=self.business, category=self.category, name=f"Product {index}", quantity=0
+            )
+            PurchaseOrderItem.objects.create(
+                business=self.business, branch=self.branch, purchase_order=self.purchase_order, product=product,
+                quantity=5, unit_cost=Decimal("10"), item_total=Decimal("50"),
+            )
+
+    def test_purchase_order_detail_query_count_is_constant(self):
+        url = reverse("purchaseorder-detail", kwargs={"pk": self.purchase_order.id})
+        response = self.assert_constant_queries(url, self.add_items)
+        self.assertEqual(len(response.data["orderitems"]), 10)
+        self.assertTrue(response.data["has_items"])
+        self.assertEqual(response.data["orderitems"][0]["supplier_name"], "Wholesaler")
+
+    def test_purchase_order_item_list_query_count_is_constant(self):
+        response = self.assert_constant_queries(reverse("purchaseorderitem-list"), self.add_items)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_purchase_order_item_list_pages_with_cursors(self):
+        self.add_items(5)
+        self.assert_cursor_pages(reverse("purchaseorderitem-list"), 5)
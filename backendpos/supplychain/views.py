@@ -7,8 +7,9 @@ from django.utils import timezone
 from datetime import datetime
 
 from django.db import transaction
+from django.db.models import Prefetch
 
-from core.mixins import BusinessScopedQuerysetMixin
+from core.mixins import BusinessScopedQuerysetMixin, ConditionalGetMixin
 
 from supplychain.models import Supplier, ProductSupplier, SupplyRequest, PurchaseOrder, PurchaseOrderItem
 from supplychain.serializers import (
@@ -27,20 +28,20 @@ from invoices.models import SupplierInvoice, SupplierInvoiceItem
 
 date_today = datetime.now().date()
 # Create your views here.
-class SupplierListCreateView( BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
+class SupplierListCreateView( BusinessScopedQuerysetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Supplier.objects.all().order_by("-created_at")
     serializer_class = SupplierSerializer
     permission_classes = [IsAuthenticated]
 
 
-class SupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class SupplierRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Supplier.objects.all()
     serializer_class = SupplierSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "pk"
 
 
-class ProductSupplierListCreateView(BusinessScopedQuerysetMixin, generics.ListCreateAPIView):
+class ProductSupplierListCreateView(BusinessScopedQuerysetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = ProductSupplier.objects.all().order_by("-created_at")
     serializer_class = ProductSupplierSerializer
     permission_classes = [IsAuthenticated]
@@ -58,7 +59,7 @@ class ProductSupplierListCreateView(BusinessScopedQuerysetMixin, generics.ListCr
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProductSupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class ProductSupplierRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = ProductSupplier.objects.all().order_by("-created_at")
     serializer_class = ProductSupplierSerializer
     permission_classes = [IsAuthenticated]
@@ -139,14 +140,24 @@ class PurchaseOrderListCreateView(BusinessScopedQuerysetMixin, generics.ListCrea
 
 
 class PurchaseOrderRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = PurchaseOrder.objects.all()
+    queryset = (
+        PurchaseOrder.objects
+        .select_related("business", "branch", "supplier")
+        .prefetch_related(
+            Prefetch("orderitems", queryset=PurchaseOrderItem.objects.select_related("product", "purchase_order__supplier"))
+        )
+    )
     serializer_class = PurchaseOrderDetailSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "pk"
 
 
 class PurchaseOrderItemListView(BusinessScopedQuerysetMixin, generics.ListAPIView):
-    queryset = PurchaseOrderItem.objects.filter(status="Pending", purchase_order__status="Completed")
+    queryset = (
+        PurchaseOrderItem.objects
+        .filter(status="Pending", purchase_order__status="Completed")
+        .select_related("product", "purchase_order__supplier")
+    )
     serializer_class = PurchaseOrderItemSerializer
     permission_classes = [IsAuthenticated]
 
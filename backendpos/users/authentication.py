@@ -0,0 +1,67 @@
+import copy
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.cache import LRUCache
+
+
+# str(user id) -> User with business and branch loaded. Saves in this process
+# invalidate entries (see users.signals); the TTL bounds staleness from other
+# processes.
+user_cache = LRUCache(
+    maxsize=getattr(settings, "AUTH_USER_CACHE_SIZE", 5_000),
+    ttl=getattr(settings, "AUTH_USER_CACHE_TTL", 60),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication loading the user together with its business and branch
+    in one query, and serving repeat requests from `user_cache`. The active
+    and password-changed checks still run on every request.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        # Claims may carry the id as a string or a number.
+        user = user_cache.get(str(user_id))
+        if user is None:
+            try:
+                user = (
+                    self.user_model.objects
+                    .select_related("business", "branch")
+                    .get(**{api_settings.USER_ID_FIELD: user_id})
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            user_cache.set(str(user_id), user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return detached_copy(user)
+
+
+def detached_copy(user):
+    """
+    A copy of a cached user whose business and branch are copies too, so a
+    request changing them never alters the cached objects.
+    """
+    user = copy.copy(user)
+    for name, related in list(user._state.fields_cache.items()):
+        user._state.fields_cache[name] = copy.copy(related)
+    return user
+
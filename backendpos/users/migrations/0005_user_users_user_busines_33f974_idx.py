@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0013_branch_core_branch_busines_4e924e_idx'),
+        ('users', '0004_user_branch_alter_user_business'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['business', 'created_at'], name='users_user_busines_33f974_idx'),
+        ),
+    ]
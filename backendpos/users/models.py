@@ -17,6 +17,11 @@ class User(AbstractUser, AbstractBaseModel):
     gender = models.CharField(max_length=10, blank=True, null=True)
     status = models.CharField(max_length=255, default="Active")
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["business", "created_at"]),
+        ]
+
     def __str__(self):
         return self.get_full_name() if self.first_name else self.username
     
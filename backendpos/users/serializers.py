@@ -1,5 +1,6 @@
 from users.models import User
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 
 
 
@@ -14,7 +15,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = "__all__"
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.models import Branch, Business
+from users.authentication import user_cache
+from users.models import User
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.pop(str(instance.pk))
+
+
+def invalidate_business_users(sender, instance, **kwargs):
+    user_cache.pop_where(lambda key, user: user.business_id == instance.pk)
+
+
+def invalidate_branch_users(sender, instance, **kwargs):
+    user_cache.pop_where(lambda key, user: user.branch_id == instance.pk)
+
+
+def connect_signals():
+    post_save.connect(invalidate_cached_user, sender=User, dispatch_uid="invalidate_cached_user_save")
+    post_delete.connect(invalidate_cached_user, sender=User, dispatch_uid="invalidate_cached_user_delete")
+    post_save.connect(invalidate_business_users, sender=Business, dispatch_uid="invalidate_business_users_save")
+    post_delete.connect(invalidate_business_users, sender=Business, dispatch_uid="invalidate_business_users_delete")
+    post_save.connect(invalidate_branch_users, sender=Branch, dispatch_uid="invalidate_branch_users_save")
+    post_delete.connect(invalidate_branch_users, sender=Branch, dispatch_uid="invalidate_branch_users_delete")
@@ -121,41 +121,33 @@ const POS = () => {
         setProductsLoading(true);
         setProductsError(null);
         
-        let allProducts = [];
-        let endpoint = '/inventory';
+        // The catalog endpoint returns every category and product in one
+        // column-oriented payload, so the till starts with a single request
+        const response = await apiGet('/inventory/catalog/');
         
-        // Fetch all pages of products
-        while (endpoint) {
-          // Inventory endpoint doesn't require authentication
-          const response = await apiGet(endpoint);
-          
-          if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-          }
-          
-          const data = await response.json();
-          
-          // Transform API response to match component's expected format
-          const transformedProducts = data.results.map(product => ({
-            id: product.id,
-            name: product.name,
-            price: parseFloat(product.selling_price || 0), // Use selling_price for POS
-            barcode: product.barcode,
-            category: product.category_name, // Use category_name instead of category
-            stock: product.quantity // Use quantity as stock
-          }));
-          
-          allProducts = [...allProducts, ...transformedProducts];
-          
-          // Check if there's a next page - extract endpoint from full URL
-          if (data.next) {
-            const url = new URL(data.next);
-            endpoint = url.pathname + url.search;
-          } else {
-            endpoint = null;
-          }
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
         }
         
+        const catalog = await response.json();
+        const toRecords = ({ columns, rows }) => rows.map(row =>
+          Object.fromEntries(columns.map((column, index) => [column, row[index]]))
+        );
+        
+        const categoryNames = Object.fromEntries(
+          toRecords(catalog.categories).map(category => [category.id, category.name])
+        );
+        
+        // Transform catalog rows to match component's expected format
+        const allProducts = toRecords(catalog.items).map(product => ({
+          id: product.id,
+          name: product.name,
+          price: parseFloat(product.selling_price || 0), // Use selling_price for POS
+          barcode: product.barcode,
+          category: categoryNames[product.category_id],
+          stock: product.quantity // Use quantity as stock
+        }));
+        
         setProducts(allProducts);
       } catch (error) {
         console.error('Error fetching products:', error);
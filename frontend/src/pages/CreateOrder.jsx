@@ -30,38 +30,26 @@ const CreateOrder = () => {
         setProductsLoading(true);
         setProductsError(null);
         
-        let allProducts = [];
-        let endpoint = '/inventory/menus/';
+        // The catalog endpoint returns every menu item in one request
+        const response = await apiGet('/inventory/catalog/');
         
-        // Fetch all pages of menu items
-        while (endpoint) {
-          const response = await apiGet(endpoint);
-          
-          if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-          }
-          
-          const data = await response.json();
-          
-          // Transform API response to match component's expected format
-          const transformedProducts = data.results.map(item => ({
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const { menus } = await response.json();
+        
+        // Transform catalog rows to match component's expected format
+        const allProducts = menus.rows.map(row => {
+          const item = Object.fromEntries(menus.columns.map((column, index) => [column, row[index]]));
+          return {
             id: item.id,
             name: item.name,
             price: parseFloat(item.price || 0),
             stock: item.quantity || 0,
             category: 'Menu' // Menu items don't have categories, use default
-          }));
-          
-          allProducts = [...allProducts, ...transformedProducts];
-          
-          // Check if there's a next page - extract endpoint from full URL
-          if (data.next) {
-            const url = new URL(data.next);
-            endpoint = url.pathname + url.search;
-          } else {
-            endpoint = null;
-          }
-        }
+          };
+        });
         
         setProducts(allProducts);
       } catch (error) {
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useOrders } from '../contexts/OrdersContext.jsx';
 import { useInvoices } from '../contexts/InvoicesContext.jsx';
-import { apiGet } from '../utils/api.js';
+import { apiGet, apiPost, getAccessToken } from '../utils/api.js';
 import { 
   ShoppingCart, 
   Receipt, 
@@ -12,7 +12,7 @@ import {
   CheckCircle,
   RefreshCw
 } from 'lucide-react';
-import { CURRENCY_SYMBOL } from '../config/currency.js';
+import { CURRENCY_SYMBOL, BASE_URL } from '../config/currency.js';
 import Layout from '../components/Layout.jsx';
 import { showError } from '../utils/toast.js';
 
@@ -51,6 +51,54 @@ const Dashboard = () => {
     fetchMetrics();
   }, []);
 
+  // Live updates: after the first event the stream only sends figures that changed
+  useEffect(() => {
+    if (!getAccessToken()) {
+      return undefined;
+    }
+
+    let source = null;
+    let closed = false;
+
+    // EventSource cannot send the Authorization header, so the stream is
+    // opened with a short-lived ticket; a fresh one is fetched to reconnect.
+    const open = async () => {
+      try {
+        const response = await apiPost('/core/metrics/stream/ticket/', {});
+        if (!response.ok || closed) {
+          return;
+        }
+        const { ticket } = await response.json();
+        if (closed) {
+          return;
+        }
+
+        source = new EventSource(`${BASE_URL}/core/metrics/stream/?ticket=${encodeURIComponent(ticket)}`);
+        source.addEventListener('metrics', (event) => {
+          const changed = JSON.parse(event.data);
+          setMetrics((current) => ({ ...(current || {}), ...changed }));
+        });
+        source.onerror = () => {
+          // The browser retries on its own with the old ticket; once that is
+          // refused the stream is closed for good.
+          if (source.readyState === EventSource.CLOSED && !closed) {
+            setTimeout(open, 5000);
+          }
+        };
+      } catch (error) {
+        console.error('Error opening metrics stream:', error);
+      }
+    };
+
+    open();
+    return () => {
+      closed = true;
+      if (source) {
+        source.close();
+      }
+    };
+  }, []);
+
   // Use metrics from API if available, otherwise use defaults
   const stats = metrics ? [
     {
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import Layout from '../components/Layout.jsx';
 import { Users, DollarSign, RefreshCw, Eye, Search, ChevronLeft, ChevronRight, Calendar, AlertCircle } from 'lucide-react';
@@ -23,6 +23,8 @@ const Debtors = () => {
   const [hasNext, setHasNext] = useState(false);
   const [hasPrevious, setHasPrevious] = useState(false);
   const itemsPerPage = 10;
+  // Cursor for each page reached so far; page 1 starts without one.
+  const pageCursors = useRef([null]);
   
 
   const fetchDebtors = async (page = 1) => {
@@ -31,7 +33,8 @@ const Debtors = () => {
       setError(null);
       
       // Build endpoint with pagination
-      const endpoint = `/finances/debtors/?limit=${itemsPerPage}&offset=${(page - 1) * itemsPerPage}`;
+      const cursor = pageCursors.current[page - 1];
+      const endpoint = `/finances/debtors/?pagination=cursor&limit=${itemsPerPage}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`;
       const response = await apiGet(endpoint);
       
       if (!response.ok) {
@@ -43,8 +46,11 @@ const Debtors = () => {
       const debtorsArray = data.results || [];
       
       setDebtors(debtorsArray);
-      setTotalCount(data.count || 0);
-      setTotalPages(Math.ceil((data.count || 0) / itemsPerPage));
+      // Cursor pages carry no total count: the pages we know of are the
+      // ones reached so far plus the next one.
+      pageCursors.current[page] = data.next ? new URL(data.next).searchParams.get('cursor') : null;
+      setTotalCount((page - 1) * itemsPerPage + debtorsArray.length);
+      setTotalPages((known) => (data.next ? Math.max(known, page + 1) : page));
       setHasNext(!!data.next);
       setHasPrevious(!!data.previous);
     } catch (error) {
@@ -304,7 +310,7 @@ const Debtors = () => {
               {totalPages > 1 && (
                 <div className="px-6 py-4 border-t border-gray-200 flex items-center justify-between">
                   <div className="text-sm text-gray-600">
-                    Showing {((currentPage - 1) * itemsPerPage) + 1} to {Math.min(currentPage * itemsPerPage, totalCount)} of {totalCount} debtors
+                    Showing {((currentPage - 1) * itemsPerPage) + 1} to {Math.min(currentPage * itemsPerPage, totalCount)}{!hasNext && ` of ${totalCount}`} debtors
                   </div>
                   <div className="flex items-center gap-2">
                     <button
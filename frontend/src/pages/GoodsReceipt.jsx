@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import Layout from '../components/Layout.jsx';
 import { 
   Package, 
@@ -44,6 +44,8 @@ const GoodsReceipt = () => {
   const [hasNext, setHasNext] = useState(false);
   const [hasPrevious, setHasPrevious] = useState(false);
   const itemsPerPage = 10;
+  // Cursor for each page reached so far; page 1 starts without one.
+  const pageCursors = useRef([null]);
 
   // Get unique purchase orders for filter
   const uniquePurchaseOrders = [...new Set(orderItems.map(item => item.purchase_order))].sort((a, b) => a - b);
@@ -54,7 +56,8 @@ const GoodsReceipt = () => {
       setError(null);
       
       // Build endpoint with pagination
-      const endpoint = `/supply-chain/purchaseorderitems/?limit=${itemsPerPage}&offset=${(page - 1) * itemsPerPage}`;
+      const cursor = pageCursors.current[page - 1];
+      const endpoint = `/supply-chain/purchaseorderitems/?pagination=cursor&limit=${itemsPerPage}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`;
       const response = await apiGet(endpoint);
       
       if (!response.ok) {
@@ -66,8 +69,11 @@ const GoodsReceipt = () => {
       const itemsArray = data.results || [];
       
       setOrderItems(itemsArray);
-      setTotalCount(data.count || 0);
-      setTotalPages(Math.ceil((data.count || 0) / itemsPerPage));
+      // Cursor pages carry no total count: the pages we know of are the
+      // ones reached so far plus the next one.
+      pageCursors.current[page] = data.next ? new URL(data.next).searchParams.get('cursor') : null;
+      setTotalCount((page - 1) * itemsPerPage + itemsArray.length);
+      setTotalPages((known) => (data.next ? Math.max(known, page + 1) : page));
       setHasNext(!!data.next);
       setHasPrevious(!!data.previous);
     } catch (error) {
@@ -513,7 +519,7 @@ const GoodsReceipt = () => {
               {totalPages > 1 && (
                 <div className="px-6 py-4 border-t border-gray-200 flex items-center justify-between">
                   <div className="text-sm text-gray-600">
-                    Showing {((currentPage - 1) * itemsPerPage) + 1} to {Math.min(currentPage * itemsPerPage, totalCount)} of {totalCount} items
+                    Showing {((currentPage - 1) * itemsPerPage) + 1} to {Math.min(currentPage * itemsPerPage, totalCount)}{!hasNext && ` of ${totalCount}`} items
                   </div>
                   <div className="flex items-center gap-2">
                     <button
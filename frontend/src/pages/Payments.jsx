@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import Layout from '../components/Layout.jsx';
 import { 
   CreditCard, 
@@ -94,6 +94,8 @@ const Payments = () => {
   const [hasNext, setHasNext] = useState(false);
   const [hasPrevious, setHasPrevious] = useState(false);
   const itemsPerPage = 10;
+  // Cursor for each page reached so far; page 1 starts without one.
+  const pageCursors = useRef([null]);
 
   const fetchPayments = async (page = 1) => {
     try {
@@ -101,7 +103,8 @@ const Payments = () => {
       setError(null);
       
       // Build endpoint with pagination
-      const endpoint = `/payments/?limit=${itemsPerPage}&offset=${(page - 1) * itemsPerPage}`;
+      const cursor = pageCursors.current[page - 1];
+      const endpoint = `/payments/?pagination=cursor&limit=${itemsPerPage}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`;
       const response = await apiGet(endpoint);
       
       if (!response.ok) {
@@ -114,8 +117,11 @@ const Payments = () => {
       const transformedPayments = paymentsArray.map(transformPaymentFromBackend);
       
       setPayments(transformedPayments);
-      setTotalCount(data.count || 0);
-      setTotalPages(Math.ceil((data.count || 0) / itemsPerPage));
+      // Cursor pages carry no total count: the pages we know of are the
+      // ones reached so far plus the next one.
+      pageCursors.current[page] = data.next ? new URL(data.next).searchParams.get('cursor') : null;
+      setTotalCount((page - 1) * itemsPerPage + paymentsArray.length);
+      setTotalPages((known) => (data.next ? Math.max(known, page + 1) : page));
       setHasNext(!!data.next);
       setHasPrevious(!!data.previous);
     } catch (error) {
@@ -525,7 +531,7 @@ const Payments = () => {
             {totalPages > 1 && (
               <div className="px-6 py-4 border-t border-gray-200 flex items-center justify-between">
                 <div className="text-sm text-gray-600">
-                  Showing {((currentPage - 1) * itemsPerPage) + 1} to {Math.min(currentPage * itemsPerPage, totalCount)} of {totalCount} payments
+                  Showing {((currentPage - 1) * itemsPerPage) + 1} to {Math.min(currentPage * itemsPerPage, totalCount)}{!hasNext && ` of ${totalCount}`} payments
                 </div>
                 <div className="flex items-center gap-2">
                   <button